@@ -469,6 +469,8 @@ def getArgumentParser(version_string, boot_cmdline=None):
                     action="append", help=help_parser.help_text("addrepo"))
     ap.add_argument("--noverifyssl", action="store_true", default=False,
                     help=help_parser.help_text("noverifyssl"))
+    ap.add_argument("--metadatacache", dest="metadata_cache", default=None, metavar="PATH",
+                    help=help_parser.help_text("metadatacache"))
     ap.add_argument("--liveinst", action="store_true", default=False,
                     help=help_parser.help_text("liveinst"))
 
@@ -17,41 +17,155 @@
 # Red Hat, Inc.
 #
 
-from queue import Queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
 from pyanaconda.threading import threadMgr
 from pyanaconda.core.glib import idle_add
 
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+# Log calls that waited in the main loop for longer than this (in seconds).
+SLOW_CALL_THRESHOLD = 1
+
 
 def run_in_loop(callback, *args, **kwargs):
     """Run callback in the main thread."""
     idle_add(callback, *args, **kwargs)
 
 
-def async_action_wait(func):
-    """Decorator method which ensures every call of the decorated function to be
-       executed in the context of GLib main loop even if called from a non-main
-       thread and returns the ret value after the decorated method finishes.
+class MainLoopDispatcher(object):
+    """Dispatcher of function calls to the main loop.
+
+    Calls from other threads are queued and the queued calls are
+    processed together in one iteration of the main loop. Every call
+    gets its own future, so the callers never share the results.
+
+    The dispatcher also measures how long the calls wait in the queue.
     """
 
-    queue_instance = Queue()
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = deque()
+        self._scheduled = False
+        self._count = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def statistics(self):
+        """Statistics of the processed calls.
 
-    def _idle_method(queue_instance, args, kwargs):
-        """This method contains the code for the main loop to execute.
+        :return: a tuple of the number of calls, the total and the maximal
+                 time in seconds that the calls waited in the queue
         """
-        ret = func(*args, **kwargs)
-        queue_instance.put(ret)
+        with self._lock:
+            return self._count, self._total_wait, self._max_wait
+
+    def dispatch(self, func, args, kwargs, wait=True):
+        """Schedule the function call in the main loop.
+
+        If the caller doesn't wait for the result, exceptions
+        raised by the function are raised in the main loop.
+
+        :param func: a function to call
+        :param args: positional arguments of the function
+        :param kwargs: keyword arguments of the function
+        :param wait: will the caller wait for the result?
+        :return: a future with the result of the call or None
+        """
+        future = Future() if wait else None
+
+        with self._lock:
+            self._calls.append((future, func, args, kwargs, time.monotonic()))
+
+            if self._scheduled:
+                return future
+
+            self._scheduled = True
+
+        run_in_loop(self._process_calls)
+        return future
+
+    def _process_calls(self):
+        """Process the queued calls in the main loop.
+
+        Only the calls queued before this iteration are processed, so
+        the calls dispatched in the meantime can't starve the main loop.
+        They are processed in the next iteration.
+        """
+        with self._lock:
+            count = len(self._calls)
+
+        for _i in range(count):
+            with self._lock:
+                future, func, args, kwargs, queued = self._calls.popleft()
+
+            self._record_wait(func, time.monotonic() - queued)
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:  # pylint: disable=broad-except
+                if not future:
+                    self._reschedule()
+                    raise
+
+                future.set_exception(e)
+            except BaseException as e:
+                # Don't let the caller wait, but exit in the main loop.
+                if future:
+                    future.set_exception(e)
+
+                self._reschedule()
+                raise
+            else:
+                if future:
+                    future.set_result(result)
+
+        self._reschedule()
         return False
 
+    def _reschedule(self):
+        """Process the remaining calls in the next iteration of the main loop."""
+        with self._lock:
+            if not self._calls:
+                self._scheduled = False
+                return
+
+        run_in_loop(self._process_calls)
+
+    def _record_wait(self, func, wait):
+        """Record how long the call waited in the queue."""
+        with self._lock:
+            self._count += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        if wait > SLOW_CALL_THRESHOLD:
+            log.debug("The call of %s waited for the main loop %.2f s.",
+                      getattr(func, "__qualname__", func), wait)
+
+
+dispatcher = MainLoopDispatcher()
+
+
+def async_action_wait(func):
+    """Decorator method which ensures every call of the decorated function to be
+       executed in the context of GLib main loop even if called from a non-main
+       thread and returns the ret value after the decorated method finishes.
+    """
+
     def _call_method(*args, **kwargs):
-        """The new body for the decorated method. If needed, it uses closure
-           bound queue_instance variable which is valid until the reference to this
-           method is destroyed."""
+        """The new body for the decorated method. If needed, it dispatches
+           the call to the main loop and waits for its own result."""
         if threadMgr.in_main_thread():
             # nothing special has to be done in the main thread
             return func(*args, **kwargs)
 
-        run_in_loop(_idle_method, queue_instance, args, kwargs)
-        return queue_instance.get()
+        return dispatcher.dispatch(func, args, kwargs).result()
 
     return _call_method
 
@@ -62,12 +176,6 @@ def async_action_nowait(func):
        thread. The new method does not wait for the callback to finish.
     """
 
-    def _idle_method(args, kwargs):
-        """This method contains the code for the main loop to execute.
-        """
-        func(*args, **kwargs)
-        return False
-
     def _call_method(*args, **kwargs):
         """The new body for the decorated method.
         """
@@ -76,6 +184,6 @@ def async_action_nowait(func):
             func(*args, **kwargs)
             return
 
-        run_in_loop(_idle_method, args, kwargs)
+        dispatcher.dispatch(func, args, kwargs, wait=False)
 
     return _call_method
@@ -31,7 +31,8 @@ from pyanaconda.core.configuration.target import TargetType, TargetSection
 from pyanaconda.core.configuration.base import Section, Configuration, ConfigurationError
 from pyanaconda.core.configuration.product import ProductLoader
 from pyanaconda.core.configuration.ui import UserInterfaceSection
-from pyanaconda.core.constants import ANACONDA_CONFIG_TMP, ANACONDA_CONFIG_DIR
+from pyanaconda.core.constants import ANACONDA_CONFIG_TMP, ANACONDA_CONFIG_DIR, \
+    ANACONDA_PRODUCT_INDEX
 from pyanaconda.product import productName, productVariant
 
 
@@ -51,6 +52,15 @@ class AnacondaSection(Section):
         """Enable Anaconda addons."""
         return self._get_option("addons_enabled", bool)
 
+    @property
+    def modules_zygote(self):
+        """Start Anaconda DBus modules from a zygote.
+
+        The zygote preloads the shared Python modules only once
+        and forks a new process for every started DBus module.
+        """
+        return self._get_option("modules_zygote", bool)
+
     @property
     def kickstart_modules(self):
         """List of enabled kickstart modules."""
@@ -187,12 +197,16 @@ class AnacondaConfiguration(Configuration):
         file or a default product.
 
         The configuration files are loaded from /etc/anaconda/product.d.
+        Information about the products is cached in an index file.
 
         :param str requested_product: a name of the requested product
         :param str requested_variant: a name of the requested variant
         """
         loader = ProductLoader()
-        loader.load_products(os.path.join(ANACONDA_CONFIG_DIR, "product.d"))
+        loader.load_products(
+            os.path.join(ANACONDA_CONFIG_DIR, "product.d"),
+            index_path=ANACONDA_PRODUCT_INDEX
+        )
 
         # Use the requested product name and variant name.
         if requested_product:
@@ -311,6 +325,9 @@ class AnacondaConfiguration(Configuration):
         if opts.noverifyssl:
             self.payload._set_option("verify_ssl", not opts.noverifyssl)
 
+        if opts.metadata_cache:
+            self.payload._set_option("metadata_cache_dir", opts.metadata_cache)
+
         self.validate()
 
 
@@ -18,6 +18,7 @@
 #  Author(s):  Vendula Poncova <vponcova@redhat.com>
 #
 import configparser
+import copy
 import os
 from abc import ABC
 
@@ -139,11 +140,17 @@ def set_option(parser, section_name, option_name, value):
 
 
 class Section(ABC):
-    """A base class for representation of a configuration section."""
+    """A base class for representation of a configuration section.
+
+    Converted values of the options are cached, so the parser is
+    accessed only once per option. The cache is invalidated every
+    time the configuration is read, validated or modified.
+    """
 
     def __init__(self, section_name, parser):
         self._section_name = section_name
         self._parser = parser
+        self._values = {}
 
     def _get_option(self, option_name, converter=None):
         """Get a converted value of the option.
@@ -152,7 +159,20 @@ class Section(ABC):
         :param converter: a function or None
         :return: a converted value
         """
-        return get_option(self._parser, self._section_name, option_name, converter)
+        key = (option_name, converter)
+
+        if key not in self._values:
+            self._values[key] = get_option(
+                self._parser, self._section_name, option_name, converter
+            )
+
+        value = self._values[key]
+
+        # Don't let the callers modify the cached value.
+        if isinstance(value, (list, dict, set)):
+            return copy.deepcopy(value)
+
+        return value
 
     def _set_option(self, option_name, value):
         """Set the option.
@@ -161,6 +181,11 @@ class Section(ABC):
         :param value: an option value
         """
         set_option(self._parser, self._section_name, option_name, value)
+        self._invalidate()
+
+    def _invalidate(self):
+        """Drop the cached values of the options."""
+        self._values.clear()
 
 
 class Configuration(object):
@@ -192,6 +217,7 @@ class Configuration(object):
         """
         read_config(self._parser, path)
         self._sources.append(path)
+        self._invalidate()
 
     def read_from_directory(self, path):
         """Read all configuration files in a directory
@@ -214,9 +240,27 @@ class Configuration(object):
         write_config(self._parser, path)
 
     def validate(self):
-        """Validate the configuration."""
+        """Validate the configuration.
+
+        The cached values of the options are dropped
+        and filled again with the validated values.
+        """
+        self._invalidate()
         self._validate_members(self)
 
+    def _invalidate(self):
+        """Drop the cached values of all sections."""
+        for member_name in dir(self):
+
+            # Skip private members.
+            if member_name.startswith("_"):
+                continue
+
+            value = getattr(self, member_name)
+
+            if isinstance(value, Section):
+                value._invalidate()
+
     def _validate_members(self, obj):
         """Validate members of the object.
 
@@ -62,6 +62,15 @@ class BootloaderSection(Section):
         """
         return self._get_option("nonibft_iscsi_boot", bool)
 
+    @property
+    def initramfs_jobs(self):
+        """Number of initramfs images generated at once.
+
+        If the value is 0, the number is derived from the number
+        of CPUs and the available memory.
+        """
+        return self._get_option("initramfs_jobs", int)
+
     @property
     def preserved_arguments(self):
         """Arguments preserved from the installation system.
@@ -112,6 +112,46 @@ class PayloadSection(Section):
         """
         return self._get_option("verify_ssl", bool)
 
+    @property
+    def pipelined_installation(self):
+        """Download and install packages at the same time.
+
+        The packages are split into dependency-ordered batches. Every batch
+        is installed by a separate transaction as soon as it is downloaded,
+        while the next batches are still downloading.
+        """
+        return self._get_option("pipelined_installation", bool)
+
+    @property
+    def native_image_copy(self):
+        """Install images with the native copy engine instead of rsync.
+
+        The engine copies files of the image in parallel and uses reflinks
+        or copy_file_range where the filesystem supports them. The progress
+        of the installation is based on the number of copied bytes.
+        """
+        return self._get_option("native_image_copy", bool)
+
+    @property
+    def metadata_cache_dir(self):
+        """Path to a persistent cache of repository metadata.
+
+        The cache is kept across restarts of the installer, so metadata of
+        unchanged repositories are not downloaded and processed again. The
+        cache is disabled if the path is not specified.
+        """
+        return self._get_option("metadata_cache_dir", str)
+
+    @property
+    def metadata_cache_max_age(self):
+        """Maximal age of an entry in the metadata cache in days."""
+        return self._get_option("metadata_cache_max_age", int)
+
+    @property
+    def metadata_cache_max_size(self):
+        """Maximal size of the metadata cache in MiB."""
+        return self._get_option("metadata_cache_max_size", int)
+
     @property
     def default_rpm_gpg_keys(self):
         """List of GPG keys to import into RPM database at end of installation."""
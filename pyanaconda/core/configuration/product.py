@@ -17,6 +17,7 @@
 #
 #  Author(s):  Vendula Poncova <vponcova@redhat.com>
 #
+import json
 import os
 from collections import namedtuple
 
@@ -46,26 +47,40 @@ class ProductLoader(object):
         """Create a new loader."""
         self._products = {}
 
-    def load_products(self, config_dir):
+    def load_products(self, config_dir, index_path=None):
         """Load information about products from the given configuration directory.
 
         Invalid configuration files will be skipped.
 
+        If a path to an index is specified, the information is loaded from
+        the index, unless the directory or its configuration files changed.
+        Otherwise, the configuration files are parsed and the index is
+        written again.
+
         :param config_dir: a path to a directory
+        :param index_path: a path to an index file or None
         """
+        if index_path and self._load_index(config_dir, index_path):
+            return
+
         log.info("Loading information about products from %s.", config_dir)
+        file_names = []
 
         for file_name in os.listdir(config_dir):
             if not file_name.endswith(".conf"):
                 continue
 
             config_path = os.path.join(config_dir, file_name)
+            file_names.append(file_name)
 
             try:
                 self.load_product(config_path)
             except ConfigurationError as e:
                 log.error("Skipping an invalid configuration at %s: %s", config_path, e)
 
+        if index_path:
+            self._save_index(config_dir, file_names, index_path)
+
     def load_product(self, config_path):
         """Load information about a product from the given configuration file.
 
@@ -130,6 +145,87 @@ class ProductLoader(object):
         """
         return self._get_product_configs(ProductKey(product_name, variant_name))
 
+    def _get_mtimes(self, config_dir, file_names):
+        """Get modification times of the configuration directory and files.
+
+        :param config_dir: a path to a directory
+        :param file_names: a list of names of configuration files
+        :return: a dictionary of names and modification times
+        :raises: OSError if a file cannot be accessed
+        """
+        mtimes = {"": os.stat(config_dir).st_mtime_ns}
+
+        for file_name in file_names:
+            mtimes[file_name] = os.stat(os.path.join(config_dir, file_name)).st_mtime_ns
+
+        return mtimes
+
+    def _load_index(self, config_dir, index_path):
+        """Load information about products from the index.
+
+        :param config_dir: a path to a directory
+        :param index_path: a path to an index file
+        :return: True if the index was used, otherwise False
+        """
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+
+            mtimes = index["mtimes"]
+            file_names = [name for name in mtimes if name]
+
+            if index["config_dir"] != os.path.abspath(config_dir) \
+                    or mtimes != self._get_mtimes(config_dir, file_names):
+                log.debug("The index at %s is out of date.", index_path)
+                return False
+
+            products = {}
+
+            for product, base, config_path in index["products"]:
+                base = ProductKey(*base) if base else None
+                products[ProductKey(*product)] = ProductData(base, config_path)
+
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.debug("Unable to use the index at %s: %s", index_path, e)
+            return False
+
+        if products.keys() & self._products.keys():
+            log.debug("The index at %s contains already loaded products.", index_path)
+            return False
+
+        log.info("Loading information about products from %s.", index_path)
+        self._products.update(products)
+        return True
+
+    def _save_index(self, config_dir, file_names, index_path):
+        """Save information about products of the directory to the index.
+
+        :param config_dir: a path to a directory
+        :param file_names: a list of names of configuration files
+        :param index_path: a path to an index file
+        """
+        config_dir = os.path.abspath(config_dir)
+        products = [
+            (key, data.base_product, data.config_path)
+            for key, data in self._products.items()
+            if os.path.dirname(os.path.abspath(data.config_path)) == config_dir
+        ]
+
+        try:
+            index = {
+                "config_dir": config_dir,
+                "mtimes": self._get_mtimes(config_dir, file_names),
+                "products": products,
+            }
+
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+
+            with open(index_path, "w") as f:
+                json.dump(index, f)
+
+        except OSError as e:
+            log.warning("Unable to write the index to %s: %s", index_path, e)
+
     def _create_section(self, parser, section_name):
         """Create the product section.
 
@@ -70,10 +70,12 @@ DBUS_ANACONDA_SESSION_ADDRESS = "DBUS_ANACONDA_SESSION_BUS_ADDRESS"
 
 ANACONDA_BUS_CONF_FILE = "/usr/share/anaconda/dbus/anaconda-bus.conf"
 ANACONDA_BUS_ADDR_FILE = "/run/anaconda/bus.address"
+ANACONDA_ZYGOTE_SOCKET = "/run/anaconda/zygote.socket"
 
 ANACONDA_DATA_DIR = "/usr/share/anaconda"
 ANACONDA_CONFIG_DIR = "/etc/anaconda/"
 ANACONDA_CONFIG_TMP = "/run/anaconda/anaconda.conf"
+ANACONDA_PRODUCT_INDEX = "/run/anaconda/product.index"
 
 # NOTE: this should be LANG_TERRITORY.CODESET, e.g. en_US.UTF-8
 DEFAULT_LANG = "en_US.UTF-8"
@@ -106,6 +108,12 @@ GRAPHICAL_TARGET = 'graphical.target'
 # See: https://3.python-requests.org/user/advanced/#timeouts
 NETWORK_CONNECTION_TIMEOUT = 46  # in seconds
 NETWORK_CONNECTED_CHECK_INTERVAL = 0.1  # in seconds
+# Interval of the check if changes of the state are signalled by a running main loop
+NETWORK_CONNECTED_SIGNAL_CHECK_INTERVAL = 1  # in seconds
+
+# Number of concurrent segments and retries of live image downloads
+IMAGE_DOWNLOAD_SEGMENTS = 4
+IMAGE_DOWNLOAD_RETRIES = 5
 
 # DBus
 DEFAULT_DBUS_TIMEOUT = -1       # use default
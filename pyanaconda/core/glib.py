@@ -30,12 +30,12 @@ from gi.repository.GLib import markup_escape_text, format_size_full, \
                                io_add_watch, child_watch_add, \
                                source_remove, \
                                spawn_close_pid, spawn_async_with_pipes, \
-                               MainLoop, MainContext, \
+                               MainLoop, MainContext, main_depth, \
                                GError, Variant, VariantType, Bytes, \
                                IOCondition, IOChannel, SpawnFlags, \
                                MAXUINT
 
-__all__ = ["create_main_loop", "create_new_context",
+__all__ = ["create_main_loop", "create_new_context", "is_main_loop_running",
            "markup_escape_text", "format_size_full",
            "timeout_add_seconds", "timeout_add", "idle_add",
            "io_add_watch", "child_watch_add",
@@ -54,6 +54,25 @@ def create_main_loop():
     return MainLoop()
 
 
+def is_main_loop_running():
+    """Is a main loop running in the default context?
+
+    A running main loop owns the default context, so other
+    threads are not able to acquire it.
+
+    :return: True or False
+    """
+    context = MainContext.default()
+
+    if not context.acquire():
+        return True
+
+    try:
+        return main_depth() > 0
+    finally:
+        context.release()
+
+
 def create_new_context():
     """Create GLib context.
 
@@ -0,0 +1,334 @@
+#
+# Copyright (C) 2020 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import struct
+from collections import namedtuple
+
+__all__ = ["ISO9660Image", "ISO9660Error"]
+
+# Size of a sector of ISO9660 images.
+ISO_SECTOR_SIZE = 2048
+
+# Volume descriptors are stored from the sector 16.
+ISO_DESCRIPTORS_START = 16
+ISO_DESCRIPTORS_END = 100
+
+# Types of volume descriptors.
+ISO_PRIMARY_DESCRIPTOR = 1
+ISO_SUPPLEMENTARY_DESCRIPTOR = 2
+ISO_DESCRIPTOR_TERMINATOR = 255
+
+# Escape sequences of Joliet supplementary descriptors.
+JOLIET_ESCAPES = (b"%/@", b"%/C", b"%/E")
+
+# Limits of the data read from images.
+MAX_DIRECTORY_SIZE = 16 * 1024 * 1024
+MAX_FILE_SIZE = 1024 * 1024
+MAX_CONTINUATION_AREAS = 32
+
+# A parsed directory record.
+DirectoryRecord = namedtuple("DirectoryRecord", ["name", "extent", "size", "is_dir"])
+
+
+class ISO9660Error(Exception):
+    """The image is not a valid ISO9660 image."""
+    pass
+
+
+class ISO9660Image(object):
+    """Read files from an ISO9660 image without mounting it.
+
+    The reader understands the primary volume descriptor with Rock Ridge
+    names, the Joliet supplementary descriptor and plain ISO9660 names, in
+    this order of preference. It is meant for small metadata files like
+    .discinfo and .treeinfo, so only files up to 1 MiB can be read.
+
+    The image can be a file or a block device:
+
+        with ISO9660Image("/path/to/image.iso") as image:
+            data = image.read_file(".discinfo")
+    """
+
+    def __init__(self, path):
+        """Create a new reader.
+
+        :param path: a path to the image
+        """
+        self._path = path
+        self._file = None
+        self._sector_size = ISO_SECTOR_SIZE
+        self._root = None
+        self._joliet = False
+        self._rock_ridge = False
+        self._susp_skip = 0
+        self._directories = {}
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        """Open the image and read its volume descriptors.
+
+        :raise: OSError if the image can't be read
+        :raise: ISO9660Error if the image is not valid
+        """
+        self._file = open(self._path, "rb")
+
+        try:
+            self._read_descriptors()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Close the image."""
+        if self._file:
+            self._file.close()
+
+        self._file = None
+        self._directories = {}
+
+    @property
+    def has_long_names(self):
+        """Does the image provide Rock Ridge or Joliet names?
+
+        Files like .discinfo can't be found by their plain ISO9660 names.
+        """
+        return self._rock_ridge or self._joliet
+
+    def exists(self, path):
+        """Does the path exist in the image?"""
+        return self._find(path) is not None
+
+    def isdir(self, path):
+        """Is the path a directory in the image?"""
+        record = self._find(path)
+        return record is not None and record.is_dir
+
+    def read_file(self, path, max_size=MAX_FILE_SIZE):
+        """Read a file from the image.
+
+        :param path: a path relative to the root of the image
+        :param max_size: the maximal size of the file
+        :return: content of the file or None if there is no such file
+        :raise: ISO9660Error if the file is too big
+        """
+        record = self._find(path)
+
+        if record is None or record.is_dir:
+            return None
+
+        if record.size > max_size:
+            raise ISO9660Error("The file {} is too big.".format(path))
+
+        return self._read(record.extent, 0, record.size)
+
+    def _read(self, sector, offset, size):
+        """Read data from the image."""
+        self._file.seek(sector * self._sector_size + offset)
+        data = self._file.read(size)
+
+        if len(data) != size:
+            raise ISO9660Error("Unexpected end of the image.")
+
+        return data
+
+    def _read_descriptors(self):
+        """Read the volume descriptors and choose the root directory."""
+        primary = None
+        joliet = None
+
+        for sector in range(ISO_DESCRIPTORS_START, ISO_DESCRIPTORS_END):
+            data = self._read(sector, 0, ISO_SECTOR_SIZE)
+
+            if data[1:6] != b"CD001":
+                raise ISO9660Error("Invalid volume descriptor.")
+
+            descriptor_type = data[0]
+
+            if descriptor_type == ISO_DESCRIPTOR_TERMINATOR:
+                break
+
+            if descriptor_type == ISO_PRIMARY_DESCRIPTOR and primary is None:
+                primary = data
+
+            if descriptor_type == ISO_SUPPLEMENTARY_DESCRIPTOR and joliet is None \
+                    and data[88:91] in JOLIET_ESCAPES:
+                joliet = data
+
+        if primary is None:
+            raise ISO9660Error("Missing primary volume descriptor.")
+
+        self._sector_size = struct.unpack_from("<H", primary, 128)[0] or ISO_SECTOR_SIZE
+        self._root = self._parse_record(primary, 156)
+        self._detect_rock_ridge()
+
+        if not self._rock_ridge and joliet is not None:
+            self._joliet = True
+            self._root = self._parse_record(joliet, 156)
+
+    def _detect_rock_ridge(self):
+        """Detect Rock Ridge from the SP entry of the root directory."""
+        data = self._read(self._root.extent, 0, min(self._root.size, self._sector_size))
+        _record, system_use = self._parse_raw_record(data, 0)
+
+        if system_use[0:2] == b"SP" and system_use[4:6] == b"\xbe\xef":
+            self._rock_ridge = True
+            self._susp_skip = system_use[6]
+
+    def _parse_raw_record(self, data, offset):
+        """Parse a directory record.
+
+        :return: a tuple of a record with a raw name and its system use area
+        """
+        length = data[offset]
+
+        if length < 34 or offset + length > len(data):
+            raise ISO9660Error("Invalid directory record.")
+
+        extent = struct.unpack_from("<I", data, offset + 2)[0]
+        size = struct.unpack_from("<I", data, offset + 10)[0]
+        is_dir = bool(data[offset + 25] & 0x02)
+        name_length = data[offset + 32]
+        name = data[offset + 33:offset + 33 + name_length]
+
+        # The name is padded to an even length.
+        system_use_start = offset + 33 + name_length + (1 - name_length % 2)
+        system_use = data[system_use_start:offset + length]
+
+        return DirectoryRecord(name, extent, size, is_dir), system_use
+
+    def _parse_record(self, data, offset):
+        """Parse a directory record with a raw name."""
+        return self._parse_raw_record(data, offset)[0]
+
+    def _decode_name(self, name, system_use):
+        """Decode the name of a directory record."""
+        if self._rock_ridge:
+            rock_ridge_name = self._get_rock_ridge_name(system_use[self._susp_skip:])
+
+            if rock_ridge_name is not None:
+                return rock_ridge_name
+
+        if self._joliet:
+            name = name.decode("utf-16-be", "replace")
+        else:
+            name = name.decode("ascii", "replace").lower()
+
+        # Strip the version and the empty extension.
+        name = name.split(";")[0]
+
+        if name.endswith("."):
+            name = name[:-1]
+
+        return name
+
+    def _get_rock_ridge_name(self, system_use):
+        """Get the name from the NM entries of the system use area."""
+        areas = [system_use]
+        name = None
+        count = 0
+
+        while areas and count < MAX_CONTINUATION_AREAS:
+            area = areas.pop()
+            count += 1
+            offset = 0
+
+            while offset + 4 <= len(area):
+                signature = area[offset:offset + 2]
+                length = area[offset + 2]
+
+                if length < 4 or offset + length > len(area):
+                    break
+
+                if signature == b"NM" and length >= 5:
+                    name = (name or b"") + area[offset + 5:offset + length]
+
+                elif signature == b"CE" and length >= 28:
+                    sector = struct.unpack_from("<I", area, offset + 4)[0]
+                    start = struct.unpack_from("<I", area, offset + 12)[0]
+                    size = struct.unpack_from("<I", area, offset + 20)[0]
+                    areas.append(self._read(sector, start, size))
+
+                elif signature == b"ST":
+                    break
+
+                offset += length
+
+        if name is None:
+            return None
+
+        return name.decode("utf-8", "surrogateescape")
+
+    def _list_directory(self, record):
+        """Get the entries of a directory.
+
+        :return: a dictionary of names and directory records
+        """
+        if record.extent in self._directories:
+            return self._directories[record.extent]
+
+        if record.size > MAX_DIRECTORY_SIZE:
+            raise ISO9660Error("The directory is too big.")
+
+        data = self._read(record.extent, 0, record.size)
+        entries = {}
+        offset = 0
+
+        while offset < len(data):
+            # Records don't cross sector boundaries.
+            if data[offset] == 0:
+                offset = (offset // self._sector_size + 1) * self._sector_size
+                continue
+
+            entry, system_use = self._parse_raw_record(data, offset)
+            offset += data[offset]
+
+            # Skip the current and the parent directory.
+            if entry.name in (b"\x00", b"\x01"):
+                continue
+
+            name = self._decode_name(entry.name, system_use)
+            entries[name] = entry._replace(name=name)
+
+        self._directories[record.extent] = entries
+        return entries
+
+    def _find(self, path):
+        """Find a directory record of the path."""
+        record = self._root
+
+        for part in path.split("/"):
+            if part in ("", "."):
+                continue
+
+            if not record.is_dir:
+                return None
+
+            if not self._rock_ridge and not self._joliet:
+                part = part.lower()
+
+            record = self._list_directory(record).get(part)
+
+            if record is None:
+                return None
+
+        return record
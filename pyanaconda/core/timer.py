@@ -19,7 +19,8 @@
 #  Author(s):  Jiri Konecny <jkonecny@redhat.com>
 #
 
-from pyanaconda.core.glib import timeout_add, timeout_add_seconds, idle_add, source_remove
+from pyanaconda.core.glib import timeout_add, timeout_add_seconds, idle_add, io_add_watch, \
+    source_remove, IOCondition
 
 
 class Timer(object):
@@ -81,6 +82,26 @@ class Timer(object):
         """
         self._id = idle_add(callback, *args, **kwargs)
 
+    def watch_fd(self, fd, callback, *args, **kwargs):
+        """Schedule method to be run when the file descriptor is readable.
+
+        .. NOTE::
+            The callback will be repeatedly called until the callback will return False or
+            `cancel()` is called.
+
+        :param fd: File descriptor to watch.
+        :type fd: int
+
+        :param callback: Callback which will be called.
+        :type callback: Function.
+
+        :param args: Arguments passed to the callback.
+        :param kwargs: Keyword arguments passed to the callback.
+        """
+        self._id = io_add_watch(
+            fd, IOCondition.IN, lambda _fd, _condition: callback(*args, **kwargs)
+        )
+
     def cancel(self):
         """Cancel scheduled callback.
 
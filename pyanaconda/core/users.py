@@ -18,9 +18,12 @@
 #
 
 # Used for ascii_letters and digits constants
+import fcntl
 import os
 import os.path
+import stat
 import subprocess
+import tempfile
 from contextlib import contextmanager
 from pyanaconda.core import util
 from pyanaconda.core.configuration.anaconda import conf
@@ -174,6 +177,33 @@ def guess_username(fullname):
     return username
 
 
+# A cache of parsed databases: path -> (file identity, entries)
+_databases = {}
+
+
+def _read_database(path):
+    """Read the entries of a database like /etc/passwd or /etc/group.
+
+    The parsed entries are cached until the file is modified, so
+    a database is not parsed again for every lookup.
+
+    :param str path: a path to the database
+    :return: a list of entries as lists of fields
+    """
+    stats = os.stat(path)
+    identity = (stats.st_ino, stats.st_size, stats.st_mtime_ns)
+    cached = _databases.get(path)
+
+    if cached and cached[0] == identity:
+        return cached[1]
+
+    with open(path, "r") as f:
+        entries = [line.split(":") for line in f]
+
+    _databases[path] = (identity, entries)
+    return entries
+
+
 def _getpwnam(user_name, root):
     """Like pwd.getpwnam, but is able to use a different root.
 
@@ -182,11 +212,9 @@ def _getpwnam(user_name, root):
     :param str user_name: user name
     :param str root: filesystem root for the operation
     """
-    with open(root + "/etc/passwd", "r") as f:
-        for line in f:
-            fields = line.split(":")
-            if fields[0] == user_name:
-                return fields
+    for fields in _read_database(root + "/etc/passwd"):
+        if fields[0] == user_name:
+            return fields
 
     return None
 
@@ -199,11 +227,9 @@ def _getgrnam(group_name, root):
     :param str group_name: group name
     :param str root: filesystem root for the operation
     """
-    with open(root + "/etc/group", "r") as f:
-        for line in f:
-            fields = line.split(":")
-            if fields[0] == group_name:
-                return fields
+    for fields in _read_database(root + "/etc/group"):
+        if fields[0] == group_name:
+            return fields
 
     return None
 
@@ -219,11 +245,9 @@ def _getgrgid(gid, root):
     # Convert the probably-int GID to a string
     gid = str(gid)
 
-    with open(root + "/etc/group", "r") as f:
-        for line in f:
-            fields = line.split(":")
-            if fields[2] == gid:
-                return fields
+    for fields in _read_database(root + "/etc/group"):
+        if len(fields) > 2 and fields[2] == gid:
+            return fields
 
     return None
 
@@ -284,7 +308,7 @@ def create_group(group_name, gid=None, root=None):
 
 def create_user(username, password=False, is_crypted=False, lock=False,
                 homedir=None, uid=None, gid=None, groups=None, shell=None, gecos="",
-                root=None):
+                root=None, set_password=True):
     """Create a new user on the system with the given name.
 
     :param str username: The username for the new user to be created.
@@ -313,6 +337,9 @@ def create_user(username, password=False, is_crypted=False, lock=False,
     :param str root: The directory of the system to create the new user in.
                      The homedir option will be interpreted relative to this.
                      Defaults to conf.target.system_root.
+    :param bool set_password: Should the password be set? Use False to set
+                              passwords of many users at once with the
+                              set_user_passwords function. Defaults to True.
     """
 
     # resolve the optional arguments that need a default that can't be
@@ -428,7 +455,8 @@ def create_user(username, password=False, is_crypted=False, lock=False,
             log.critical("Unable to change owner of existing home directory: %s", e.strerror)
             raise
 
-    set_user_password(username, password, is_crypted, lock, root)
+    if set_password:
+        set_user_password(username, password, is_crypted, lock, root)
 
 
 def check_user_exists(username, root=None):
@@ -455,10 +483,26 @@ def set_user_password(username, password, is_crypted, lock, root="/"):
     :param bool lock: should the password for this username be locked ?
     :param str root: target system sysroot path
     """
+    set_user_passwords([(username, password, is_crypted, lock)], root)
+
+
+def set_user_passwords(user_passwords, root="/"):
+    """Set passwords of users.
+
+    All passwords are set with a single call of chpasswd.
+
+    :param user_passwords: a list of tuples (username, password, is_crypted, lock)
+                           with the same meaning as the arguments of set_user_password
+    :param str root: target system sysroot path
+    """
+    lines = []
+
+    for username, password, is_crypted, lock in user_passwords:
+        # Only set the password if it is a string, including the empty string.
+        # Otherwise leave it alone (defaults to locked for new users).
+        if not password and password != "":
+            continue
 
-    # Only set the password if it is a string, including the empty string.
-    # Otherwise leave it alone (defaults to locked for new users) and reset sp_lstchg
-    if password or password == "":
         if password == "":
             log.info("user account %s setup with no password", username)
         elif not is_crypted:
@@ -468,15 +512,108 @@ def set_user_password(username, password, is_crypted, lock, root="/"):
             password = "!" + password
             log.info("user account %s locked", username)
 
+        lines.append("%s:%s\n" % (username, password))
+
+    if lines:
         proc = util.startProgram(["chpasswd", "-R", root, "-e"], stdin=subprocess.PIPE)
-        proc.communicate(("%s:%s\n" % (username, password)).encode("utf-8"))
+        proc.communicate("".join(lines).encode("utf-8"))
         if proc.returncode != 0:
             raise OSError("Unable to set password for new user: status=%s" % proc.returncode)
 
     # Reset sp_lstchg to an empty string. On systems with no rtc, this
     # field can be set to 0, which has a special meaning that the password
     # must be reset on the next login.
-    util.execWithRedirect("chage", ["-R", root, "-d", "", username])
+    _clear_password_change_dates([entry[0] for entry in user_passwords], root)
+
+
+@contextmanager
+def _lock_password_files(root):
+    """Lock the password files of the target system like lckpwdf does.
+
+    :param str root: target system sysroot path
+    """
+    fd = os.open(root + "/etc/.pwd.lock", os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o600)
+
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _replace_file(path, content, template):
+    """Replace a file with the given content.
+
+    The content is written to a temporary file in the same directory
+    that gets the mode, the owner and the SELinux context of the template
+    file. The temporary file is then renamed to the path.
+
+    :param str path: a path to the file
+    :param str content: the new content of the file
+    :param str template: a path to the template file
+    """
+    stats = os.stat(template)
+    fd, tmp_path = tempfile.mkstemp(prefix=".", dir=os.path.dirname(path))
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            os.fchmod(f.fileno(), stat.S_IMODE(stats.st_mode))
+            os.fchown(f.fileno(), stats.st_uid, stats.st_gid)
+
+            try:
+                context = os.getxattr(template, "security.selinux")
+                os.setxattr(f.fileno(), "security.selinux", context)
+            except OSError:
+                pass
+
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _clear_password_change_dates(usernames, root):
+    """Clear the dates of the last password change of the given users.
+
+    The shadow database is rewritten once for all users. Like chage,
+    the password files are locked and the original database is kept
+    as the /etc/shadow- backup.
+
+    :param usernames: a list of usernames
+    :param str root: target system sysroot path
+    """
+    path = root + "/etc/shadow"
+    usernames = set(usernames)
+
+    if not usernames or not os.path.exists(path):
+        return
+
+    with _lock_password_files(root):
+        with open(path, "r") as f:
+            content = f.read()
+
+        lines = content.splitlines(keepends=True)
+        changed = False
+
+        for i, line in enumerate(lines):
+            fields = line.split(":")
+
+            if len(fields) < 3 or fields[0] not in usernames or not fields[2]:
+                continue
+
+            fields[2] = ""
+            lines[i] = ":".join(fields)
+            changed = True
+
+        if not changed:
+            return
+
+        _replace_file(path + "-", content, path)
+        _replace_file(path, "".join(lines), path)
 
 
 def set_root_password(password, is_crypted=False, lock=False, root="/"):
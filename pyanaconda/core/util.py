@@ -35,6 +35,9 @@ import imp
 import types
 import inspect
 import functools
+import codecs
+import collections
+import selectors
 
 import requests
 from requests_file import FileAdapter
@@ -59,6 +62,18 @@ from pykickstart.constants import KS_SCRIPT_ONERROR
 
 _child_env = {}
 
+# Signals reset to SIG_DFL by the restore_signals argument of subprocess.Popen.
+_RESTORED_SIGNALS = {
+    getattr(signal, name) for name in ("SIGPIPE", "SIGXFZ", "SIGXFSZ")
+    if hasattr(signal, name)
+}
+
+# A helper for running programs in a chroot without a preexec_fn.
+CHROOT_HELPER = "/usr/sbin/chroot"
+
+# A helper for resetting ignored signals without a preexec_fn.
+SIGNAL_HELPER = "/usr/bin/env"
+
 
 def setenv(name, value):
     """ Set an environment variable to be used by child processes.
@@ -123,12 +138,119 @@ def set_system_root(path):
         raise OSError("Failed to mount sysroot to {}.".format(path))
 
 
+def _get_ignored_signals():
+    """Return signals set to SIG_IGN that are not reset by restore_signals.
+
+    :return: a list of signal numbers
+    """
+    return [
+        signum for signum in range(1, signal.NSIG)
+        if signum not in _RESTORED_SIGNALS and signal.getsignal(signum) == signal.SIG_IGN
+    ]
+
+
+def _find_program(argv, root, env):
+    """Check if the program can be found in the given root.
+
+    :param argv: the command to run and arguments
+    :param root: the root of the file system
+    :param env: the environment of the program
+    :return: True if the program exists, otherwise False
+    """
+    command = argv[0]
+
+    if "/" in command:
+        return os.access(join_paths(root, command), os.X_OK)
+
+    for path in env.get("PATH", os.defpath).split(os.pathsep):
+        if os.access(join_paths(root, path, command), os.X_OK):
+            return True
+
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _can_reset_signals():
+    """Can the signal helper reset the ignored signals?
+
+    The --default-signal option of env is supported since coreutils 8.32.
+
+    :return: True or False
+    """
+    if not os.access(SIGNAL_HELPER, os.X_OK):
+        return False
+
+    try:
+        result = subprocess.run(
+            [SIGNAL_HELPER, "--default-signal", "true"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            check=False
+        )
+    except OSError:
+        return False
+
+    return result.returncode == 0
+
+
+def _get_spawn_argv(argv, root, ignored_signals):
+    """Return the command that runs the program through the helpers.
+
+    :param argv: the command to run and arguments
+    :param root: the root of the file system
+    :param ignored_signals: a list of signals to reset to SIG_DFL
+    :return: a list of the command and arguments
+    """
+    argv = list(argv)
+
+    if root and root != '/':
+        argv = [CHROOT_HELPER, root] + argv
+
+    if ignored_signals:
+        signals = ",".join(str(int(signum)) for signum in ignored_signals)
+        argv = [SIGNAL_HELPER, "--default-signal=" + signals, "--"] + argv
+
+    return argv
+
+
+def _can_spawn(argv, root, env, reset_handlers, preexec_fn):
+    """Can the program be started without a Python preexec_fn?
+
+    Without the preexec_fn, subprocess.Popen can use vfork instead of fork,
+    so the address space of the installer doesn't have to be copied. The
+    chroot is done by a helper and the signal handlers are reset with the
+    restore_signals argument of subprocess.Popen and by a signal helper.
+
+    :return: True or False
+    """
+    if preexec_fn is not None:
+        return False
+
+    if root and root != '/':
+        # Let the preexec_fn raise an OSError if the program doesn't exist.
+        if not os.access(CHROOT_HELPER, os.X_OK) or not _find_program(argv, root, env):
+            return False
+
+    if reset_handlers and _get_ignored_signals():
+        # Let Popen raise an OSError if the program doesn't exist.
+        return _can_reset_signals() and _find_program(argv, root or '/', env)
+
+    return True
+
+
 def startProgram(argv, root='/', stdin=None, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
                  env_prune=None, env_add=None, reset_handlers=True, reset_lang=True, **kwargs):
     """ Start an external program and return the Popen object.
 
-        The root and reset_handlers arguments are handled by passing a
-        preexec_fn argument to subprocess.Popen, but an additional preexec_fn
+        If possible, the program is started without a preexec_fn, so Python
+        can use vfork instead of fork. The root argument is then handled by
+        a chroot helper and the reset_handlers argument by the restore_signals
+        argument of subprocess.Popen and a signal helper.
+
+        Otherwise, the root and reset_handlers arguments are handled by passing
+        a preexec_fn argument to subprocess.Popen, but an additional preexec_fn
         can still be specified and will be run. The user preexec_fn will be run
         last.
 
@@ -157,8 +279,8 @@ def startProgram(argv, root='/', stdin=None, stdout=subprocess.PIPE, stderr=subp
     preexec_fn = kwargs.pop("preexec_fn", None)
 
     # Map reset_handlers to the restore_signals Popen argument.
-    # restore_signals handles SIGPIPE, and preexec below handles any additional
-    # signals ignored by anaconda.
+    # restore_signals handles SIGPIPE, and the signal helper or preexec below
+    # handles any additional signals ignored by anaconda.
     restore_signals = reset_handlers
 
     def preexec():
@@ -195,6 +317,18 @@ def startProgram(argv, root='/', stdin=None, stdout=subprocess.PIPE, stderr=subp
     if env_add:
         env.update(env_add)
 
+    if _can_spawn(argv, target_root, env, reset_handlers, preexec_fn):
+        ignored_signals = _get_ignored_signals() if reset_handlers else []
+        argv = _get_spawn_argv(argv, target_root, ignored_signals)
+
+        return subprocess.Popen(argv,
+                                stdin=stdin,
+                                stdout=stdout,
+                                stderr=stderr,
+                                close_fds=True,
+                                restore_signals=restore_signals,
+                                cwd=root, env=env, **kwargs)
+
     # pylint: disable=subprocess-popen-preexec-fn
     return subprocess.Popen(argv,
                             stdin=stdin,
@@ -261,10 +395,161 @@ def startX(argv, output_redirect=None, timeout=X_TIMEOUT):
         signal.signal(signal.SIGALRM, old_sigalrm_handler)
 
 
+class _ProgramOutput(object):
+    """Output of a program processed as it arrives.
+
+    Complete lines are logged immediately and the data can be written
+    to a stream. The captured data can be limited to the given number
+    of bytes, in which case only the last complete lines are kept.
+    """
+
+    def __init__(self, log_output=True, stream=None, binary=False, capture=True,
+                 max_size=None):
+        """Create a new program output.
+
+        :param log_output: whether to log the output
+        :param stream: a file object to write the output to or None
+        :param binary: whether the output is binary data
+        :param capture: whether to capture the output
+        :param max_size: a maximal number of captured bytes or None
+        """
+        self._log_output = log_output
+        self._stream = stream
+        self._binary = binary
+        self._capture = capture
+        self._max_size = max_size
+
+        self._line = b""
+        self._chunks = collections.deque()
+        self._size = 0
+        self._truncated = False
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._last_char = "\n"
+
+    def feed(self, data):
+        """Process a new chunk of the output."""
+        if self._log_output:
+            self._log_lines(data)
+
+        if self._stream:
+            self._write(data)
+
+        if self._capture:
+            self._store(data)
+
+    def close(self):
+        """Process the end of the output."""
+        if self._log_output and self._line:
+            self._log_lines(b"\n")
+
+        if self._stream and not self._binary:
+            self._write(b"", final=True)
+
+    def _log_lines(self, data):
+        """Log complete lines of the output."""
+        *lines, self._line = (self._line + data).split(b"\n")
+
+        if not lines:
+            return
+
+        with program_log_lock:
+            for line in lines:
+                # Replace all undecodable data by "safe" printable representations.
+                program_log.info(line.decode("utf-8", "replace").strip())
+
+    def _write(self, data, final=False):
+        """Write the output to the stream."""
+        if self._binary:
+            self._stream.write(data)
+            return
+
+        text = self._decoder.decode(data, final)
+
+        if text:
+            self._stream.write(text)
+            self._last_char = text[-1]
+
+        if final and self._last_char != "\n":
+            self._stream.write("\n")
+
+    def _store(self, data):
+        """Capture the output."""
+        self._chunks.append(data)
+        self._size += len(data)
+
+        if self._max_size is None:
+            return
+
+        excess = self._size - self._max_size
+
+        while excess > 0:
+            self._truncated = True
+            chunk = self._chunks.popleft()
+
+            if len(chunk) > excess:
+                self._chunks.appendleft(chunk[excess:])
+                self._size -= excess
+                break
+
+            self._size -= len(chunk)
+            excess -= len(chunk)
+
+    def get_value(self):
+        """Return the captured output.
+
+        :return: bytes for binary output, otherwise a string
+        """
+        data = b"".join(self._chunks)
+
+        if self._truncated:
+            # Drop the incomplete first line.
+            data = data[data.find(b"\n") + 1:]
+
+        if self._binary:
+            return data
+
+        output_string = data.decode("utf-8")
+        if output_string and output_string[-1] != "\n":
+            output_string = output_string + "\n"
+
+        return output_string
+
+
+def _read_program_output(proc, outputs):
+    """Read the pipes of the running program until they are closed.
+
+    :param proc: a Popen object
+    :param outputs: a dictionary of pipes and instances of _ProgramOutput
+    """
+    with selectors.DefaultSelector() as selector:
+        for pipe, output in outputs.items():
+            selector.register(pipe, selectors.EVENT_READ, output)
+
+        while selector.get_map():
+            for key, _events in selector.select():
+                data = os.read(key.fd, 65536)
+
+                if data:
+                    key.data.feed(data)
+                    continue
+
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+                key.data.close()
+
+    proc.wait()
+
+
 def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_output=True,
-                 binary_output=False, filter_stderr=False):
+                 binary_output=False, filter_stderr=False, capture_output=True,
+                 max_output_size=None):
     """ Run an external program, log the output and return it to the caller
 
+        The output is read as it arrives and complete lines are logged
+        immediately, so the progress of long running commands is visible
+        in the program log.
+
         NOTE/WARNING: UnicodeDecodeError will be raised if the output of the of the
                       external command can't be decoded as UTF-8.
 
@@ -276,6 +561,8 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
         :param log_output: whether to log the output of command
         :param binary_output: whether to treat the output of command as binary data
         :param filter_stderr: whether to exclude the contents of stderr from the returned output
+        :param capture_output: whether to return the output of command
+        :param max_output_size: a maximal number of returned bytes or None
         :return: The return code of the command and the output
     """
     try:
@@ -287,38 +574,27 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
         proc = startProgram(argv, root=root, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr,
                             env_prune=env_prune)
 
-        (output_string, err_string) = proc.communicate()
-        if not binary_output:
-            output_string = output_string.decode("utf-8")
-            if output_string and output_string[-1] != "\n":
-                output_string = output_string + "\n"
-
-        if log_output:
-            with program_log_lock:
-                if binary_output:
-                    # try to decode as utf-8 and replace all undecodable data by
-                    # "safe" printable representations when logging binary output
-                    decoded_output_lines = output_string.decode("utf-8", "replace")
-                else:
-                    # output_string should already be a Unicode string
-                    decoded_output_lines = output_string.splitlines(True)
-
-                for line in decoded_output_lines:
-                    program_log.info(line.strip())
-
-        if stdout:
-            stdout.write(output_string)
+        output = _ProgramOutput(
+            log_output=log_output,
+            stream=stdout,
+            binary=binary_output,
+            capture=capture_output,
+            max_size=max_output_size
+        )
+        outputs = {proc.stdout: output}
 
         # If stderr was filtered, log it separately
-        if filter_stderr and err_string and log_output:
-            # try to decode as utf-8 and replace all undecodable data by
-            # "safe" printable representations when logging binary output
-            decoded_err_string = err_string.decode("utf-8", "replace")
-            err_lines = decoded_err_string.splitlines(True)
+        if filter_stderr:
+            outputs[proc.stderr] = _ProgramOutput(log_output=log_output, capture=False)
+
+        _read_program_output(proc, outputs)
 
-            with program_log_lock:
-                for line in err_lines:
-                    program_log.info(line.strip())
+        if capture_output:
+            output_string = output.get_value()
+        elif binary_output:
+            output_string = b""
+        else:
+            output_string = ""
 
     except OSError as e:
         with program_log_lock:
@@ -361,7 +637,8 @@ def execWithRedirect(command, argv, stdin=None, stdout=None,
     """
     argv = [command] + argv
     return _run_program(argv, stdin=stdin, stdout=stdout, root=root, env_prune=env_prune,
-                        log_output=log_output, binary_output=binary_output)[0]
+                        log_output=log_output, binary_output=binary_output,
+                        capture_output=False)[0]
 
 
 def execWithCapture(command, argv, stdin=None, root='/', log_output=True, filter_stderr=False):
@@ -578,11 +855,16 @@ def _run_systemctl(command, service, root="/"):
     """
     Runs 'systemctl command service.service'
 
+    :param service: a name of the service or a list of names
     :return: exit status of the systemctl
 
     """
 
-    args = [command, service]
+    if isinstance(service, str):
+        args = [command, service]
+    else:
+        args = [command] + list(service)
+
     if root != "/":
         args += ["--root", root]
 
@@ -663,6 +945,52 @@ def disable_service(service, root=None):
         log.warning("Disabling %s failed. It probably doesn't exist", service)
 
 
+def enable_services(services, root=None):
+    """ Enable systemd services in the sysroot.
+
+    All services are enabled by one call of systemctl. If the call
+    fails, the services are enabled one by one to find the failed one.
+
+    :param services: a list of names of the services to enable
+    :param str root: path to the sysroot or None to use default sysroot path
+    """
+    if not services:
+        return
+
+    if root is None:
+        root = conf.target.system_root
+
+    ret = _run_systemctl("enable", services, root=root)
+
+    if ret != 0:
+        log.warning("Enabling services failed: %s", ret)
+
+        for service in services:
+            enable_service(service, root=root)
+
+
+def disable_services(services, root=None):
+    """ Disable systemd services in the sysroot.
+
+    All services are disabled by one call of systemctl. If the call
+    fails, the services are disabled one by one to find the failed ones.
+
+    :param services: a list of names of the services to disable
+    :param str root: path to the sysroot or None to use default sysroot path
+    """
+    if not services:
+        return
+
+    if root is None:
+        root = conf.target.system_root
+
+    ret = _run_systemctl("disable", services, root=root)
+
+    if ret != 0:
+        for service in services:
+            disable_service(service, root=root)
+
+
 def dracut_eject(device):
     """
     Use dracut shutdown hook to eject media after the system is shutdown.
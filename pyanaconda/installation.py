@@ -35,7 +35,7 @@ from pyanaconda.core.i18n import N_
 from pyanaconda.threading import threadMgr
 from pyanaconda.kickstart import runPostScripts, runPreInstallScripts
 from pyanaconda.kexec import setup_kexec
-from pyanaconda.installation_tasks import Task, TaskQueue
+from pyanaconda.installation_tasks import Task, TaskQueue, ParallelTaskQueue
 from pykickstart.constants import SNAPSHOT_WHEN_POST_INSTALL
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -43,6 +43,12 @@ log = get_module_logger(__name__)
 
 __all__ = ["run_installation"]
 
+# Results of the installation tasks used to order parallel tasks.
+TIMEZONE_CONFIGURED = "timezone-configured"
+SERVICES_CONFIGURED = "services-configured"
+RESOLVER_CONFIGURED = "resolver-configured"
+REALM_DISCOVERED = "realm-discovered"
+
 
 class WriteResolvConfTask(Task):
     """Custom task subclass for handling the resolv.conf copy task.
@@ -72,12 +78,18 @@ def _writeKS(ksdata):
         f.write(str(ksdata))
 
 
+def _report_queue_started(queue):
+    """Report the status message of a started task queue (if any)."""
+    if queue.status_message:
+        progress_message(queue.status_message)
+
+
 def _prepare_configuration(payload, ksdata):
     """Configure the installed system."""
 
     configuration_queue = TaskQueue("Configuration queue")
     # connect progress reporting
-    configuration_queue.queue_started.connect(lambda x: progress_message(x.status_message))
+    configuration_queue.queue_started.connect(_report_queue_started)
     configuration_queue.task_completed.connect(lambda x: progress_step(x.name))
 
     # add installation tasks for the Subscription DBus module
@@ -91,35 +103,48 @@ def _prepare_configuration(payload, ksdata):
         configuration_queue.append(subscription_config)
 
     # schedule the execute methods of ksdata that require an installed system to be present
-    os_config = TaskQueue("Installed system configuration", N_("Configuring installed system"))
+    # - the tasks of different modules are independent, so they can run in parallel
+    os_config = ParallelTaskQueue("Installed system configuration",
+                                  N_("Configuring installed system"))
 
     # add installation tasks for the Security DBus module
     security_proxy = SECURITY.get_proxy()
+    security_config = TaskQueue("Security configuration")
     security_dbus_tasks = security_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(SECURITY, security_dbus_tasks)
+    security_config.append_dbus_tasks(SECURITY, security_dbus_tasks)
+    os_config.append(security_config)
 
     # add installation tasks for the Timezone DBus module
     # run these tasks before tasks of the Services module
     timezone_proxy = TIMEZONE.get_proxy()
+    timezone_config = TaskQueue("Timezone configuration", provides=[TIMEZONE_CONFIGURED])
     timezone_dbus_tasks = timezone_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(TIMEZONE, timezone_dbus_tasks)
+    timezone_config.append_dbus_tasks(TIMEZONE, timezone_dbus_tasks)
+    os_config.append(timezone_config)
 
     # add installation tasks for the Services DBus module
     services_proxy = SERVICES.get_proxy()
+    services_config = TaskQueue("Services configuration",
+                                requires=[TIMEZONE_CONFIGURED],
+                                provides=[SERVICES_CONFIGURED])
     services_dbus_tasks = services_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(SERVICES, services_dbus_tasks)
+    services_config.append_dbus_tasks(SERVICES, services_dbus_tasks)
+    os_config.append(services_config)
 
     # add installation tasks for the Localization DBus module
     localization_proxy = LOCALIZATION.get_proxy()
+    localization_config = TaskQueue("Localization configuration")
     localization_dbus_tasks = localization_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(LOCALIZATION, localization_dbus_tasks)
+    localization_config.append_dbus_tasks(LOCALIZATION, localization_dbus_tasks)
+    os_config.append(localization_config)
 
     # add the Firewall configuration task
+    # - the firewall service might be enabled or disabled
     firewall_proxy = NETWORK.get_proxy(FIREWALL)
+    firewall_config = TaskQueue("Firewall configuration", requires=[SERVICES_CONFIGURED])
     firewall_dbus_task = firewall_proxy.InstallWithTask()
-    os_config.append_dbus_tasks(NETWORK, [firewall_dbus_task])
-
-    configuration_queue.append(os_config)
+    firewall_config.append_dbus_tasks(NETWORK, [firewall_dbus_task])
+    os_config.append(firewall_config)
 
     # schedule network configuration (if required)
     if conf.system.provides_network_config:
@@ -127,14 +152,16 @@ def _prepare_configuration(payload, ksdata):
         network_config = TaskQueue("Network configuration", N_("Writing network configuration"))
         network_config.append(Task("Network configuration",
                                    network.write_configuration, (overwrite, )))
-        configuration_queue.append(network_config)
+        os_config.append(network_config)
 
     # add installation tasks for the Users DBus module
     user_config = TaskQueue("User creation", N_("Creating users"))
     users_proxy = USERS.get_proxy()
     users_dbus_tasks = users_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(USERS, users_dbus_tasks)
-    configuration_queue.append(user_config)
+    user_config.append_dbus_tasks(USERS, users_dbus_tasks)
+    os_config.append(user_config)
+
+    configuration_queue.append(os_config)
 
     # Anaconda addon configuration
     addon_config = TaskQueue("Anaconda addon configuration", N_("Configuring addons"))
@@ -211,7 +238,7 @@ def _prepare_installation(payload, ksdata):
     """
     installation_queue = TaskQueue("Installation queue")
     # connect progress reporting
-    installation_queue.queue_started.connect(lambda x: progress_message(x.status_message))
+    installation_queue.queue_started.connect(_report_queue_started)
     installation_queue.task_completed.connect(lambda x: progress_step(x.name))
 
     # This should be the only thread running, wait for the others to finish if not.
@@ -232,23 +259,26 @@ def _prepare_installation(payload, ksdata):
         wait_for_threads.append(Task("Wait for all threads to finish", wait_for_all_treads))
         installation_queue.append(wait_for_threads)
 
+    # setup the installation environment
+    setup_environment = ParallelTaskQueue("Installation environment setup",
+                                          N_("Setting up the installation environment"))
+
     # Save system time to HW clock.
     # - this used to be before waiting on threads, but I don't think that's needed
     if conf.system.can_set_hardware_clock:
-        # lets just do this as a top-level task - no
         save_hwclock = Task("Save system time to HW clock", timezone.save_hw_clock)
-        installation_queue.append(save_hwclock)
+        setup_environment.append(save_hwclock)
 
-    # setup the installation environment
-    setup_environment = TaskQueue("Installation environment setup", N_("Setting up the installation environment"))
-    setup_environment.append(Task(
+    setup_addons = TaskQueue("Addons setup")
+    setup_addons.append(Task(
         "Setup addons",
         ksdata.addons.setup,
         (None, ksdata, payload)
     ))
 
     boss_proxy = BOSS.get_proxy()
-    setup_environment.append_dbus_tasks(BOSS, [boss_proxy.ConfigureRuntimeWithTask()])
+    setup_addons.append_dbus_tasks(BOSS, [boss_proxy.ConfigureRuntimeWithTask()])
+    setup_environment.append(setup_addons)
 
     installation_queue.append(setup_environment)
 
@@ -274,17 +304,20 @@ def _prepare_installation(payload, ksdata):
     # Do various pre-installation tasks
     # - try to discover a realm (if any)
     # - check for possibly needed additional packages.
-    pre_install = TaskQueue("Pre install tasks", N_("Running pre-installation tasks"))
+    pre_install = ParallelTaskQueue("Pre install tasks", N_("Running pre-installation tasks"))
 
     # make name resolution work for rpm scripts in chroot
     if conf.system.provides_resolver_config:
         # we use a custom Task subclass as the sysroot path has to be resolved
         # only when the task is actually started, not at task creation time
-        pre_install.append(WriteResolvConfTask("Copy resolv.conf to sysroot"))
+        pre_install.append(WriteResolvConfTask("Copy resolv.conf to sysroot",
+                                               provides=[RESOLVER_CONFIGURED]))
 
     # realm discovery
     security_proxy = SECURITY.get_proxy()
-    pre_install.append_dbus_tasks(SECURITY, [security_proxy.DiscoverRealmWithTask()])
+    realm_discovery = TaskQueue("Realm discovery", provides=[REALM_DISCOVERED])
+    realm_discovery.append_dbus_tasks(SECURITY, [security_proxy.DiscoverRealmWithTask()])
+    pre_install.append(realm_discovery)
 
     def run_pre_install():
         """This means to gather what additional packages (if any) are needed & executing payload.pre_install()."""
@@ -313,7 +346,8 @@ def _prepare_installation(payload, ksdata):
 
         payload.pre_install()
 
-    pre_install.append(Task("Find additional packages & run pre_install()", run_pre_install))
+    pre_install.append(Task("Find additional packages & run pre_install()", run_pre_install,
+                            requires=[REALM_DISCOVERED, RESOLVER_CONFIGURED]))
     installation_queue.append(pre_install)
 
     payload_install = TaskQueue("Payload installation", N_("Installing."))
@@ -17,6 +17,7 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from threading import RLock
 
 from dasbus.error import DBusError
@@ -31,6 +32,9 @@ from pyanaconda.progress import progress_message
 
 log = get_module_logger(__name__)
 
+# The default number of items of a parallel task queue that can run at once.
+PARALLEL_TASK_QUEUE_WORKERS = 4
+
 
 class BaseTask(object):
     """A base class for Task and TaskQueue.
@@ -38,8 +42,10 @@ class BaseTask(object):
     It holds shared methods, properties and signals.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, requires=(), provides=()):
         self._name = name
+        self._requires = frozenset(requires)
+        self._provides = frozenset(provides)
         self._done = False
         self._running = False
         self._lock = RLock()
@@ -58,6 +64,27 @@ class BaseTask(object):
         """
         return self._name
 
+    @property
+    def requires(self):
+        """Names of the results required by the task.
+
+        The task can't be started before all tasks that provide
+        these results are done.
+
+        :returns: a set of names
+        :rtype: frozenset
+        """
+        return self._requires
+
+    @property
+    def provides(self):
+        """Names of the results provided by the task.
+
+        :returns: a set of names
+        :rtype: frozenset
+        """
+        return self._provides
+
     @property
     @synchronized
     def running(self):
@@ -106,8 +133,8 @@ class TaskQueue(BaseTask):
     TaskQueues and Tasks can be mixed in a single TaskQueue.
     """
 
-    def __init__(self, name, status_message=None):
-        super().__init__(name=name)
+    def __init__(self, name, status_message=None, requires=(), provides=()):
+        super().__init__(name=name, requires=requires, provides=provides)
         self._status_message = status_message
         self._current_task_number = None
         self._current_queue_number = None
@@ -302,13 +329,12 @@ class TaskQueue(BaseTask):
                     log.warning("Attempting to start an empty task queue (%s).", self.name)
 
         if do_start:
-            # go over all task groups and their tasks in order
             self.started.emit(self)
             if len(self) == 0:
                 log.warning("The task group %s is empty.", self.name)
-            for item in self:
-                # start the item (TaskQueue/Task)
-                item.start()
+
+            # run the task groups and their tasks
+            self._run_items(list(self))
 
             # we are done, set the task queue state accordingly
             with self._lock:
@@ -321,6 +347,17 @@ class TaskQueue(BaseTask):
             # trigger the "completed" signals
             self.completed.emit(self)
 
+    def _run_items(self, items):
+        """Run the given items of the task queue.
+
+        The items are started one by one in order.
+
+        :param items: a list of TaskQueues and Tasks
+        """
+        for item in items:
+            # start the item (TaskQueue/Task)
+            item.start()
+
     # implement the Python list "interface" and make sure parent is always
     # set to a correct value
     @synchronized
@@ -386,6 +423,137 @@ class TaskQueue(BaseTask):
     # - __add__(), __radd__() - same as above
 
 
+class _SynchronizedSignal(Signal):
+    """A signal that is emitted while holding the given lock."""
+
+    def __init__(self, lock):
+        super().__init__()
+        self._lock = lock
+
+    def emit(self, *args, **kargs):
+        with self._lock:
+            super().emit(*args, **kargs)
+
+
+class ParallelTaskQueue(TaskQueue):
+    """ParallelTaskQueue runs independent TaskQueues or Tasks at the same time.
+
+    The items of the queue declare what they require and what they provide.
+    An item is started once all previous items that provide its requirements
+    are done, so the order of dependent items is kept, but independent items
+    run concurrently. Requirements that are not provided by any previous item
+    of the queue are considered to be satisfied.
+
+    The number of items running at the same time is limited by max_workers.
+
+    The signals of the queue are emitted one at a time, so the progress
+    reporting connected to the parent queues doesn't have to be thread-safe.
+    """
+
+    def __init__(self, name, status_message=None, requires=(), provides=(),
+                 max_workers=PARALLEL_TASK_QUEUE_WORKERS):
+        super().__init__(name=name, status_message=status_message,
+                         requires=requires, provides=provides)
+        self._max_workers = max_workers
+
+        # serialize the signals of the nested queues and tasks
+        signal_lock = RLock()
+        self.queue_started = _SynchronizedSignal(signal_lock)
+        self.queue_completed = _SynchronizedSignal(signal_lock)
+        self.task_started = _SynchronizedSignal(signal_lock)
+        self.task_completed = _SynchronizedSignal(signal_lock)
+
+        self.queue_started.connect(self._queue_started_cb)
+        self.task_started.connect(self._task_started_cb)
+
+    @property
+    def max_workers(self):
+        """The maximal number of items running at the same time.
+
+        :rtype: int
+        """
+        return self._max_workers
+
+    @property
+    @synchronized
+    def summary(self):
+        """Return a multi-line summary of the contents of the task queue.
+
+        :returns: summary of task queue contents
+        :rtype: str
+        """
+        message = super().summary
+
+        if self.parent is None:
+            return message
+
+        return message.replace("Task queue:", "Parallel task queue:", 1)
+
+    @staticmethod
+    def _get_dependencies(items):
+        """Get dependencies of the given items.
+
+        :param items: a list of TaskQueues and Tasks
+        :returns: a list of sets of indexes of previous items required by each item
+        """
+        dependencies = []
+
+        for index, item in enumerate(items):
+            dependencies.append({
+                previous for previous in range(index)
+                if item.requires & items[previous].provides
+            })
+
+        return dependencies
+
+    def _run_items(self, items):
+        """Run the given items of the task queue.
+
+        Start all items with satisfied requirements and wait for any of
+        them to finish. If an item fails, no other items are started and
+        the error is raised once the running items are done.
+
+        :param items: a list of TaskQueues and Tasks
+        """
+        dependencies = self._get_dependencies(items)
+        waiting = list(range(len(items)))
+        finished = set()
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self._max_workers,
+                                thread_name_prefix="AnaTaskQueue") as executor:
+            while True:
+                # start the items that are ready
+                for index in list(waiting):
+                    if error or len(running) >= self._max_workers:
+                        break
+
+                    if dependencies[index] <= finished:
+                        waiting.remove(index)
+                        future = executor.submit(items[index].start)
+                        running[future] = index
+
+                if not running:
+                    break
+
+                # wait for some of the running items
+                done, _not_done = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index = running.pop(future)
+                    finished.add(index)
+
+                    try:
+                        future.result()
+                    except Exception as e:  # pylint: disable=broad-except
+                        log.error("Task %s has failed: %s", items[index].name, e)
+                        error = error or e
+
+        if error:
+            raise error
+
+
 class Task(BaseTask):
     """Task is a wrapper for a single installation related task.
 
@@ -402,8 +570,9 @@ class Task(BaseTask):
     Task instances to run.
     """
 
-    def __init__(self, name, task=None, task_args=None, task_kwargs=None):
-        super().__init__(name=name)
+    def __init__(self, name, task=None, task_args=None, task_kwargs=None,
+                 requires=(), provides=()):
+        super().__init__(name=name, requires=requires, provides=provides)
         self._task = task
         if task_args is None:
             task_args = []
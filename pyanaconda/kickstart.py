@@ -471,6 +471,27 @@ def preScriptPass(f):
     runPreScripts(ksparser.handler.scripts)
 
 
+def readSplitKickstart(ksparser, kickstart, line_references):
+    """Read the kickstart split by the Boss.
+
+    The line numbers of kickstart errors are mapped to the
+    line numbers of the original kickstart files.
+
+    :param ksparser: a kickstart parser
+    :param kickstart: a kickstart string without includes
+    :param line_references: a list of (line number, file name)
+    """
+    try:
+        ksparser.readKickstartFromString(kickstart)
+    except KickstartError as e:
+        if e.lineno is None or not 0 < e.lineno < len(line_references):
+            raise
+
+        lineno, filename = line_references[e.lineno]
+        message = "{}: {}".format(filename, e.message) if filename else e.message
+        raise e.__class__(message, lineno=lineno) from e
+
+
 def parseKickstart(handler, f, strict_mode=False, pass_to_boss=False):
     # preprocessing the kickstart file has already been handled in initramfs.
 
@@ -505,8 +526,13 @@ def parseKickstart(handler, f, strict_mode=False, pass_to_boss=False):
                     message = "\n\n".join(map(str, report.error_messages))
                     raise KickstartError(message)
 
-            # Parse the kickstart file in anaconda.
-            ksparser.readKickstart(f)
+                # Parse the kickstart split by the Boss in anaconda,
+                # so the included files are not read again.
+                kickstart, line_references = boss.GetSplitKickstart()
+                readSplitKickstart(ksparser, kickstart, line_references)
+            else:
+                # Parse the kickstart file in anaconda.
+                ksparser.readKickstart(f)
 
             # Process pykickstart warnings in the strict mode:
             if strict_mode and kswarnings:
@@ -81,6 +81,13 @@ class Boss(Service):
         log.info("Reading a kickstart file at %s.", path)
         return self._kickstart_manager.read_kickstart_file(path)
 
+    def get_split_kickstart(self):
+        """Get the last successfully read kickstart.
+
+        :return: a kickstart string and a list of line references
+        """
+        return self._kickstart_manager.get_split_kickstart()
+
     def generate_kickstart(self):
         """Return a kickstart representation of modules.
 
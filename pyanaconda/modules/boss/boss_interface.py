@@ -58,6 +58,19 @@ class BossInterface(InterfaceTemplate):
             self.implementation.read_kickstart_file(path)
         )
 
+    def GetSplitKickstart(self) -> Tuple[Str, List[Tuple[Int, Str]]]:
+        """Get the last successfully read kickstart.
+
+        The kickstart doesn't contain any includes. The line
+        references map its lines to the original kickstart files.
+        The first reference belongs to the line number zero.
+
+        :return: a kickstart string and a list of line references
+                 in the format (line number, file name)
+        """
+        kickstart, line_references = self.implementation.get_split_kickstart()
+        return kickstart, line_references
+
     def GenerateKickstart(self) -> Str:
         """Return a kickstart representation of modules.
 
@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+import shlex
+
 from enum import Enum
 
 
@@ -132,11 +134,13 @@ class KickstartElement(object):
             content = lines[0]
         elif self._type in (self.KickstartElementType.ADDON,
                             self.KickstartElementType.SECTION):
+            # Quote the arguments, so the header can be parsed again.
+            header = " ".join(map(shlex.quote, self._args))
             body = "".join(self._lines)
             if body:
-                content = "{}\n{}%end\n".format(" ".join(self._args), body)
+                content = "{}\n{}%end\n".format(header, body)
             else:
-                content = "{}\n%end\n".format(" ".join(self._args))
+                content = "{}\n%end\n".format(header)
         return content
 
 
@@ -16,10 +16,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+from concurrent.futures import ThreadPoolExecutor
+
 from pykickstart.errors import KickstartError
 from pykickstart.version import makeVersion
 
 from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.modules.boss.kickstart_manager.element import KickstartElements
 from pyanaconda.modules.boss.kickstart_manager.parser import SplitKickstartParser,\
     VALID_SECTIONS_ANACONDA
 from pyanaconda.modules.common.constants.services import BOSS
@@ -29,12 +32,17 @@ log = get_module_logger(__name__)
 
 __all__ = ['KickstartManager']
 
+# The maximal number of modules that read the kickstart at the same time.
+KICKSTART_DISTRIBUTION_WORKERS = 8
+
 
 class KickstartManager(object):
     """Distributes kickstart to modules and collects it back."""
 
     def __init__(self):
         self._module_observers = []
+        self._handler = None
+        self._elements = None
 
     @property
     def module_observers(self):
@@ -52,6 +60,7 @@ class KickstartManager(object):
         :returns: a kickstart report
         """
         report = KickstartReport()
+        self._elements = None
 
         try:
             elements = self._split_to_elements(path)
@@ -63,24 +72,89 @@ class KickstartManager(object):
             report.error_messages.append(data)
         else:
             self._merge_module_reports(report, reports)
+            self._elements = elements
 
         return report
 
+    def get_split_kickstart(self):
+        """Get the last successfully read kickstart.
+
+        The kickstart is generated from the split elements, so it
+        doesn't contain any includes. Use the line references to map
+        its lines to the lines of the original kickstart files.
+
+        :return: a kickstart string and a list of line references
+        :rtype: a tuple of a string and a list of (line number, file name)
+        """
+        all_elements = self._elements.all_elements if self._elements else []
+        kickstart = KickstartElements.get_kickstart_from_elements(all_elements)
+        line_references = KickstartElements.get_references_from_elements(all_elements)
+        return kickstart, line_references
+
+    def _get_handler(self):
+        """Get a kickstart handler for splitting.
+
+        The handler is created only once, because it is used just
+        to look up the commands.
+        """
+        if not self._handler:
+            self._handler = makeVersion()
+
+        return self._handler
+
     def _split_to_elements(self, path):
         """Split the kickstart given by path into elements."""
-        handler = makeVersion()
+        handler = self._get_handler()
         parser = SplitKickstartParser(handler, valid_sections=VALID_SECTIONS_ANACONDA)
         return parser.split(path)
 
     def _distribute_to_modules(self, elements):
-        """Distribute split kickstart to modules synchronously.
+        """Distribute split kickstart to modules.
+
+        The modules read their kickstart data at the same time, but
+        the reports are processed in the order of module observers.
 
         :returns: list of (Line number, Message) errors reported by modules when
                   distributing kickstart
         :rtype: list of kickstart reports
         """
+        requests = self._split_to_modules(elements)
+
+        if not requests:
+            return []
+
+        workers = min(len(requests), KICKSTART_DISTRIBUTION_WORKERS)
+
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="AnaKickstartManager") as executor:
+            futures = [
+                executor.submit(observer.proxy.ReadKickstart, module_kickstart)
+                for observer, module_kickstart, _line_references in requests
+            ]
+
         reports = []
 
+        for (observer, _kickstart, line_references), future in zip(requests, futures):
+            module_report = KickstartReport.from_structure(future.result())
+
+            for message in module_report.get_messages():
+                line_number, file_name = line_references[message.line_number]
+                message.line_number = line_number
+                message.file_name = file_name
+                message.module_name = observer.service_name
+
+            reports.append(module_report)
+
+        return reports
+
+    def _split_to_modules(self, elements):
+        """Split the kickstart elements between modules.
+
+        :returns: a list of module observers, their kickstarts and line references
+        :rtype: list of tuples
+        """
+        requests = []
+
         for observer in self._module_observers:
             if not observer.is_service_available:
                 log.warning("Module %s not available!", observer.service_name)
@@ -107,23 +181,13 @@ class KickstartManager(object):
                 log.info("There are no kickstart data for %s.", observer.service_name)
                 continue
 
-            module_report = KickstartReport.from_structure(
-                observer.proxy.ReadKickstart(module_kickstart)
-            )
-
             line_references = elements.get_references_from_elements(
                 module_elements
             )
 
-            for message in module_report.get_messages():
-                line_number, file_name = line_references[message.line_number]
-                message.line_number = line_number
-                message.file_name = file_name
-                message.module_name = observer.service_name
-
-            reports.append(module_report)
+            requests.append((observer, module_kickstart, line_references))
 
-        return reports
+        return requests
 
     def _merge_module_reports(self, report, module_reports):
         """Merge the module reports into the final report."""
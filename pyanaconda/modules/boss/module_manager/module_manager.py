@@ -20,6 +20,7 @@ from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.signal import Signal
 from pyanaconda.core.dbus import DBus
 from pyanaconda.modules.boss.module_manager.start_modules import StartModulesTask
+from pyanaconda.modules.zygote.zygote import ZygoteProcess
 
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
@@ -30,6 +31,7 @@ class ModuleManager(object):
 
     def __init__(self):
         self._module_observers = []
+        self._zygote = None
         self.module_observers_changed = Signal()
 
     @property
@@ -44,10 +46,14 @@ class ModuleManager(object):
 
     def start_modules_with_task(self):
         """Start modules with the task."""
+        if conf.anaconda.modules_zygote and not self._zygote:
+            self._zygote = ZygoteProcess()
+
         task = StartModulesTask(
             DBus,
             conf.anaconda.kickstart_modules,
-            conf.anaconda.addons_enabled
+            conf.anaconda.addons_enabled,
+            zygote=self._zygote
         )
         task.succeeded_signal.connect(
             lambda: self.set_module_observers(task.get_result())
@@ -92,3 +98,7 @@ class ModuleManager(object):
             # modules to quit before the boss can quit itself.
             observer.proxy.Quit()
             log.debug("%s has quit.", observer)
+
+        # The modules don't need the zygote anymore.
+        if self._zygote:
+            self._zygote.stop()
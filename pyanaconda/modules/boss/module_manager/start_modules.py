@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+import time
 from queue import SimpleQueue
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -25,12 +26,41 @@ from pyanaconda.modules.boss.module_manager import ModuleObserver
 from pyanaconda.modules.common.constants.namespaces import ADDONS_NAMESPACE
 from pyanaconda.modules.common.errors.module import UnavailableModuleError
 from pyanaconda.modules.common.task import Task
+from pyanaconda.modules.zygote.client import ZYGOTE_SOCKET_ENVIRONMENT
 
 log = get_module_logger(__name__)
 
 __all__ = ["StartModulesTask"]
 
 
+def _read_memory_value(path, key):
+    """Read a memory value in KiB from the given proc file."""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(key):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return None
+
+
+def get_memory_usage(pid):
+    """Get the memory usage of the process.
+
+    The proportional set size (PSS) divides the shared pages
+    between the processes that share them, so it shows the
+    memory that is really used by the process.
+
+    :param pid: a process id
+    :return: a tuple of RSS and PSS in KiB or None if unknown
+    """
+    rss = _read_memory_value("/proc/{}/status".format(pid), "VmRSS:")
+    pss = _read_memory_value("/proc/{}/smaps_rollup".format(pid), "Pss:")
+    return rss, pss
+
+
 class StartModulesTask(Task):
     """A task for starting DBus modules.
 
@@ -39,19 +69,23 @@ class StartModulesTask(Task):
     method StartServiceByName is called.
     """
 
-    def __init__(self, message_bus, module_names, addons_enabled):
+    def __init__(self, message_bus, module_names, addons_enabled, zygote=None):
         """Create a new task.
 
         :param message_bus: a message bus
         :param module_names: a list of DBus names of modules
         :param addons_enabled: True to enable addons, otherwise False
+        :param zygote: a zygote process of modules or None
         """
         super().__init__()
         self._message_bus = message_bus
         self._module_names = module_names
         self._addons_enabled = addons_enabled
+        self._zygote = zygote
         self._module_observers = []
         self._callbacks = SimpleQueue()
+        self._start_times = {}
+        self._startup_times = {}
 
     @property
     def name(self):
@@ -63,6 +97,10 @@ class StartModulesTask(Task):
 
         :return: a list of observers
         """
+        # Start the zygote, so the modules can be forked from it.
+        if self._zygote and self._zygote.start():
+            self._set_zygote_socket(self._zygote.socket_path)
+
         # Collect the modules.
         self._module_observers = self._find_modules() + self._find_addons()
 
@@ -80,8 +118,21 @@ class StartModulesTask(Task):
             callback = self._callbacks.get()
             unavailable.discard(callback())
 
+        # Report the started modules.
+        self._report_modules(self._module_observers)
         return self._module_observers
 
+    def _set_zygote_socket(self, socket_path):
+        """Tell the activated modules where to find the zygote.
+
+        The start-module script reads the path from its environment.
+
+        :param socket_path: a path to the socket of the zygote
+        """
+        self._message_bus.proxy.UpdateActivationEnvironment({
+            ZYGOTE_SOCKET_ENVIRONMENT: socket_path
+        })
+
     def _find_modules(self):
         """Find modules."""
         modules = []
@@ -125,6 +176,7 @@ class StartModulesTask(Task):
 
         for observer in module_observers:
             log.debug("Starting %s", observer)
+            self._start_times[observer] = time.monotonic()
 
             dbus.StartServiceByName(
                 observer.service_name,
@@ -163,4 +215,35 @@ class StartModulesTask(Task):
         """Handler for the service_available signal."""
         log.debug("%s is available.", observer)
         observer.proxy.Ping()
+
+        if observer in self._start_times:
+            self._startup_times[observer] = time.monotonic() - self._start_times[observer]
+
         return observer
+
+    def _report_modules(self, module_observers):
+        """Report the startup time and the memory usage of the modules."""
+        dbus = self._message_bus.proxy
+        total_rss = total_pss = 0
+
+        for observer in module_observers:
+            try:
+                pid = int(dbus.GetConnectionUnixProcessID(observer.service_name))
+            except Exception as e:  # pylint: disable=broad-except
+                log.debug("Failed to get the process of %s: %s", observer, e)
+                continue
+
+            rss, pss = get_memory_usage(pid)
+            total_rss += rss or 0
+            total_pss += pss or 0
+
+            log.debug(
+                "%s (%s) started in %s s, RSS %s KiB, PSS %s KiB.",
+                observer, pid,
+                "{:.3f}".format(self._startup_times[observer])
+                if observer in self._startup_times else "?",
+                rss if rss is not None else "?",
+                pss if pss is not None else "?"
+            )
+
+        log.debug("The modules use RSS %s KiB, PSS %s KiB.", total_rss, total_pss)
@@ -17,8 +17,10 @@
 #
 from pyanaconda.modules.common.task import Task
 from pyanaconda.modules.common.errors.payload import InstallError
+from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import INSTALL_TREE
 from pyanaconda.core.util import execWithRedirect
+from pyanaconda.modules.payloads.base.tree_copy import TreeCopier, IMAGE_EXCLUDE_PATTERNS
 from pyanaconda.modules.payloads.base.utils import create_rescue_image
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -53,16 +55,28 @@ class InstallFromImageTask(Task):
         if self._source is not None and not self._source.get_state():
             raise InstallError("Source is not set up!")
 
+        if conf.payload.native_image_copy:
+            self._copy_image()
+        else:
+            self._rsync_image()
+
+        create_rescue_image(self._dest_path, self._kernel_version_list)
+
+    def _rsync_image(self):
+        """Copy the image with rsync."""
         cmd = "rsync"
         # preserve: permissions, owners, groups, ACL's, xattrs, times,
         #           symlinks, hardlinks
         # go recursively, include devices and special files, don't cross
         # file system boundaries
         # TODO: source will provide us source path instead of using constant here
-        args = ["-pogAXtlHrDx", "--exclude", "/dev/", "--exclude", "/proc/", "--exclude", "/tmp/*",
-                "--exclude", "/sys/", "--exclude", "/run/", "--exclude", "/boot/*rescue*",
-                "--exclude", "/boot/loader/", "--exclude", "/boot/efi/loader/",
-                "--exclude", "/etc/machine-id", INSTALL_TREE + "/", self._dest_path]
+        args = ["-pogAXtlHrDx"]
+
+        for pattern in IMAGE_EXCLUDE_PATTERNS:
+            args.extend(["--exclude", pattern])
+
+        args.extend([INSTALL_TREE + "/", self._dest_path])
+
         try:
             rc = execWithRedirect(cmd, args)
         except (OSError, RuntimeError) as e:
@@ -77,4 +91,21 @@ class InstallFromImageTask(Task):
         if err or rc == 11:
             raise InstallError(err or msg)
 
-        create_rescue_image(self._dest_path, self._kernel_version_list)
+    def _copy_image(self):
+        """Copy the image with the native copy engine."""
+        copier = TreeCopier(INSTALL_TREE, self._dest_path, IMAGE_EXCLUDE_PATTERNS)
+        last_pct = -1
+
+        def report_progress(bytes_copied, total_size):
+            nonlocal last_pct
+            pct = int(100 * bytes_copied / total_size) if total_size else 100
+
+            if pct != last_pct:
+                last_pct = pct
+                self.report_progress("Installing software {}%".format(min(100, pct)))
+
+        try:
+            copier.copy(report_progress)
+        except OSError as e:
+            log.error("Failed to copy the image: %s", e)
+            raise InstallError("Failed to copy the image: {}".format(e)) from e
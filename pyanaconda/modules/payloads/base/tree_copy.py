@@ -0,0 +1,353 @@
+#
+# Copyright (C) 2020 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import errno
+import fcntl
+import os
+import re
+import stat
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from threading import Event, Lock
+
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+__all__ = ["TreeCopier", "IMAGE_EXCLUDE_PATTERNS"]
+
+# Files excluded from the installation of an image. The patterns follow
+# the rsync syntax: they are anchored at the root of the image, a trailing
+# slash matches only directories and a wildcard doesn't match slashes.
+IMAGE_EXCLUDE_PATTERNS = [
+    "/dev/", "/proc/", "/tmp/*", "/sys/", "/run/", "/boot/*rescue*",
+    "/boot/loader/", "/boot/efi/loader/", "/etc/machine-id"
+]
+
+# Number of files copied at the same time.
+TREE_COPY_WORKERS = 4
+
+# Interval of the progress reporting in seconds.
+PROGRESS_INTERVAL = 0.5
+
+# Size of the chunks copied with copy_file_range.
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+# The ioctl that clones a file on filesystems with reflinks.
+FICLONE = 0x40049409
+
+
+def _compile_pattern(pattern):
+    """Compile an rsync-like exclude pattern.
+
+    :param pattern: a pattern anchored at the root
+    :return: a tuple with a regular expression and a flag for directories
+    """
+    dirs_only = pattern.endswith("/")
+    expression = ""
+
+    for part in re.split(r"(\*\*|\*|\?)", pattern.rstrip("/")):
+        if part == "**":
+            expression += ".*"
+        elif part == "*":
+            expression += "[^/]*"
+        elif part == "?":
+            expression += "[^/]"
+        else:
+            expression += re.escape(part)
+
+    return re.compile(expression + r"\Z"), dirs_only
+
+
+class TreeCopier(object):
+    """Copy a directory tree to an empty destination.
+
+    The copier replaces rsync in the installation of images. The tree is
+    walked with os.scandir, regular files are copied in parallel with
+    reflinks or copy_file_range and the metadata are copied afterwards.
+    It preserves permissions, owners, groups, ACLs, xattrs, times,
+    symlinks, hardlinks, devices and special files and it doesn't cross
+    filesystem boundaries.
+    """
+
+    def __init__(self, source, dest, excludes=None, workers=TREE_COPY_WORKERS):
+        """Create a new copier.
+
+        :param source: a path to the source directory
+        :param dest: a path to the destination directory
+        :param excludes: a list of rsync-like exclude patterns
+        :param workers: number of files copied at the same time
+        """
+        self._source = source
+        self._dest = dest
+        self._excludes = [_compile_pattern(p) for p in (excludes or [])]
+        self._workers = max(1, workers)
+
+        self._files = []
+        self._links = []
+        self._dirs = []
+        self._total_size = 0
+
+        self._lock = Lock()
+        self._bytes_copied = 0
+        self._abort = Event()
+
+    @property
+    def total_size(self):
+        """Number of bytes of regular files to copy."""
+        return self._total_size
+
+    @property
+    def bytes_copied(self):
+        """Number of bytes copied so far."""
+        with self._lock:
+            return self._bytes_copied
+
+    def _add_bytes_copied(self, count):
+        with self._lock:
+            self._bytes_copied += count
+
+    def _is_excluded(self, path, is_dir):
+        """Is the path relative to the root excluded?"""
+        for expression, dirs_only in self._excludes:
+            if dirs_only and not is_dir:
+                continue
+
+            if expression.match(path):
+                return True
+
+        return False
+
+    def copy(self, callback=None):
+        """Copy the tree.
+
+        The callback is called periodically from the calling thread.
+
+        :param callback: a callback taking the copied and the total number of bytes
+        :raise: OSError if the copying fails
+        """
+        root_stat = os.lstat(self._source)
+        os.makedirs(self._dest, exist_ok=True)
+
+        self._files = []
+        self._links = []
+        self._dirs = [("", root_stat)]
+        self._total_size = 0
+        self._bytes_copied = 0
+        self._abort.clear()
+
+        log.info("Copying %s to %s", self._source, self._dest)
+        self._walk("", root_stat.st_dev)
+
+        log.info("Copying %d files of %d bytes with %d workers",
+                 len(self._files), self._total_size, self._workers)
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            futures = [executor.submit(self._copy_file, path, st) for path, st in self._files]
+
+            while futures:
+                done, not_done = wait(futures, PROGRESS_INTERVAL, FIRST_EXCEPTION)
+
+                if callback:
+                    callback(self.bytes_copied, self._total_size)
+
+                if not not_done or any(f.exception() for f in done):
+                    break
+
+            # Stop the remaining copies.
+            self._abort.set()
+
+        for future in futures:
+            future.result()
+
+        for path, target in self._links:
+            self._replace(path)
+            os.link(self._get_dest(target), self._get_dest(path))
+
+        # Set the metadata of directories after their content.
+        for path, st in reversed(self._dirs):
+            self._copy_metadata(path, st)
+
+        if callback:
+            callback(self.bytes_copied, self._total_size)
+
+    def _get_source(self, path):
+        return os.path.join(self._source, path)
+
+    def _get_dest(self, path):
+        return os.path.join(self._dest, path)
+
+    def _replace(self, path):
+        """Remove a non-directory entry from the destination."""
+        dest = self._get_dest(path)
+
+        if os.path.lexists(dest) and not os.path.isdir(dest):
+            os.unlink(dest)
+
+    def _walk(self, path, device):
+        """Create the directory tree and collect files to copy.
+
+        :param path: a path relative to the source
+        :param device: the device of the source filesystem
+        """
+        inodes = {}
+        stack = [path]
+
+        while stack:
+            current = stack.pop()
+
+            with os.scandir(self._get_source(current)) as entries:
+                for entry in entries:
+                    relative = os.path.join(current, entry.name)
+                    st = entry.stat(follow_symlinks=False)
+                    is_dir = stat.S_ISDIR(st.st_mode)
+
+                    if self._is_excluded("/" + relative, is_dir):
+                        continue
+
+                    if is_dir:
+                        dest = self._get_dest(relative)
+
+                        if os.path.lexists(dest) and not os.path.isdir(dest):
+                            os.unlink(dest)
+
+                        os.makedirs(dest, exist_ok=True)
+                        self._dirs.append((relative, st))
+
+                        # Don't cross filesystem boundaries.
+                        if st.st_dev == device:
+                            stack.append(relative)
+
+                        continue
+
+                    if st.st_nlink > 1:
+                        key = (st.st_dev, st.st_ino)
+
+                        if key in inodes:
+                            self._links.append((relative, inodes[key]))
+                            continue
+
+                        inodes[key] = relative
+
+                    if stat.S_ISREG(st.st_mode):
+                        self._files.append((relative, st))
+                        self._total_size += st.st_size
+                    else:
+                        self._copy_special(relative, st)
+
+    def _copy_special(self, path, st):
+        """Copy a symlink, a device or a special file."""
+        dest = self._get_dest(path)
+        self._replace(path)
+
+        if stat.S_ISLNK(st.st_mode):
+            os.symlink(os.readlink(self._get_source(path)), dest)
+        else:
+            os.mknod(dest, st.st_mode, st.st_rdev)
+
+        self._copy_metadata(path, st)
+
+    def _copy_file(self, path, st):
+        """Copy a regular file."""
+        if self._abort.is_set():
+            return
+
+        self._replace(path)
+
+        with open(self._get_source(path), "rb") as src, \
+                open(self._get_dest(path), "wb") as dst:
+            self._copy_data(src.fileno(), dst.fileno(), st.st_size)
+
+        self._copy_metadata(path, st)
+
+    def _copy_data(self, src, dst, size):
+        """Copy data between file descriptors.
+
+        Try to clone the file first, then to copy it in the kernel
+        and fall back to the copying in the user space.
+        """
+        try:
+            fcntl.ioctl(dst, FICLONE, src)
+            self._add_bytes_copied(size)
+            return
+        except OSError:
+            pass
+
+        offset = 0
+
+        try:
+            while offset < size and not self._abort.is_set():
+                count = os.copy_file_range(src, dst, min(COPY_CHUNK_SIZE, size - offset))
+
+                # The file is shorter than expected.
+                if not count:
+                    break
+
+                offset += count
+                self._add_bytes_copied(count)
+
+            return
+        except OSError as e:
+            if offset or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                                         errno.EOPNOTSUPP):
+                raise
+
+        with os.fdopen(src, "rb", closefd=False) as fsrc, \
+                os.fdopen(dst, "wb", closefd=False) as fdst:
+
+            while not self._abort.is_set():
+                buf = fsrc.read(COPY_CHUNK_SIZE)
+
+                if not buf:
+                    break
+
+                fdst.write(buf)
+                self._add_bytes_copied(len(buf))
+
+    def _copy_metadata(self, path, st):
+        """Copy owners, permissions, xattrs and times of the path."""
+        source = self._get_source(path)
+        dest = self._get_dest(path)
+        is_link = stat.S_ISLNK(st.st_mode)
+
+        os.chown(dest, st.st_uid, st.st_gid, follow_symlinks=False)
+
+        if not is_link:
+            os.chmod(dest, stat.S_IMODE(st.st_mode))
+
+        # ACLs and SELinux contexts are stored in xattrs.
+        self._copy_xattrs(source, dest)
+
+        os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns), follow_symlinks=False)
+
+    def _copy_xattrs(self, source, dest):
+        """Copy extended attributes of the path."""
+        try:
+            names = os.listxattr(source, follow_symlinks=False)
+        except OSError as e:
+            if e.errno in (errno.ENOTSUP, errno.ENODATA):
+                return
+            raise
+
+        for name in names:
+            try:
+                value = os.getxattr(source, name, follow_symlinks=False)
+                os.setxattr(dest, name, value, follow_symlinks=False)
+            except OSError as e:
+                if e.errno not in (errno.ENOTSUP, errno.ENODATA, errno.EPERM):
+                    raise
+
+                log.warning("Failed to copy the extended attribute %s of %s: %s",
+                            name, source, e)
@@ -0,0 +1,256 @@
+#
+# Copyright (C) 2020 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from threading import Event, Lock
+
+from requests.exceptions import RequestException, Timeout, ChunkedEncodingError, \
+    ConnectionError as RequestConnectionError
+
+from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT, IMAGE_DOWNLOAD_SEGMENTS, \
+    IMAGE_DOWNLOAD_RETRIES
+
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+__all__ = ["ImageDownloader"]
+
+# Size of the chunks written to the image file.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Images are split into segments of at least this size.
+MIN_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Interval of the progress reporting in seconds.
+PROGRESS_INTERVAL = 0.5
+
+# Errors after which the download can be resumed.
+TRANSIENT_ERRORS = (RequestConnectionError, Timeout, ChunkedEncodingError)
+
+
+class ImageDownloader(object):
+    """Download an image to a file.
+
+    If the server accepts range requests, the image is split into segments
+    that are downloaded concurrently. A segment interrupted by a transient
+    error is resumed from the last written byte. Other images are streamed
+    to the file in chunks and downloaded again from the start on errors.
+    """
+
+    # Delay between retries in seconds, multiplied by the number of failures.
+    retry_delay = 1
+
+    def __init__(self, session, url, path, proxies=None, verify=True,
+                 segments=IMAGE_DOWNLOAD_SEGMENTS, retries=IMAGE_DOWNLOAD_RETRIES):
+        """Create a new downloader.
+
+        :param session: Requests session for image download
+        :param url: url of the image
+        :param path: destination path of the image
+        :param proxies: a dictionary of proxies or None
+        :param verify: should we verify the SSL certificates?
+        :param segments: maximal number of concurrent segments
+        :param retries: maximal number of retries of a segment
+        """
+        self._session = session
+        self._url = url
+        self._path = path
+        self._proxies = proxies or {}
+        self._verify = verify
+        self._segments = max(1, segments)
+        self._retries = retries
+
+        self._size = None
+        self._accept_ranges = False
+        self._probed = False
+
+        self._lock = Lock()
+        self._bytes_read = 0
+        self._abort = Event()
+
+    @property
+    def size(self):
+        """Size of the image or None if it is not known."""
+        return self._size
+
+    @property
+    def accept_ranges(self):
+        """Does the server accept range requests?"""
+        return self._accept_ranges
+
+    @property
+    def bytes_read(self):
+        """Number of bytes downloaded so far."""
+        with self._lock:
+            return self._bytes_read
+
+    def _add_bytes_read(self, count):
+        with self._lock:
+            self._bytes_read += count
+
+    def _request(self, method, headers=None, **kwargs):
+        """Send a request for the image."""
+        headers = dict(headers or {})
+
+        # Ranges of encoded content can't be decoded separately.
+        headers["Accept-Encoding"] = "identity"
+
+        return self._session.request(
+            method,
+            self._url,
+            headers=headers,
+            proxies=self._proxies,
+            verify=self._verify,
+            timeout=NETWORK_CONNECTION_TIMEOUT,
+            **kwargs
+        )
+
+    def probe(self):
+        """Find out the size of the image and the support of ranges.
+
+        :return: size of the image or None if it is not known
+        """
+        self._probed = True
+        response = self._request("HEAD", allow_redirects=True)
+
+        if response.status_code != 200:
+            log.debug("Failed to probe %s: %s", self._url, response.status_code)
+            return None
+
+        length = response.headers.get("content-length")
+        ranges = response.headers.get("accept-ranges", "")
+
+        self._size = int(length) if length else None
+        self._accept_ranges = ranges.lower() == "bytes"
+
+        log.debug("Image %s has size %s and accepts ranges: %s",
+                  self._url, self._size, self._accept_ranges)
+        return self._size
+
+    def _get_segments(self):
+        """Split the image into segments.
+
+        :return: a list of tuples with the first and the last byte or None
+        """
+        if not self._accept_ranges or not self._size:
+            return [(0, None)]
+
+        count = min(self._segments, max(1, self._size // MIN_SEGMENT_SIZE))
+        step = -(-self._size // count)
+
+        return [(start, min(start + step, self._size) - 1)
+                for start in range(0, self._size, step)]
+
+    def download(self, callback=None):
+        """Download the image.
+
+        The callback is called periodically from the calling thread.
+
+        :param callback: a callback taking the number of bytes read so far
+        :return: number of downloaded bytes
+        :raise: RequestException if the download fails
+        """
+        if not self._probed:
+            self.probe()
+
+        segments = self._get_segments()
+        log.info("Downloading %s in %d segment(s)", self._url, len(segments))
+
+        with open(self._path, "wb") as f:
+            if len(segments) > 1:
+                f.truncate(self._size)
+
+        self._abort.clear()
+        self._bytes_read = 0
+
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            futures = [executor.submit(self._download_segment, start, end)
+                       for start, end in segments]
+
+            while True:
+                done, not_done = wait(futures, PROGRESS_INTERVAL, FIRST_EXCEPTION)
+
+                if callback:
+                    callback(self.bytes_read)
+
+                if not not_done or any(f.exception() for f in done):
+                    break
+
+            # Stop the remaining segments.
+            self._abort.set()
+
+        for future in futures:
+            future.result()
+
+        return self.bytes_read
+
+    def _download_segment(self, start, end):
+        """Download a segment of the image.
+
+        :param start: the first byte of the segment
+        :param end: the last byte of the segment or None
+        """
+        offset = start
+        failures = 0
+
+        with open(self._path, "r+b") as f:
+            while not self._abort.is_set():
+                headers = {}
+
+                if self._accept_ranges and (offset or end is not None):
+                    headers["Range"] = "bytes={}-{}".format(offset, "" if end is None else end)
+
+                try:
+                    response = self._request("GET", headers=headers, stream=True)
+                    response.raise_for_status()
+
+                    if headers and response.status_code != 206:
+                        raise RequestException("The server ignored the range request.")
+
+                    f.seek(offset)
+
+                    for buf in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        if self._abort.is_set():
+                            return
+
+                        if buf:
+                            f.write(buf)
+                            offset += len(buf)
+                            self._add_bytes_read(len(buf))
+
+                    if end is not None and offset <= end:
+                        raise RequestConnectionError("The segment ended at {}.".format(offset))
+
+                    return
+
+                except TRANSIENT_ERRORS as e:
+                    failures += 1
+
+                    if failures > self._retries:
+                        raise
+
+                    log.warning("Download of %s was interrupted at %d: %s",
+                                self._url, offset, e)
+
+                    if not self._accept_ranges:
+                        # Start again from the beginning.
+                        self._add_bytes_read(start - offset)
+                        offset = start
+                        f.truncate(start)
+
+                    time.sleep(self.retry_delay * failures)
@@ -18,14 +18,18 @@
 import glob
 import hashlib
 import os
+import time
 from requests.exceptions import RequestException
 
+from blivet.size import Size
+
 from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT, IMAGE_DIR
 from pyanaconda.core.util import lowerASCII, execWithRedirect
 from pyanaconda.modules.common.errors.payload import SourceSetupError
 from pyanaconda.modules.common.task import Task
+from pyanaconda.modules.payloads.payload.live_image.download import ImageDownloader
 from pyanaconda.modules.payloads.payload.live_image.utils import get_local_image_path_from_url, \
-    get_proxies_from_option, url_target_is_tarfile
+    get_proxies_from_option, url_target_is_tarfile, url_target_is_streamed
 from pyanaconda.payload.utils import mount, unmount
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -73,8 +77,10 @@ class CheckInstallationSourceImageTask(Task):
             # At this point we know we can get the image and what its size is
             # Make a guess as to minimum size needed:
             # Enough space for image and image * 3
+            # A streamed image isn't stored, so image * 3 is enough
             if response.headers.get('content-length'):
-                size = int(response.headers.get('content-length')) * 4
+                factor = 3 if url_target_is_streamed(url) else 4
+                size = int(response.headers.get('content-length')) * factor
         except IOError as e:
             raise SourceSetupError("Error opening liveimg: {}".format(e)) from e
         else:
@@ -144,35 +150,26 @@ class SetupInstallationSourceImageTask(Task):
 
     def _download_image(self, url, image_path, session):
         """Download the image using Requests with progress reporting"""
-        error = None
+        downloader = ImageDownloader(
+            session,
+            url,
+            image_path,
+            proxies=get_proxies_from_option(self._proxy),
+            verify=not self._noverifyssl
+        )
+
         try:
             log.info("Starting image download")
-            with open(image_path, "wb") as f:
-                ssl_verify = not self._noverifyssl
-                proxies = get_proxies_from_option(self._proxy)
-                response = session.get(url, proxies=proxies, verify=ssl_verify, stream=True,
-                                       timeout=NETWORK_CONNECTION_TIMEOUT)
-                total_length = response.headers.get('content-length')
-                if total_length is None:
-                    # just download the file in one go and fake the progress reporting once done
-                    log.warning("content-length header is missing for the installation image, "
-                                "download progress reporting will not be available")
-                    f.write(response.content)
-                    size = f.tell()
-                    progress = DownloadProgress(self._url, size, self.report_progress)
-                    progress.end()
-                else:
-                    # requests return headers as strings, so convert total_length to int
-                    progress = DownloadProgress(self._url, int(total_length), self.report_progress)
-                    bytes_read = 0
-                    for buf in response.iter_content(1024 * 1024):
-                        if buf:
-                            f.write(buf)
-                            f.flush()
-                            bytes_read += len(buf)
-                            progress.update(bytes_read)
-                    progress.end()
-                log.info("Image download finished")
+            size = downloader.probe()
+
+            if size is None:
+                log.warning("content-length header is missing for the installation image, "
+                            "download progress reporting will not show the percentage")
+
+            progress = DownloadProgress(url, size, self.report_progress)
+            downloader.download(progress.update)
+            progress.end()
+            log.info("Image download finished")
         except RequestException as e:
             error = "Error downloading liveimg: {}".format(e)
             log.error(error)
@@ -311,8 +308,8 @@ class DownloadProgress(object):
 
         :param url: url of the download
         :type url: str
-        :param size: length of the file
-        :type size: int
+        :param size: length of the file or None if it is not known
+        :type size: int or None
         :param report_callback: callback with progress message argument
         :type report_callback: callable taking str argument
         """
@@ -320,6 +317,16 @@ class DownloadProgress(object):
         self.url = url
         self.size = size
         self._pct = -1
+        self._start_time = time.monotonic()
+
+    def _get_throughput(self, bytes_read):
+        """Get the average throughput of the download."""
+        elapsed = time.monotonic() - self._start_time
+
+        if elapsed <= 0:
+            return Size(0)
+
+        return Size(int(bytes_read / elapsed))
 
     def update(self, bytes_read):
         """Download update.
@@ -329,13 +336,20 @@ class DownloadProgress(object):
         """
         if not bytes_read:
             return
+
+        if not self.size:
+            self.report("Downloading image %(url)s (%(size)s, %(speed)s/s)" %
+                        {"url": self.url, "size": Size(bytes_read),
+                         "speed": self._get_throughput(bytes_read)})
+            return
+
         pct = min(100, int(100 * bytes_read / self.size))
 
         if pct == self._pct:
             return
         self._pct = pct
-        self.report("Downloading image %(url)s (%(pct)d%%)" %
-                    {"url": self.url, "pct": pct})
+        self.report("Downloading image %(url)s (%(pct)d%%, %(speed)s/s)" %
+                    {"url": self.url, "pct": pct, "speed": self._get_throughput(bytes_read)})
 
     def end(self):
         """Download complete."""
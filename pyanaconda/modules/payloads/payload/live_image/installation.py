@@ -15,13 +15,95 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+import hashlib
+import subprocess
+import tempfile
+from requests.exceptions import RequestException
+
 from pyanaconda.modules.common.task import Task
 from pyanaconda.modules.common.errors.payload import InstallError
-from pyanaconda.core.util import execWithRedirect
+from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT
+from pyanaconda.core.util import execWithRedirect, startProgram, lowerASCII
 from pyanaconda.modules.payloads.base.utils import create_rescue_image
+from pyanaconda.modules.payloads.payload.live_image.initialization import DownloadProgress
+from pyanaconda.modules.payloads.payload.live_image.utils import get_proxies_from_option, \
+    get_tar_compression_option, get_kernel_version_list_from_names
 
-from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.anaconda_loggers import get_module_logger, get_program_logger
 log = get_module_logger(__name__)
+program_log = get_program_logger()
+
+# preserve: ACL's, xattrs, and SELinux context
+TAR_EXTRACT_ARGS = [
+    "--numeric-owner", "--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
+    "--exclude", "dev/*", "--exclude", "proc/*", "--exclude", "tmp/*",
+    "--exclude", "sys/*", "--exclude", "run/*", "--exclude", "boot/*rescue*",
+    "--exclude", "boot/loader", "--exclude", "boot/efi/loader",
+    "--exclude", "etc/machine-id"
+]
+
+# Size of the chunks read from a streamed image.
+IMAGE_CHUNK_SIZE = 1024 * 1024
+
+
+def install_from_tar_stream(chunks, dest_path, compression=None):
+    """Extract a tarball from a stream of data.
+
+    The data are written to the standard input of tar, so the tarball
+    doesn't have to be stored anywhere. Names of the extracted files are
+    collected from the index file of tar.
+
+    :param chunks: an iterable of bytes
+    :param dest_path: a path to the destination directory
+    :param compression: a tar option to decompress the data or None
+    :return: a list of kernel versions found in the tarball
+    :raise: InstallError if tar can't be started or stops reading the data
+    """
+    args = list(TAR_EXTRACT_ARGS)
+
+    if compression:
+        args.append(compression)
+
+    with tempfile.NamedTemporaryFile("w+", prefix="anaconda-tar-") as index, \
+            tempfile.TemporaryFile("w+") as output:
+
+        args += ["--verbose", "--index-file", index.name, "-xf", "-", "-C", dest_path]
+        try:
+            process = startProgram(["tar"] + args, stdin=subprocess.PIPE,
+                                   stdout=output, stderr=subprocess.STDOUT)
+        except (OSError, RuntimeError) as e:
+            log.error(str(e))
+            raise InstallError(str(e)) from e
+
+        broken_pipe = False
+
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+        except BrokenPipeError:
+            broken_pipe = True
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                broken_pipe = True
+
+            rc = process.wait()
+
+        output.seek(0)
+        for line in output:
+            program_log.info(line.rstrip("\n"))
+
+        log.info("tar exited with code %d", rc)
+
+        if broken_pipe:
+            raise InstallError("tar exited with code {} before reading "
+                               "the whole image".format(rc))
+
+        with open(index.name) as f:
+            names = [line.rstrip("\n") for line in f]
+
+    return get_kernel_version_list_from_names(names)
 
 
 class InstallFromTarTask(Task):
@@ -40,12 +122,7 @@ class InstallFromTarTask(Task):
     def run(self):
         """Run installation of the payload from a tarball."""
         cmd = "tar"
-        # preserve: ACL's, xattrs, and SELinux context
-        args = ["--numeric-owner", "--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
-                "--exclude", "dev/*", "--exclude", "proc/*", "--exclude", "tmp/*",
-                "--exclude", "sys/*", "--exclude", "run/*", "--exclude", "boot/*rescue*",
-                "--exclude", "boot/loader", "--exclude", "boot/efi/loader",
-                "--exclude", "etc/machine-id", "-xaf", self._tarfile_path, "-C", self._dest_path]
+        args = TAR_EXTRACT_ARGS + ["-xaf", self._tarfile_path, "-C", self._dest_path]
         try:
             rc = execWithRedirect(cmd, args)
         except (OSError, RuntimeError) as e:
@@ -61,3 +138,112 @@ class InstallFromTarTask(Task):
             raise InstallError(err or msg)
 
         create_rescue_image(self._dest_path, self._kernel_version_list)
+
+
+class DownloadAndInstallFromTarTask(Task):
+    """Task to install the payload from a remote tarball.
+
+    The tarball is downloaded, checked and extracted in one pass, so
+    it is read exactly once and it is never stored on the target disk.
+    """
+
+    def __init__(self, url, proxy, checksum, noverifyssl, dest_path, session):
+        """Create a new task.
+
+        :param url: installation source image url
+        :type url: str
+        :param proxy: proxy to be used to fetch the image
+        :type proxy: str
+        :param checksum: checksum of the image
+        :type checksum: str
+        :param noverifyssl: should we skip the verification of SSL?
+        :type noverifyssl: bool
+        :param dest_path: path to the installation root
+        :type dest_path: str
+        :param session: Requests session for image download
+        :type session:
+        """
+        super().__init__()
+        self._url = url
+        self._proxy = proxy
+        self._checksum = checksum
+        self._noverifyssl = noverifyssl
+        self._dest_path = dest_path
+        self._session = session
+
+    @property
+    def name(self):
+        return "Download and install the payload from a tarball"
+
+    def _read_image(self, response, sha256):
+        """Read the body of the response and update the checksum."""
+        total_length = response.headers.get('content-length')
+        progress = None
+
+        if total_length is None:
+            log.warning("content-length header is missing for the installation image, "
+                        "download progress reporting will not be available")
+        else:
+            # requests return headers as strings, so convert total_length to int
+            progress = DownloadProgress(self._url, int(total_length), self.report_progress)
+
+        bytes_read = 0
+        for buf in response.iter_content(IMAGE_CHUNK_SIZE):
+            if not buf:
+                continue
+
+            sha256.update(buf)
+            bytes_read += len(buf)
+
+            if progress:
+                progress.update(bytes_read)
+
+            yield buf
+
+        if progress:
+            progress.end()
+
+        log.info("Image download finished")
+
+    def run(self):
+        """Run installation of the payload from a remote tarball.
+
+        :return: a list of kernel versions
+        """
+        log.info("Starting image download")
+        sha256 = hashlib.sha256()
+
+        try:
+            response = self._session.get(
+                self._url,
+                proxies=get_proxies_from_option(self._proxy),
+                verify=not self._noverifyssl,
+                stream=True,
+                timeout=NETWORK_CONNECTION_TIMEOUT
+            )
+            response.raise_for_status()
+
+            kernel_version_list = install_from_tar_stream(
+                self._read_image(response, sha256),
+                self._dest_path,
+                get_tar_compression_option(self._url)
+            )
+        except RequestException as e:
+            error = "Error downloading liveimg: {}".format(e)
+            log.error(error)
+            raise InstallError(error) from e
+        except (OSError, RuntimeError) as e:
+            error = "Error extracting liveimg: {}".format(e)
+            log.error(error)
+            raise InstallError(error) from e
+
+        if self._checksum:
+            filesum = sha256.hexdigest()
+            log.debug("sha256 of %s is %s", self._url, filesum)
+
+            if lowerASCII(self._checksum) != filesum:
+                log.error("%s does not match checksum of %s.", self._checksum, self._url)
+                raise InstallError("Checksum of image {} does not match".format(self._url))
+
+        create_rescue_image(self._dest_path, kernel_version_list)
+        return kernel_version_list
@@ -36,9 +36,10 @@ from pyanaconda.modules.payloads.payload.live_image.live_image_interface import
 from pyanaconda.modules.payloads.payload.live_image.initialization import \
     CheckInstallationSourceImageTask, SetupInstallationSourceImageTask, \
     TeardownInstallationSourceImageTask
-from pyanaconda.modules.payloads.payload.live_image.installation import InstallFromTarTask
+from pyanaconda.modules.payloads.payload.live_image.installation import InstallFromTarTask, \
+    DownloadAndInstallFromTarTask
 from pyanaconda.modules.payloads.payload.live_image.utils import \
-    get_kernel_version_list_from_tar, url_target_is_tarfile
+    get_kernel_version_list_from_tar, url_target_is_tarfile, url_target_is_streamed
 
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
@@ -186,7 +187,10 @@ class LiveImageModule(PayloadBase):
 
     def update_kernel_version_list(self):
         """Update list of kernel versions."""
-        if url_target_is_tarfile(self._url):
+        if url_target_is_streamed(self._url):
+            # The list is collected during the installation.
+            kernel_version_list = self.kernel_version_list
+        elif url_target_is_tarfile(self._url):
             if not os.path.exists(self.image_path):
                 raise SourceSetupError("Failed to find tarfile image")
             kernel_version_list = get_kernel_version_list_from_tar(self.image_path)
@@ -222,7 +226,12 @@ class LiveImageModule(PayloadBase):
         * Download the image
         * Check the checksum
         * Mount the image
+
+        Remote tarballs are streamed during the installation.
         """
+        if url_target_is_streamed(self._url):
+            return []
+
         task = SetupInstallationSourceImageTask(
             self.url,
             self.proxy,
@@ -251,7 +260,19 @@ class LiveImageModule(PayloadBase):
 
     def install_with_tasks(self):
         """Install the payload."""
-        if url_target_is_tarfile(self._url):
+        if url_target_is_streamed(self._url):
+            task = DownloadAndInstallFromTarTask(
+                self.url,
+                self.proxy,
+                self.checksum,
+                not self.verifyssl,
+                conf.target.system_root,
+                self.requests_session
+            )
+            task.succeeded_signal.connect(
+                lambda: self.set_kernel_version_list(task.get_result())
+            )
+        elif url_target_is_tarfile(self._url):
             task = InstallFromTarTask(
                 self.image_path,
                 conf.target.system_root,
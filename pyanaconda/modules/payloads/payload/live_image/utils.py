@@ -30,11 +30,18 @@ def get_kernel_version_list_from_tar(tarfile_path):
     with tarfile.open(tarfile_path) as archive:
         names = archive.getnames()
 
-        # Strip out vmlinuz- from the names
-        kernel_version_list = sorted((n.split("/")[-1][8:] for n in names
-                                      if "boot/vmlinuz-" in n),
-                                     key=functools.cmp_to_key(version_cmp))
-    return kernel_version_list
+    return get_kernel_version_list_from_names(names)
+
+
+def get_kernel_version_list_from_names(names):
+    """Get a list of kernel versions from names of tarball members.
+
+    :param names: an iterable of file names
+    :return: a sorted list of kernel versions
+    """
+    # Strip out vmlinuz- from the names
+    return sorted((n.split("/")[-1][8:] for n in names if "boot/vmlinuz-" in n),
+                  key=functools.cmp_to_key(version_cmp))
 
 
 def get_local_image_path_from_url(url):
@@ -59,3 +66,33 @@ def get_proxies_from_option(proxy_option):
 def url_target_is_tarfile(url):
     """Does the url point to a tarfile?"""
     return any(url.endswith(suffix) for suffix in TAR_SUFFIX)
+
+
+def url_target_is_streamed(url):
+    """Should the image at the url be streamed instead of downloaded?
+
+    Remote tarballs are extracted while they are downloaded, so they
+    don't have to be stored on the target disk.
+    """
+    return url_target_is_tarfile(url) and not get_local_image_path_from_url(url)
+
+
+def get_tar_compression_option(url):
+    """Get the tar option to decompress the tarball at the url.
+
+    Tar can't guess the compression from the name of a stream,
+    so it has to be told explicitly.
+
+    :param url: an url of the tarball
+    :return: a tar option or None for an uncompressed tarball
+    """
+    if url.endswith((".tgz", "tar.gz")):
+        return "--gzip"
+
+    if url.endswith((".tbz", ".tar.bz2")):
+        return "--bzip2"
+
+    if url.endswith((".txz", "tar.xz")):
+        return "--xz"
+
+    return None
@@ -21,7 +21,8 @@ from pyanaconda.modules.common.constants.services import STORAGE
 from pyanaconda.modules.common.errors.payload import SourceSetupError
 from pyanaconda.modules.common.structures.storage import DeviceData
 from pyanaconda.modules.payloads.source.mount_tasks import SetUpMountTask
-from pyanaconda.modules.payloads.source.utils import is_valid_install_disk
+from pyanaconda.modules.payloads.source.utils import is_valid_install_disk, \
+    is_valid_install_image
 from pyanaconda.payload.source.factory import SourceFactory, PayloadSourceTypeUnrecognized
 from pyanaconda.payload.utils import mount, unmount, PayloadSetupError
 
@@ -95,8 +96,14 @@ class SetUpCdromSourceTask(SetUpMountTask):
         device_name = ""
 
         for dev_name in devices_candidates:
+            device_data = DeviceData.from_structure(device_tree.GetDeviceData(dev_name))
+
+            # Skip invalid disks without mounting them.
+            if is_valid_install_image(device_data.path) is False:
+                log.debug("Device %s is not a valid installation disk", dev_name)
+                continue
+
             try:
-                device_data = DeviceData.from_structure(device_tree.GetDeviceData(dev_name))
                 mount(device_data.path, self._target_mount, "iso9660", "ro")
             except PayloadSetupError as e:
                 log.debug("Failed to mount %s: %s", dev_name, str(e))
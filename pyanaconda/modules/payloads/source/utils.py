@@ -21,6 +21,7 @@ from blivet.arch import get_arch
 from blivet.util import mount
 
 from pyanaconda.core.constants import SOURCES_DIR
+from pyanaconda.core.iso9660 import ISO9660Image, ISO9660Error
 from pyanaconda.core.storage import device_matches
 from pyanaconda.core.util import join_paths
 from pyanaconda.payload.image import find_first_iso_image
@@ -65,6 +66,34 @@ def is_valid_install_disk(tree_dir):
     return False
 
 
+def is_valid_install_image(image_path):
+    """Is the image a valid installation disk?
+
+    The .discinfo file is read straight from the ISO9660 image, so the
+    image doesn't have to be mounted. The success criteria are the same
+    as in is_valid_install_disk.
+
+    :param str image_path: a path to an ISO image or an optical device
+    :return: True or False, None if the image can't be checked without mounting
+    :rtype: bool or None
+    """
+    try:
+        with ISO9660Image(image_path) as image:
+            if not image.has_long_names:
+                return None
+
+            data = image.read_file(".discinfo")
+    except (OSError, ISO9660Error) as e:
+        log.debug("Failed to read %s: %s", image_path, e)
+        return None
+
+    if data is None:
+        return False
+
+    lines = data.decode("utf-8", "replace").splitlines()
+    return len(lines) > 2 and lines[2].strip() == get_arch()
+
+
 def find_and_mount_device(device_spec, mount_point):
     """Resolve what device to mount and do so, read-only.
 
@@ -16,7 +16,9 @@
 # Red Hat, Inc.
 #
 import os
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
+from io import StringIO
 
 from pyanaconda.core.kernel import kernel_arguments
 from pyanaconda.modules.common.errors.installation import BootloaderInstallationError
@@ -26,12 +28,16 @@ from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.util import decode_bytes, execWithRedirect
 from pyanaconda.product import productName
 
-from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.anaconda_loggers import get_module_logger, get_program_logger
 log = get_module_logger(__name__)
+program_log = get_program_logger()
 
 __all__ = ["configure_boot_loader", "install_boot_loader", "recreate_initrds",
            "create_rescue_images"]
 
+# Memory required by one generation of an initramfs in kB.
+INITRAMFS_JOB_MEMORY = 1024 * 1024
+
 
 def create_rescue_images(sysroot, kernel_versions):
     """Create the rescue initrd images for each installed kernel."""
@@ -269,6 +275,9 @@ def recreate_initrds(sysroot, kernel_versions):
     This needs to be done after all configuration files have been
     written, since dracut depends on some of them.
 
+    Initrds generated by dracut are recreated concurrently. The
+    output of every kernel is logged at once when it is done.
+
     :param sysroot: a path to the root of the installed system
     :param kernel_versions: a list of kernel versions
     """
@@ -278,47 +287,142 @@ def recreate_initrds(sysroot, kernel_versions):
         log.debug("new-kernel-pkg does not exist, using dracut instead")
         use_dracut = True
 
-    for kernel in kernel_versions:
+    if conf.target.is_image or use_dracut:
+        jobs = _get_initramfs_jobs(len(kernel_versions))
+    else:
+        # The new-kernel-pkg tool updates the boot loader configuration.
+        jobs = 1
+
+    def recreate_initrd(kernel):
         log.info("Recreating initrd for %s", kernel)
+        return _run_kernel_commands(sysroot, _get_initrd_commands(kernel, use_dracut))
 
-        if conf.target.is_image:
-            # Dracut runs in the host-only mode by default, so we need to
-            # turn it off by passing the -N option, because the mode is not
-            # sensible for disk image installations. Using /dev/disk/by-uuid/
-            # is necessary due to disk image naming.
-            execWithRedirect(
-                "dracut", [
-                    "-N", "--persistent-policy", "by-uuid",
-                    "-f", "/boot/initramfs-%s.img" % kernel, kernel
-                ],
-                root=sysroot
-            )
-        else:
-            if use_dracut:
-                execWithRedirect(
-                    "depmod", ["-a", kernel], root=sysroot
-                )
-                execWithRedirect(
-                    "dracut",
-                    ["-f", "/boot/initramfs-%s.img" % kernel, kernel],
-                    root=sysroot
-                )
-            else:
-                execWithRedirect(
-                    "new-kernel-pkg",
-                    ["--mkinitrd", "--dracut", "--depmod", "--update", kernel],
-                    root=sysroot
-                )
+    _run_for_kernels(recreate_initrd, kernel_versions, jobs)
 
-            # if the installation is running in fips mode then make sure
-            # fips is also correctly enabled in the installed system
-            if kernel_arguments.get("fips") == "1":
-                # We use the --no-bootcfg option as we don't want fips-mode-setup
-                # to modify the bootloader configuration. Anaconda already does
-                # everything needed & it would require grubby to be available on
-                # the system.
-                execWithRedirect(
-                    "fips-mode-setup",
-                    ["--enable", "--no-bootcfg"],
-                    root=sysroot
-                )
+    # if the installation is running in fips mode then make sure
+    # fips is also correctly enabled in the installed system
+    if kernel_versions and not conf.target.is_image and kernel_arguments.get("fips") == "1":
+        # We use the --no-bootcfg option as we don't want fips-mode-setup
+        # to modify the bootloader configuration. Anaconda already does
+        # everything needed & it would require grubby to be available on
+        # the system.
+        execWithRedirect(
+            "fips-mode-setup",
+            ["--enable", "--no-bootcfg"],
+            root=sysroot
+        )
+
+
+def _get_initrd_commands(kernel, use_dracut):
+    """Get commands that recreate the initrd of the given kernel.
+
+    :param kernel: a kernel version
+    :param use_dracut: should we call dracut instead of new-kernel-pkg?
+    :return: a list of commands and their arguments
+    """
+    if conf.target.is_image:
+        # Dracut runs in the host-only mode by default, so we need to
+        # turn it off by passing the -N option, because the mode is not
+        # sensible for disk image installations. Using /dev/disk/by-uuid/
+        # is necessary due to disk image naming.
+        return [(
+            "dracut", [
+                "-N", "--persistent-policy", "by-uuid",
+                "-f", "/boot/initramfs-%s.img" % kernel, kernel
+            ]
+        )]
+
+    if use_dracut:
+        return [
+            ("depmod", ["-a", kernel]),
+            ("dracut", ["-f", "/boot/initramfs-%s.img" % kernel, kernel]),
+        ]
+
+    return [(
+        "new-kernel-pkg",
+        ["--mkinitrd", "--dracut", "--depmod", "--update", kernel]
+    )]
+
+
+def _get_initramfs_jobs(count):
+    """Get a number of initramfs images that can be generated at once.
+
+    The number is specified by the configuration. Otherwise, it is
+    derived from the number of CPUs and the available memory.
+
+    :param count: a number of initramfs images to generate
+    :return: a number of jobs
+    """
+    jobs = conf.bootloader.initramfs_jobs
+
+    if jobs <= 0:
+        memory_jobs = _get_available_memory() // INITRAMFS_JOB_MEMORY
+        jobs = min(os.cpu_count() or 1, memory_jobs)
+
+    return max(1, min(jobs, count))
+
+
+def _get_available_memory():
+    """Get the available memory in kB.
+
+    :return: a number of kB or 0 if unknown
+    """
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError) as e:
+        log.debug("Unable to get the available memory: %s", e)
+
+    return 0
+
+
+def _run_kernel_commands(sysroot, commands):
+    """Run the commands for one kernel and collect their output.
+
+    :param sysroot: a path to the root of the installed system
+    :param commands: a list of commands and their arguments
+    :return: a tuple of the last non-zero return code or 0 and the output
+    """
+    output = StringIO()
+    status = 0
+
+    for command, args in commands:
+        ret = execWithRedirect(command, args, stdout=output, log_output=False, root=sysroot)
+        status = ret or status
+
+    return status, output.getvalue()
+
+
+def _run_for_kernels(function, kernel_versions, jobs):
+    """Run the function for every kernel.
+
+    The function should return a return code and the output.
+    The output of every kernel is logged at once, in the order
+    of the kernels.
+
+    :param function: a function that accepts a kernel version
+    :param kernel_versions: a list of kernel versions
+    :param jobs: a maximal number of concurrent calls
+    :return: a dictionary of kernel versions and return codes
+    """
+    results = {}
+
+    if not kernel_versions:
+        return results
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="AnaInitrdThread") as executor:
+        futures = [(kernel, executor.submit(function, kernel)) for kernel in kernel_versions]
+
+        for kernel, future in futures:
+            status, output = future.result()
+            results[kernel] = status
+
+            for line in output.splitlines():
+                program_log.info("%s: %s", kernel, line)
+
+            if status:
+                log.warning("Commands for %s failed with the return code %s.", kernel, status)
+
+    return results
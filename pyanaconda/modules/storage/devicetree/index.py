@@ -0,0 +1,240 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+from collections import defaultdict
+
+from blivet.devices import LVMLogicalVolumeDevice, LVMVolumeGroupDevice
+from blivet.errors import DuplicateUUIDError
+
+from pyanaconda.anaconda_loggers import get_module_logger
+
+log = get_module_logger(__name__)
+
+__all__ = ["DeviceTreeIndex"]
+
+# Blivet accepts the escaped names and paths of LVM devices.
+LVM_DEVICE_CLASSES = (LVMLogicalVolumeDevice, LVMVolumeGroupDevice)
+
+
+class DeviceTreeIndex(object):
+    """Index of devices in a device tree.
+
+    The index maps names, paths and UUIDs to devices, so the devices
+    can be found without searching the whole device tree. The lookups
+    return the same devices as the lookup methods of the device tree.
+
+    The index is rebuilt when the lists of devices of the device tree
+    change. Other changes, like renamed devices, are detected when
+    a found device no longer matches the key or when the key is not
+    found.
+    """
+
+    def __init__(self, devicetree):
+        """Create a new index.
+
+        :param devicetree: an instance of the Blivet's device tree
+        """
+        self._devicetree = devicetree
+        self._state = None
+        self._devices = set()
+        self._hidden = set()
+        self._names = {}
+        self._paths = {}
+        self._uuids = {}
+
+    @property
+    def devicetree(self):
+        """The indexed device tree."""
+        return self._devicetree
+
+    def _get_state(self):
+        """Get the current state of the device tree."""
+        # pylint: disable=protected-access
+        devices = self._devicetree._devices
+        hidden = self._devicetree._hidden
+        return (
+            id(devices), len(devices), id(devices[-1]) if devices else None,
+            id(hidden), len(hidden), id(hidden[-1]) if hidden else None
+        )
+
+    def _update(self, force=False):
+        """Rebuild the index if the device tree has changed.
+
+        :param force: rebuild the index in any case
+        :return: True if the index was rebuilt, otherwise False
+        """
+        state = self._get_state()
+
+        if not force and state == self._state:
+            return False
+
+        # pylint: disable=protected-access
+        devices = self._devicetree._devices[:]
+        hidden = self._devicetree._hidden[:]
+
+        names = defaultdict(list)
+        paths = defaultdict(list)
+        uuids = defaultdict(list)
+
+        for device in devices + hidden:
+            names[device.name].append(device)
+            paths[device.path].append(device)
+
+            for uuid in {device.uuid, device.format.uuid}:
+                if uuid:
+                    uuids[uuid].append(device)
+
+        self._devices = set(map(id, devices))
+        self._hidden = set(map(id, hidden))
+        self._names = dict(names)
+        self._paths = dict(paths)
+        self._uuids = dict(uuids)
+        self._state = state
+        return True
+
+    def _filter(self, devices, incomplete, hidden):
+        """Filter the given devices like the device tree does."""
+        if not hidden:
+            devices = (d for d in devices if id(d) in self._devices)
+
+        if not incomplete:
+            devices = (d for d in devices if getattr(d, "complete", True))
+
+        return list(devices)
+
+    def _lookup(self, find, is_valid):
+        """Find devices with the index.
+
+        The index is rebuilt and the search is repeated if nothing
+        is found or if the found devices are no longer valid.
+
+        :param find: a function that returns a list of devices
+        :param is_valid: a function that checks a found device
+        :return: a list of devices
+        """
+        rebuilt = self._update()
+        devices = find()
+
+        if not rebuilt and (not devices or not all(map(is_valid, devices))):
+            self._update(force=True)
+            devices = find()
+
+        return devices
+
+    def get_device_by_name(self, name, incomplete=False, hidden=False):
+        """Return a device with a matching name.
+
+        :param name: the name to look for
+        :param incomplete: include incomplete devices in search
+        :param hidden: include hidden devices in search
+        :return: the first matching device found or None
+        """
+        if not name:
+            return None
+
+        lvm_name = name.replace("--", "-")
+
+        def is_valid(device):
+            return device.name == name \
+                or (isinstance(device, LVM_DEVICE_CLASSES) and device.name == lvm_name)
+
+        def find():
+            devices = self._names.get(name, [])[:]
+
+            if lvm_name != name:
+                devices += [
+                    d for d in self._names.get(lvm_name, [])
+                    if isinstance(d, LVM_DEVICE_CLASSES)
+                ]
+
+            return self._filter(devices, incomplete, hidden)
+
+        devices = self._lookup(find, is_valid)
+        return devices[0] if devices else None
+
+    def get_device_by_path(self, path, incomplete=False, hidden=False):
+        """Return a device with a matching path.
+
+        If there is more than one device with a matching path,
+        prefer a leaf device to a non-leaf device.
+
+        :param path: the path to match
+        :param incomplete: include incomplete devices in search
+        :param hidden: include hidden devices in search
+        :return: the last matching device found or None
+        """
+        if not path:
+            return None
+
+        lvm_path = path.replace("--", "-")
+
+        def is_valid(device):
+            return device.path == path \
+                or (isinstance(device, LVM_DEVICE_CLASSES) and device.path == lvm_path)
+
+        def find():
+            devices = self._paths.get(path, [])[:]
+
+            if lvm_path != path:
+                devices += [
+                    d for d in self._paths.get(lvm_path, [])
+                    if isinstance(d, LVM_DEVICE_CLASSES)
+                ]
+
+            return self._filter(devices, incomplete, hidden)
+
+        devices = self._lookup(find, is_valid)
+        return devices[-1] if devices else None
+
+    def get_device_by_uuid(self, uuid, incomplete=False, hidden=False):
+        """Return a device with a matching UUID.
+
+        :param uuid: the UUID to match
+        :param incomplete: include incomplete devices in search
+        :param hidden: include hidden devices in search
+        :return: the matching device or None
+        :raise: DuplicateUUIDError if more devices match
+        """
+        if not uuid:
+            return None
+
+        def is_valid(device):
+            return uuid in (device.uuid, device.format.uuid)
+
+        def find():
+            return self._filter(self._uuids.get(uuid, []), incomplete, hidden)
+
+        devices = self._lookup(find, is_valid)
+
+        if len(devices) > 1:
+            names = [d.name for d in devices]
+            log.error("found non-unique UUID %s: %s", uuid, names)
+            raise DuplicateUUIDError("Duplicate UUID '%s' found for devices: %s" % (uuid, names))
+
+        return devices[0] if devices else None
+
+    def contains(self, device, incomplete=False, hidden=False):
+        """Is the device in the device tree?
+
+        :param device: an instance of the Blivet's device
+        :param incomplete: include incomplete devices in search
+        :param hidden: include hidden devices in search
+        :return: True or False
+        """
+        self._update()
+        return bool(self._filter([device], incomplete, hidden)) \
+            and (id(device) in self._devices or id(device) in self._hidden)
@@ -31,9 +31,11 @@ from pyanaconda.modules.storage.bootloader import BootLoaderFactory
 from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import shortProductName
 from pyanaconda.modules.storage.devicetree.fsset import FSSet
+from pyanaconda.modules.storage.devicetree.index import DeviceTreeIndex
 from pyanaconda.modules.storage.devicetree.utils import download_escrow_certificate, \
     find_live_backing_device
-from pyanaconda.modules.storage.devicetree.root import find_existing_installations
+from pyanaconda.modules.storage.devicetree.root import find_existing_installations, \
+    reset_installations_cache
 from pyanaconda.modules.common.constants.services import NETWORK
 
 import logging
@@ -60,6 +62,7 @@ class InstallerStorage(Blivet):
         self._bootloader = None
         self.__luks_devs = {}
         self.fsset = FSSet(self.devicetree)
+        self._device_index = None
         self._short_product_name = shortProductName
         self._default_luks_version = DEFAULT_LUKS_VERSION
 
@@ -69,6 +72,30 @@ class InstallerStorage(Blivet):
         # Set the default LUKS version.
         self.set_default_luks_version(conf.storage.luks_version or self.default_luks_version)
 
+    @property
+    def device_index(self):
+        """The index of devices in the device tree.
+
+        Use the index to find devices by names, paths or UUIDs.
+
+        :return: an instance of DeviceTreeIndex
+        """
+        if not self._device_index or self._device_index.devicetree is not self.devicetree:
+            self._device_index = DeviceTreeIndex(self.devicetree)
+
+        return self._device_index
+
+    def copy(self):
+        """Create a copy of the storage.
+
+        The copy creates its own index of devices.
+
+        :return: an instance of InstallerStorage
+        """
+        new = super().copy()
+        new._device_index = None
+        return new
+
     @property
     def bootloader(self):
         if self._bootloader is None:
@@ -259,6 +286,9 @@ class InstallerStorage(Blivet):
 
         super().reset(cleanup_only=cleanup_only)
 
+        # Drop the index of the old device tree.
+        self._device_index = None
+
         # Protect devices from teardown.
         self._mark_protected_devices()
         self.devicetree.teardown_all()
@@ -268,6 +298,9 @@ class InstallerStorage(Blivet):
         # Clear out attributes that refer to devices that are no longer in the tree.
         self.bootloader.reset()
 
+        # Forget the probed devices that are no longer in the tree.
+        reset_installations_cache(self.devicetree)
+
         self.roots = []
         self.roots = find_existing_installations(self.devicetree)
         self.dump_state("initial")
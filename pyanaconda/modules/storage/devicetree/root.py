@@ -17,6 +17,11 @@
 #
 import os
 import shlex
+import shutil
+import struct
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from blivet import util as blivet_util
 from blivet.errors import StorageError
@@ -30,7 +35,36 @@ from pyanaconda.modules.storage.devicetree.fsset import BlkidTab, CryptTab
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
 
-__all__ = ["mount_existing_system", "find_existing_installations", "Root"]
+__all__ = ["mount_existing_system", "find_existing_installations",
+           "reset_installations_cache", "Root"]
+
+# Maximal number of devices probed at once.
+FIND_INSTALLATIONS_WORKERS = 4
+
+# Files of an installation that are needed to find its mount points.
+INSTALLATION_FILES = ["etc/fstab", "etc/crypttab", "etc/blkid/blkid.tab"]
+
+# Binaries used to detect the architecture of an installation.
+ARCHITECTURE_FILES = ["usr/bin/bash", "bin/bash", "usr/bin/sh", "bin/sh"]
+
+# ELF machine types and names of architectures.
+ELF_MACHINES = {
+    3: "i686",
+    8: "mips",
+    20: "ppc",
+    21: "ppc64",
+    22: "s390x",
+    40: "armv7l",
+    62: "x86_64",
+    183: "aarch64",
+    243: "riscv64",
+}
+
+InstallationData = namedtuple("InstallationData", ["arch", "product", "version", "files"])
+InstallationData.__doc__ = "Data of an existing installation read from its root device."
+
+# Data of probed root devices: (uuid, last mount time) -> InstallationData or None
+_installations_cache = {}
 
 
 def mount_existing_system(storage, root_device, read_only=None):
@@ -69,6 +103,22 @@ def mount_existing_system(storage, root_device, read_only=None):
         storage.make_mtab(chroot=root_path)
 
 
+def reset_installations_cache(devicetree=None):
+    """Reset the cache of probed root devices.
+
+    :param devicetree: keep the data of devices from this device tree or None
+    """
+    if devicetree is None:
+        _installations_cache.clear()
+        return
+
+    uuids = {dev.format.uuid for dev in devicetree.devices if dev.format.uuid}
+
+    for key in list(_installations_cache):
+        if key[0] not in uuids:
+            del _installations_cache[key]
+
+
 def find_existing_installations(devicetree, teardown_all=True):
     """Find existing GNU/Linux installations on devices from the device tree.
 
@@ -91,56 +141,177 @@ def find_existing_installations(devicetree, teardown_all=True):
 def _find_existing_installations(devicetree):
     """Find existing GNU/Linux installations on devices from the device tree.
 
+    The devices are probed concurrently. Every device is mounted
+    at its own temporary mount point.
+
     :param devicetree: a device tree to find existing installations in
     :return: roots of all found installations
     """
-    if not os.path.exists(conf.target.physical_root):
-        blivet_util.makedirs(conf.target.physical_root)
+    devices = [
+        dev for dev in devicetree.devices
+        if dev.direct and dev.format.linux_native and dev.format.mountable
+        and dev.controllable and dev.format.exists
+    ]
+
+    if not devices:
+        return []
+
+    workers = min(len(devices), FIND_INSTALLATIONS_WORKERS)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AnaProbeThread") as executor:
+        results = list(executor.map(_probe_device, devices))
 
-    sysroot = conf.target.physical_root
     roots = []
-    direct_devices = (dev for dev in devicetree.devices if dev.direct)
-    for device in direct_devices:
-        if not device.format.linux_native or not device.format.mountable or \
-           not device.controllable or not device.format.exists:
+
+    for data in results:
+        if not data:
             continue
 
-        try:
-            device.setup()
-        except Exception:  # pylint: disable=broad-except
-            log_exception_info(log.warning, "setup of %s failed", [device.name])
+        root = _create_root(devicetree, data)
+
+        if not root:
+            # empty /etc/fstab. weird, but I've seen it happen.
             continue
 
+        roots.append(root)
+
+    return roots
+
+
+def _probe_device(device):
+    """Read data of an existing installation from the given device.
+
+    :param device: a device to probe
+    :return: an instance of InstallationData or None
+    """
+    key = _get_cache_key(device)
+
+    if key and key in _installations_cache:
+        log.debug("Using cached data of %s.", device.name)
+        return _installations_cache[key]
+
+    try:
+        device.setup()
+    except Exception:  # pylint: disable=broad-except
+        log_exception_info(log.warning, "setup of %s failed", [device.name])
+        return None
+
+    mountpoint = tempfile.mkdtemp(prefix="anaconda-probe-")
+
+    try:
         options = device.format.options + ",ro"
         try:
-            device.format.mount(options=options, mountpoint=sysroot)
+            device.format.mount(options=options, mountpoint=mountpoint)
         except Exception:  # pylint: disable=broad-except
-            log_exception_info(log.warning, "mount of %s as %s failed", [device.name, device.format.type])
-            blivet_util.umount(mountpoint=sysroot)
-            continue
+            log_exception_info(log.warning, "mount of %s as %s failed",
+                               [device.name, device.format.type])
+            blivet_util.umount(mountpoint=mountpoint)
+            return None
 
-        if not os.access(sysroot + "/etc/fstab", os.R_OK):
-            blivet_util.umount(mountpoint=sysroot)
+        try:
+            data = _read_installation(mountpoint)
+        finally:
+            blivet_util.umount(mountpoint=mountpoint)
+
+        if not data:
             device.teardown()
-            continue
 
-        architecture, product, version = get_release_string(chroot=sysroot)
-        (mounts, swaps) = _parse_fstab(devicetree, chroot=sysroot)
-        blivet_util.umount(mountpoint=sysroot)
+    finally:
+        try:
+            os.rmdir(mountpoint)
+        except OSError as e:
+            log.warning("Unable to remove the mount point %s: %s", mountpoint, e)
 
-        if not mounts and not swaps:
-            # empty /etc/fstab. weird, but I've seen it happen.
+    if key:
+        _installations_cache[key] = data
+
+    return data
+
+
+def _get_cache_key(device):
+    """Get a key of the device in the cache of probed devices.
+
+    Only ext filesystems that are accessible without a setup
+    are cached, because they record the last mount time.
+
+    :param device: a device
+    :return: a tuple of the UUID and the last mount time or None
+    """
+    if device.format.type not in ("ext2", "ext3", "ext4") or not device.format.uuid:
+        return None
+
+    try:
+        with open(device.path, "rb") as f:
+            # Read the superblock of the filesystem.
+            f.seek(1024)
+            superblock = f.read(64)
+
+        (mount_time, ) = struct.unpack_from("<I", superblock, 44)
+        (magic, ) = struct.unpack_from("<H", superblock, 56)
+    except (OSError, struct.error):
+        return None
+
+    if magic != 0xEF53:
+        return None
+
+    return device.format.uuid, mount_time
+
+
+def _read_installation(sysroot):
+    """Read data of an existing installation.
+
+    :param sysroot: a path to the mounted root of the installation
+    :return: an instance of InstallationData or None
+    """
+    if not os.access(sysroot + "/etc/fstab", os.R_OK):
+        return None
+
+    architecture, product, version = get_release_string(chroot=sysroot)
+    files = {}
+
+    for name in INSTALLATION_FILES:
+        path = os.path.join(sysroot, name)
+
+        if not os.access(path, os.R_OK):
             continue
 
-        roots.append(Root(
-            product=product,
-            version=version,
-            arch=architecture,
-            mounts=mounts,
-            swaps=swaps
-        ))
+        with open(path, "rb") as f:
+            files[name] = f.read()
 
-    return roots
+    return InstallationData(architecture, product, version, files)
+
+
+def _create_root(devicetree, data):
+    """Create a root of an existing installation.
+
+    :param devicetree: a device tree
+    :param data: an instance of InstallationData
+    :return: an instance of Root or None
+    """
+    chroot = tempfile.mkdtemp(prefix="anaconda-root-")
+
+    try:
+        for name, content in data.files.items():
+            path = os.path.join(chroot, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            with open(path, "wb") as f:
+                f.write(content)
+
+        (mounts, swaps) = _parse_fstab(devicetree, chroot=chroot)
+    finally:
+        shutil.rmtree(chroot)
+
+    if not mounts and not swaps:
+        return None
+
+    return Root(
+        product=data.product,
+        version=data.version,
+        arch=data.arch,
+        mounts=mounts,
+        swaps=swaps
+    )
 
 
 def get_release_string(chroot):
@@ -158,10 +329,7 @@ def get_release_string(chroot):
     rel_ver = None
     sysroot = chroot
 
-    try:
-        rel_arch = blivet_util.capture_output(["arch"], root=sysroot).strip()
-    except OSError:
-        rel_arch = None
+    rel_arch = _get_architecture(sysroot)
 
     try:
         filename = "%s/etc/redhat-release" % sysroot
@@ -177,6 +345,52 @@ def get_release_string(chroot):
     return rel_arch, rel_name, rel_ver
 
 
+def _get_architecture(sysroot):
+    """Get the architecture of an installation.
+
+    The architecture is read from the ELF header of a shell.
+
+    :param sysroot: a path to the root of the installation
+    :return: a name of the architecture or None
+    """
+    root = os.path.join(os.path.realpath(sysroot), "")
+
+    for name in ARCHITECTURE_FILES:
+        path = os.path.join(sysroot, name)
+
+        # Don't follow links outside of the installation.
+        if not os.path.realpath(path).startswith(root):
+            continue
+
+        try:
+            with open(path, "rb") as f:
+                header = f.read(20)
+        except OSError:
+            continue
+
+        if len(header) < 20 or header[:4] != b"\x7fELF":
+            continue
+
+        # Get the class, the byte order and the machine.
+        is_64bit = header[4] == 2
+        byte_order = "<" if header[5] == 1 else ">"
+        (machine, ) = struct.unpack_from(byte_order + "H", header, 18)
+        arch = ELF_MACHINES.get(machine)
+
+        if arch == "ppc64" and byte_order == "<":
+            return "ppc64le"
+
+        if arch == "s390x" and not is_64bit:
+            return "s390"
+
+        if arch == "riscv64" and not is_64bit:
+            return "riscv32"
+
+        return arch
+
+    return None
+
+
 def _release_from_redhat_release(fn):
     """Identify the installation of a Linux distribution via /etc/redhat-release.
 
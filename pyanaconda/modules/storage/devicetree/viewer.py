@@ -89,9 +89,23 @@ class DeviceTreeViewer(ABC):
         :return: an instance of DeviceData
         :raise: UnknownDeviceError if the device is not found
         """
-        # Find the device.
-        device = self._get_device(name)
+        return self._get_device_data(self._get_device(name))
+
+    def get_devices_data(self, names):
+        """Get data of the specified devices.
+
+        :param names: a list of device names
+        :return: a list of instances of DeviceData
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return list(map(self._get_device_data, self._get_devices(names)))
 
+    def _get_device_data(self, device):
+        """Get the device data.
+
+        :param device: an instance of the Blivet's device
+        :return: an instance of DeviceData
+        """
         # Collect the device data.
         data = DeviceData()
         self._set_device_data(device, data)
@@ -171,6 +185,26 @@ class DeviceTreeViewer(ABC):
         device = self._get_device(device_name)
         return self._get_format_data(device.format)
 
+    def get_formats_data(self, device_names):
+        """Get format data of the specified devices.
+
+        :param device_names: a list of device names
+        :return: a list of instances of DeviceFormatData
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return [self._get_format_data(d.format) for d in self._get_devices(device_names)]
+
+    def get_tree_snapshot(self):
+        """Get data of all devices in the device tree.
+
+        :return: a tuple of a list of instances of DeviceData
+                 and a list of instances of DeviceFormatData
+        """
+        devices = self.storage.devices
+        devices_data = list(map(self._get_device_data, devices))
+        formats_data = [self._get_format_data(d.format) for d in devices]
+        return devices_data, formats_data
+
     def get_format_type_data(self, format_name):
         """Get the format type data.
 
@@ -210,7 +244,7 @@ class DeviceTreeViewer(ABC):
         :return: an instance of the Blivet's device
         :raise: UnknownDeviceError if no device is found
         """
-        device = self.storage.devicetree.get_device_by_name(
+        device = self.storage.device_index.get_device_by_name(
             name, hidden=True, incomplete=True
         )
 
@@ -70,6 +70,18 @@ class DeviceTreeViewerInterface(InterfaceTemplate):
         """
         return DeviceData.to_structure(self.implementation.get_device_data(name))
 
+    def GetDevicesData(self, names: List[Str]) -> List[Structure]:
+        """Get data of the specified devices.
+
+        Use this method instead of GetDeviceData to get
+        data of many devices in one call.
+
+        :param names: a list of device names
+        :return: a list of structures with device data
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return DeviceData.to_structure_list(self.implementation.get_devices_data(names))
+
     def GetFormatData(self, name: Str) -> Structure:
         """Get the device format data.
 
@@ -78,6 +90,33 @@ class DeviceTreeViewerInterface(InterfaceTemplate):
         """
         return DeviceFormatData.to_structure(self.implementation.get_format_data(name))
 
+    def GetFormatsData(self, names: List[Str]) -> List[Structure]:
+        """Get format data of the specified devices.
+
+        Use this method instead of GetFormatData to get
+        data of many devices in one call.
+
+        :param names: a list of device names
+        :return: a list of structures with format data
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return DeviceFormatData.to_structure_list(self.implementation.get_formats_data(names))
+
+    def GetTreeSnapshot(self) -> Tuple[List[Structure], List[Structure]]:
+        """Get data of all devices in the device tree.
+
+        The devices are in the same order as the devices
+        returned by GetDevices.
+
+        :return: a tuple of a list of structures with device data
+                 and a list of structures with format data
+        """
+        devices_data, formats_data = self.implementation.get_tree_snapshot()
+        return (
+            DeviceData.to_structure_list(devices_data),
+            DeviceFormatData.to_structure_list(formats_data)
+        )
+
     def GetFormatTypeData(self, name: Str) -> Structure:
         """Get the format type data.
 
@@ -30,7 +30,7 @@ def check_disk_selection(storage, selected_disks):
     errors = []
 
     for name in selected_disks:
-        selected = storage.devicetree.get_device_by_name(name, hidden=True)
+        selected = storage.device_index.get_device_by_name(name, hidden=True)
 
         if not selected:
             errors.append(_("The selected disk {} is not recognized.").format(name))
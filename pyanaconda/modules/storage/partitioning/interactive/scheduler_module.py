@@ -51,7 +51,7 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         :param device_name: a name of the device
         :return: True or False
         """
-        device = self.storage.devicetree.get_device_by_name(
+        device = self.storage.device_index.get_device_by_name(
             device_name, hidden=True, incomplete=True
         )
 
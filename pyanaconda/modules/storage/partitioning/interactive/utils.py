@@ -62,7 +62,7 @@ def collect_used_devices(storage):
 
     for root in storage.roots:
         for device in list(root.mounts.values()) + root.swaps:
-            if device not in storage.devices:
+            if not storage.device_index.contains(device):
                 continue
             used_devices.extend(device.ancestors)
 
@@ -74,7 +74,7 @@ def collect_used_devices(storage):
     for device in storage.partitions:
         if getattr(device, "is_logical", False):
             extended = device.disk.format.extended_partition.path
-            used_devices.append(storage.devicetree.get_device_by_path(extended))
+            used_devices.append(storage.device_index.get_device_by_path(extended))
 
     return used_devices
 
@@ -790,8 +790,8 @@ def get_device_factory_arguments(storage, request: DeviceFactoryRequest, subset=
     """
     args = {
         "device_type": request.device_type,
-        "device": storage.devicetree.get_device_by_name(request.device_spec),
-        "disks": [storage.devicetree.get_device_by_name(d) for d in request.disks],
+        "device": storage.device_index.get_device_by_name(request.device_spec),
+        "disks": [storage.device_index.get_device_by_name(d) for d in request.disks],
         "mountpoint": request.mount_point or None,
         "fstype": request.format_type or None,
         "label": request.label or None,
@@ -926,7 +926,7 @@ def update_container_data(storage, request: DeviceFactoryRequest, container_name
         raise StorageError("Invalid device type.")
 
     # Find the container in the device tree if any.
-    container = storage.devicetree.get_device_by_name(container_name)
+    container = storage.device_index.get_device_by_name(container_name)
 
     if container:
         # Set the request from the found container.
@@ -83,6 +83,8 @@ class CreateUsersTask(Task):
         self._create_users()
 
     def _create_users(self):
+        user_passwords = []
+
         for user_data in self._user_data_list:
             # UserData uses -1 for not-set uid/gid while the function takes None for not-set
             uid = None
@@ -102,9 +104,19 @@ class CreateUsersTask(Task):
                                   groups=user_data.groups,
                                   shell=user_data.shell,
                                   gecos=user_data.gecos,
-                                  root=self._sysroot)
+                                  root=self._sysroot,
+                                  set_password=False)
             except ValueError as e:
                 log.warning(str(e))
+                continue
+
+            user_passwords.append((user_data.name,
+                                   user_data.password,
+                                   user_data.is_crypted,
+                                   user_data.lock))
+
+        # Set passwords of all created users at once.
+        users.set_user_passwords(user_passwords, root=self._sysroot)
 
 
 class CreateGroupsTask(Task):
@@ -0,0 +1,35 @@
+#
+# Zygote of Anaconda DBus modules launcher.
+#
+# Copyright (C) 2020 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import argparse
+
+from pyanaconda.core.constants import ANACONDA_ZYGOTE_SOCKET
+
+parser = argparse.ArgumentParser(description="The zygote of Anaconda DBus modules.")
+parser.add_argument("--socket", default=ANACONDA_ZYGOTE_SOCKET,
+                    help="a path to the socket of the zygote")
+args = parser.parse_args()
+
+from pyanaconda.modules.common import init
+init()
+
+from pyanaconda.modules.zygote.zygote import ModuleZygote
+zygote = ModuleZygote(socket_path=args.socket)
+zygote.preload()
+zygote.run()
@@ -0,0 +1,99 @@
+#
+# The client of the zygote of Anaconda DBus modules
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# The client is started for every activated module, so it has to import
+# only the standard modules it really needs.
+#
+# Usage: python3 -m pyanaconda.modules.zygote.client SOCKET MODULE
+#
+import json
+import os
+import socket
+import sys
+
+__all__ = ["ZygoteError", "spawn_module", "ZYGOTE_SOCKET_ENVIRONMENT", "ZYGOTE_REQUEST_TIMEOUT"]
+
+# The environment variable with a path to the socket of the running zygote.
+ZYGOTE_SOCKET_ENVIRONMENT = "ANACONDA_ZYGOTE_SOCKET"
+
+# How long should we wait for the zygote in seconds.
+ZYGOTE_REQUEST_TIMEOUT = 5
+
+
+class ZygoteError(Exception):
+    """The module cannot be started by the zygote."""
+
+
+def spawn_module(module_name, socket_path, timeout=ZYGOTE_REQUEST_TIMEOUT):
+    """Ask the zygote to start the specified module.
+
+    The module will run with the environment of the caller.
+
+    :param module_name: a name of a Python module to run
+    :param socket_path: a path to the socket of the zygote
+    :param timeout: a timeout of the request in seconds
+    :return: a PID of the started module
+    :raise: ZygoteError if the module cannot be started
+    """
+    request = json.dumps({
+        "module": module_name,
+        "environment": dict(os.environ),
+    })
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(timeout)
+            connection.connect(socket_path)
+            connection.sendall(request.encode() + b"\n")
+
+            with connection.makefile("r") as f:
+                reply = json.loads(f.readline() or "{}")
+
+    except (OSError, ValueError) as e:
+        raise ZygoteError("The zygote is not available: {}".format(e)) from e
+
+    if "error" in reply or "pid" not in reply:
+        raise ZygoteError(reply.get("error", "The zygote has failed."))
+
+    return reply["pid"]
+
+
+def main(argv):
+    """Ask the zygote to start the module.
+
+    :param argv: a list of the socket path and the module name
+    :return: an exit code
+    """
+    if len(argv) != 2:
+        print("Usage: client SOCKET MODULE", file=sys.stderr)
+        return 2
+
+    socket_path, module_name = argv
+
+    try:
+        spawn_module(module_name, socket_path)
+    except ZygoteError as e:
+        print("Failed to start {}: {}".format(module_name, e), file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,329 @@
+#
+# The zygote of Anaconda DBus modules
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import importlib
+import json
+import logging
+import os
+import runpy
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.constants import ANACONDA_ZYGOTE_SOCKET
+from pyanaconda.modules.zygote.client import ZygoteError, spawn_module, \
+    ZYGOTE_SOCKET_ENVIRONMENT, ZYGOTE_REQUEST_TIMEOUT
+
+log = get_module_logger(__name__)
+
+__all__ = ["ModuleZygote", "ZygoteProcess", "ZygoteError", "spawn_module",
+           "ZYGOTE_SOCKET_ENVIRONMENT"]
+
+# Modules imported by the zygote before it starts to fork.
+PRELOADED_MODULES = [
+    "dasbus.connection",
+    "dasbus.server.interface",
+    "dasbus.server.template",
+    "dasbus.typing",
+    "pykickstart.parser",
+    "pykickstart.version",
+    "pyanaconda.core.configuration.anaconda",
+    "pyanaconda.core.dbus",
+    "pyanaconda.core.signal",
+    "pyanaconda.core.util",
+    "pyanaconda.modules.common.base",
+    "pyanaconda.modules.common.containers",
+    "pyanaconda.modules.common.structures.kickstart",
+    "pyanaconda.modules.common.task",
+]
+
+# How long should we wait for the zygote in seconds.
+ZYGOTE_START_TIMEOUT = 10
+
+# How often should the zygote check its parent in seconds.
+ZYGOTE_PARENT_CHECK_INTERVAL = 1
+
+
+def _remove_socket(path):
+    """Remove the socket at the given path."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class ModuleZygote(object):
+    """The zygote of Anaconda DBus modules.
+
+    The zygote imports the modules and the configuration shared
+    by all DBus modules only once. Then it forks a new process for
+    every requested module, so the preloaded pages are shared by
+    the modules until they are modified.
+
+    The zygote must not start any threads and must not connect to
+    a message bus, because the forked processes could inherit them
+    in an inconsistent state.
+    """
+
+    def __init__(self, socket_path=ANACONDA_ZYGOTE_SOCKET, preloaded_modules=None):
+        """Create a new zygote.
+
+        :param socket_path: a path to the socket of the zygote
+        :param preloaded_modules: a list of names of modules to import
+        """
+        self._socket_path = socket_path
+        self._preloaded_modules = preloaded_modules or PRELOADED_MODULES
+        self._parent_pid = os.getppid()
+        self._socket = None
+
+    def preload(self):
+        """Import the shared modules."""
+        start = time.monotonic()
+
+        for name in self._preloaded_modules:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                log.warning("Failed to preload the module %s: %s", name, e)
+
+        # Import the kickstart handler of this version.
+        from pykickstart.version import makeVersion
+        makeVersion()
+
+        log.debug("Preloaded %d modules in %.3f s.",
+                  len(self._preloaded_modules), time.monotonic() - start)
+
+    def run(self):
+        """Serve the requests until the zygote is terminated."""
+        signal.signal(signal.SIGTERM, self._terminate)
+        self._socket = self._create_socket()
+
+        try:
+            log.debug("The zygote is ready at %s.", self._socket_path)
+
+            while self._is_parent_alive():
+                try:
+                    connection, _address = self._socket.accept()
+                except socket.timeout:
+                    continue
+
+                with connection:
+                    self._handle_request(connection)
+
+        except SystemExit:
+            log.debug("The zygote is terminated.")
+        finally:
+            self._socket.close()
+            _remove_socket(self._socket_path)
+
+    def _terminate(self, signum, frame):
+        """Terminate the zygote."""
+        sys.exit(0)
+
+    def _is_parent_alive(self):
+        """Is the process that started the zygote still running?"""
+        return os.getppid() == self._parent_pid
+
+    def _create_socket(self):
+        """Create a socket for the requests.
+
+        The socket is moved to its path once it accepts connections,
+        so the clients will never find a socket that is not ready.
+        """
+        temporary_path = "{}.{}".format(self._socket_path, os.getpid())
+        _remove_socket(temporary_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.settimeout(ZYGOTE_PARENT_CHECK_INTERVAL)
+        server.bind(temporary_path)
+        os.chmod(temporary_path, 0o600)
+        server.listen()
+
+        os.rename(temporary_path, self._socket_path)
+        return server
+
+    def _handle_request(self, connection):
+        """Handle a request for a new module."""
+        try:
+            connection.settimeout(ZYGOTE_REQUEST_TIMEOUT)
+
+            with connection.makefile("r") as f:
+                request = json.loads(f.readline())
+
+            module_name = request["module"]
+            environment = request["environment"]
+
+            if not all(part.isidentifier() for part in module_name.split(".")):
+                raise ValueError("Invalid module name: {}".format(module_name))
+
+            start = time.monotonic()
+            pid = self._spawn_module(connection, module_name, environment)
+            log.debug("Started %s as %s in %.3f s.",
+                      module_name, pid, time.monotonic() - start)
+
+            reply = {"pid": pid}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.error("Failed to handle the request: %s", e)
+            reply = {"error": str(e)}
+
+        try:
+            connection.sendall(json.dumps(reply).encode() + b"\n")
+        except OSError as e:
+            log.error("Failed to send the reply: %s", e)
+
+    def _spawn_module(self, connection, module_name, environment):
+        """Start the module in a detached process.
+
+        The module runs in a grandchild of the zygote, so it
+        doesn't have to be waited for by the zygote.
+
+        :return: a PID of the module
+        """
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if not pid:
+            # The child of the zygote.
+            try:
+                os.close(read_fd)
+                os.setsid()
+                connection.close()
+                self._socket.close()
+
+                grandchild_pid = os.fork()
+
+                if grandchild_pid:
+                    os.write(write_fd, str(grandchild_pid).encode())
+                    os._exit(0)
+
+                os.close(write_fd)
+                self._run_module(module_name, environment)
+            finally:
+                os._exit(1)
+
+        os.close(write_fd)
+
+        with os.fdopen(read_fd, "r") as f:
+            data = f.read()
+
+        os.waitpid(pid, 0)
+
+        if not data:
+            raise OSError("Failed to fork the module {}.".format(module_name))
+
+        return int(data)
+
+    @staticmethod
+    def _run_module(module_name, environment):
+        """Run the module in the current process and exit."""
+        status = 1
+
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.environ.clear()
+            os.environ.update(environment)
+
+            sys.argv = [module_name]
+            runpy.run_module(module_name, run_name="__main__", alter_sys=True)
+            status = 0
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:  # pylint: disable=broad-except
+            log.exception("The module %s has failed.", module_name)
+        finally:
+            logging.shutdown()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+
+class ZygoteProcess(object):
+    """The zygote process started by the Boss."""
+
+    def __init__(self, socket_path=ANACONDA_ZYGOTE_SOCKET):
+        """Create a new zygote process.
+
+        :param socket_path: a path to the socket of the zygote
+        """
+        self._socket_path = socket_path
+        self._process = None
+
+    @property
+    def socket_path(self):
+        """A path to the socket of the zygote."""
+        return self._socket_path
+
+    @property
+    def is_running(self):
+        """Is the zygote ready to start modules?"""
+        return self._process is not None \
+            and self._process.poll() is None \
+            and os.path.exists(self._socket_path)
+
+    def start(self, timeout=ZYGOTE_START_TIMEOUT):
+        """Start the zygote and wait until it is ready.
+
+        The modules are started in the usual way if the zygote
+        is not ready in time.
+
+        :param timeout: a timeout in seconds
+        :return: True if the zygote is running, otherwise False
+        """
+        if self._process:
+            return self.is_running
+
+        log.debug("Starting the zygote.")
+        start = time.monotonic()
+
+        self._process = subprocess.Popen([
+            sys.executable, "-m", "pyanaconda.modules.zygote",
+            "--socket", self._socket_path
+        ])
+
+        while time.monotonic() - start < timeout:
+            if self.is_running:
+                log.debug("The zygote has started in %.3f s.", time.monotonic() - start)
+                return True
+
+            if self._process.poll() is not None:
+                break
+
+            time.sleep(0.05)
+
+        log.warning("The zygote has failed to start.")
+        self.stop()
+        return False
+
+    def stop(self):
+        """Stop the zygote.
+
+        The modules started by the zygote are not affected.
+        """
+        if not self._process:
+            return
+
+        if self._process.poll() is None:
+            log.debug("Stopping the zygote.")
+            self._process.terminate()
+            self._process.wait()
+
+        _remove_socket(self._socket_path)
@@ -35,6 +35,7 @@ from pyanaconda.core.regexes import HOSTNAME_PATTERN_WITHOUT_ANCHORS, \
     IPV6_ADDRESS_IN_DRACUT_IP_OPTION, MAC_OCTET
 from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import TIME_SOURCE_SERVER
+from pyanaconda.core.glib import is_main_loop_running
 from pyanaconda.modules.common.constants.services import NETWORK, TIMEZONE, STORAGE
 from pyanaconda.modules.common.constants.objects import FCOE
 from pyanaconda.modules.common.task import sync_run_task
@@ -391,18 +392,38 @@ def wait_for_connected_NM(timeout=constants.NETWORK_CONNECTION_TIMEOUT, only_con
     else:
         log.debug("waiting for connected NM, timeout=%d", timeout)
 
-    i = 0
-    while i < timeout:
-        i += constants.NETWORK_CONNECTED_CHECK_INTERVAL
-        time.sleep(constants.NETWORK_CONNECTED_CHECK_INTERVAL)
-        if network_proxy.Connected:
-            log.debug("NM connected, waited %d seconds", i)
-            return True
-        elif only_connecting:
-            if not network_proxy.IsConnecting():
-                break
+    # Wake up when the Connected property changes. Check the state
+    # also periodically in case the signal is not delivered. Without
+    # a running main loop, the signal is never delivered.
+    if is_main_loop_running():
+        interval = constants.NETWORK_CONNECTED_SIGNAL_CHECK_INTERVAL
+    else:
+        interval = constants.NETWORK_CONNECTED_CHECK_INTERVAL
+
+    state_changed = threading.Event()
+
+    def on_properties_changed(interface, changed, invalid):
+        if "Connected" in changed:
+            state_changed.set()
+
+    network_proxy.PropertiesChanged.connect(on_properties_changed)
+    start = time.monotonic()
+
+    try:
+        while time.monotonic() - start < timeout:
+            state_changed.wait(interval)
+            state_changed.clear()
+
+            if network_proxy.Connected:
+                log.debug("NM connected, waited %d seconds", time.monotonic() - start)
+                return True
+            elif only_connecting:
+                if not network_proxy.IsConnecting():
+                    break
+    finally:
+        network_proxy.PropertiesChanged.disconnect(on_properties_changed)
 
-    log.debug("NM not connected, waited %d seconds", i)
+    log.debug("NM not connected, waited %d seconds", time.monotonic() - start)
     return False
 
 
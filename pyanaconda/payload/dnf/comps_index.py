@@ -0,0 +1,133 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+from collections import OrderedDict
+
+from pyanaconda.anaconda_loggers import get_packaging_logger
+
+log = get_packaging_logger()
+
+__all__ = ["CompsIndex"]
+
+
+class CompsIndex(object):
+    """Precomputed index of environments and groups.
+
+    The index is built once for the given comps and answers the queries
+    about environments and groups without searching the comps again.
+    Patterns that don't match an id or a name exactly are resolved by
+    the comps.
+    """
+
+    def __init__(self, comps):
+        """Create a new index.
+
+        :param comps: an instance of dnf.comps.Comps
+        """
+        self._comps = comps
+
+        self._environments = OrderedDict()
+        self._environment_names = {}
+        self._groups = OrderedDict()
+        self._group_names = {}
+
+        # environment id -> {group id: is the option default}
+        self._options = {}
+        # ids of the visible groups
+        self._visible_groups = set()
+
+        self._build()
+
+    def _build(self):
+        """Build the index."""
+        for env in self._comps.environments:
+            self._environments[env.id] = env
+            self._add_names(self._environment_names, env)
+            options = self._options.setdefault(env.id, {})
+
+            for option in env.option_ids:
+                options[option.name] = options.get(option.name, False) or option.default
+
+        for grp in self._comps.groups_iter():
+            self._groups[grp.id] = grp
+            self._add_names(self._group_names, grp)
+
+            if grp.visible:
+                self._visible_groups.add(grp.id)
+
+        log.debug("Created comps index of %d environments and %d groups.",
+                  len(self._environments), len(self._groups))
+
+    @staticmethod
+    def _add_names(names, obj):
+        """Add names of the given comps object to the mapping.
+
+        The ids take precedence over the names.
+        """
+        for name in (obj.ui_name, obj.name):
+            if name:
+                names.setdefault(name.lower(), obj)
+
+        names[obj.id.lower()] = obj
+
+    @property
+    def environments(self):
+        """A list of environment ids."""
+        return list(self._environments)
+
+    @property
+    def groups(self):
+        """A list of group ids."""
+        return list(self._groups)
+
+    def get_environment(self, pattern):
+        """Get an environment specified by an id, a name or a pattern.
+
+        :param pattern: a string
+        :return: an environment object or None
+        """
+        env = self._environment_names.get(str(pattern).lower())
+
+        if env is None:
+            env = self._comps.environment_by_pattern(pattern)
+
+        return env
+
+    def get_group(self, pattern):
+        """Get a group specified by an id, a name or a pattern.
+
+        :param pattern: a string
+        :return: a group object or None
+        """
+        grp = self._group_names.get(str(pattern).lower())
+
+        if grp is None:
+            grp = self._comps.group_by_pattern(pattern)
+
+        return grp
+
+    def get_options(self, environment_id):
+        """Get option groups of the environment.
+
+        :param environment_id: an id of the environment
+        :return: a dictionary of group ids and their default flags
+        """
+        return self._options.get(environment_id, {})
+
+    def is_group_visible(self, group_id):
+        """Is the group with the given id visible?"""
+        return group_id in self._visible_groups
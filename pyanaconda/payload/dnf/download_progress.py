@@ -43,12 +43,21 @@ def paced(fn):
 
 
 class DownloadProgress(dnf.callback.DownloadProgress):
-    def __init__(self):
+    def __init__(self, total_files=0, total_size=0):
+        """Create a new download progress.
+
+        Set the totals in advance if the packages are downloaded
+        in several batches, otherwise they are set by DNF.
+
+        :param total_files: a total number of packages to download
+        :param total_size: a total size of packages to download
+        """
         super().__init__()
         self.downloads = collections.defaultdict(int)
         self.last_time = time.time()
-        self.total_files = 0
-        self.total_size = Size(0)
+        self.total_files = total_files
+        self.total_size = Size(total_size)
+        self._fixed_totals = bool(total_files)
 
     @paced
     def _update(self):
@@ -78,5 +87,8 @@ class DownloadProgress(dnf.callback.DownloadProgress):
 
     # TODO: Remove pylint disable after DNF-2.5.0 will arrive in Fedora
     def start(self, total_files, total_size, total_drpms=0):  # pylint: disable=arguments-differ
+        if self._fixed_totals:
+            return
+
         self.total_files = total_files
         self.total_size = Size(total_size)
@@ -0,0 +1,238 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from pyanaconda.anaconda_loggers import get_packaging_logger
+from pyanaconda.payload.dnf.repomd import RepoMDMetaHash, calculate_repomd_hash
+
+log = get_packaging_logger()
+
+__all__ = ["MetadataCache"]
+
+# Names of the items in a cache entry.
+METADATA_DIR = "metadata"
+SOLV_DIR = "solv"
+
+# Suffixes of the solv files created by DNF for a repository.
+SOLV_SUFFIXES = [".solv", "-filenames.solvx", "-presto.solvx", "-updateinfo.solvx",
+                 "-other.solvx"]
+
+
+class MetadataCache(object):
+    """Persistent cache of repository metadata.
+
+    The cache survives restarts of the installer. Every entry contains
+    the downloaded metadata and the solv files of a repository and it
+    is addressed by the checksum of the repomd.xml file, so metadata
+    of an unchanged repository are never downloaded and parsed again.
+
+    Only repositories with a base url are supported, because the
+    checksum of the repomd.xml file has to be known before DNF
+    loads the repository.
+    """
+
+    def __init__(self, path, dnf_cache_dir, max_age, max_size, proxy_url=None):
+        """Create a new cache.
+
+        :param path: a path to the persistent cache directory
+        :param dnf_cache_dir: a path to the DNF cache directory
+        :param max_age: a maximal age of an entry in seconds
+        :param max_size: a maximal size of the cache in bytes
+        :param proxy_url: a proxy url or None
+        """
+        self._path = path
+        self._dnf_cache_dir = dnf_cache_dir
+        self._max_age = max_age
+        self._max_size = max_size
+        self._proxy_url = proxy_url
+
+    @property
+    def path(self):
+        """A path to the persistent cache directory."""
+        return self._path
+
+    def _get_entry_path(self, key):
+        """Get a path to the cache entry with the given key."""
+        return os.path.join(self._path, key)
+
+    def _get_remote_key(self, repo):
+        """Get a key of the remote metadata of the given repository.
+
+        :return: a key or None
+        """
+        if not repo.baseurl:
+            return None
+
+        repomd = RepoMDMetaHash(repo, self._proxy_url)
+        repomd.store_repoMD_hash()
+
+        if not repomd.is_available:
+            return None
+
+        return repomd.repoMD_hash.hex()
+
+    def _get_repo_cache_dir(self, repo):
+        """Get a path to the DNF cache directory of the given repository.
+
+        DNF names the directory after the repository id and the first
+        16 digits of the SHA-256 checksum of the metalink, the mirrorlist,
+        the first base url or the id of the repository.
+
+        :return: a path to the directory
+        """
+        source = repo.metalink or repo.mirrorlist or (repo.baseurl or [None])[0] or repo.id
+        checksum = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self._dnf_cache_dir, "{}-{}".format(repo.id, checksum))
+
+    def _get_local_key(self, repo):
+        """Get a key of the loaded metadata of the given repository.
+
+        :return: a key or None
+        """
+        repomd_path = os.path.join(self._get_repo_cache_dir(repo), "repodata", "repomd.xml")
+
+        if not os.path.exists(repomd_path):
+            return None
+
+        with open(repomd_path, "rt", errors="replace") as f:
+            return calculate_repomd_hash(f.read()).hex()
+
+    def _get_solv_files(self, repo_id):
+        """Get paths to the solv files of the given repository."""
+        paths = [os.path.join(self._dnf_cache_dir, repo_id + s) for s in SOLV_SUFFIXES]
+        return [p for p in paths if os.path.exists(p)]
+
+    def restore(self, repo):
+        """Restore cached metadata of the given repository.
+
+        The metadata are copied to the DNF cache directory,
+        so DNF will find them when the repository is loaded.
+
+        The repomd.xml file is downloaded to find the cache entry, so
+        this should be called by the workers that load the repositories.
+
+        :param repo: a DNF repository
+        """
+        key = self._get_remote_key(repo)
+
+        if not key:
+            log.debug("Metadata cache: no key for the repo %s", repo.id)
+            return
+
+        entry = self._get_entry_path(key)
+
+        if not os.path.isdir(entry):
+            log.debug("Metadata cache: miss for the repo %s", repo.id)
+            return
+
+        log.info("Metadata cache: restoring the repo %s from %s", repo.id, entry)
+        repo_cache_dir = self._get_repo_cache_dir(repo)
+        shutil.rmtree(repo_cache_dir, ignore_errors=True)
+
+        try:
+            shutil.copytree(os.path.join(entry, METADATA_DIR), repo_cache_dir,
+                            symlinks=True)
+
+            # The solv files are named after the repository.
+            for name in os.listdir(os.path.join(entry, SOLV_DIR)):
+                shutil.copy2(os.path.join(entry, SOLV_DIR, name),
+                             os.path.join(self._dnf_cache_dir, repo.id + name))
+
+            # Mark the entry as recently used.
+            os.utime(entry)
+        except OSError as e:
+            log.warning("Metadata cache: failed to restore the repo %s: %s", repo.id, e)
+            shutil.rmtree(repo_cache_dir, ignore_errors=True)
+
+    def store(self, repos):
+        """Store loaded metadata of the given repositories.
+
+        :param repos: a list of DNF repositories
+        """
+        os.makedirs(self._path, exist_ok=True)
+
+        for repo in repos:
+            key = self._get_local_key(repo)
+
+            if not key or os.path.isdir(self._get_entry_path(key)):
+                continue
+
+            log.info("Metadata cache: storing the repo %s as %s", repo.id, key)
+            tmp_entry = tempfile.mkdtemp(prefix=".", dir=self._path)
+
+            try:
+                shutil.copytree(self._get_repo_cache_dir(repo),
+                                os.path.join(tmp_entry, METADATA_DIR),
+                                symlinks=True)
+                os.mkdir(os.path.join(tmp_entry, SOLV_DIR))
+
+                # Strip the repository id from names of the solv files.
+                for path in self._get_solv_files(repo.id):
+                    name = os.path.basename(path)[len(repo.id):]
+                    shutil.copy2(path, os.path.join(tmp_entry, SOLV_DIR, name))
+
+                os.rename(tmp_entry, self._get_entry_path(key))
+            except OSError as e:
+                log.warning("Metadata cache: failed to store the repo %s: %s", repo.id, e)
+                shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self):
+        """Evict old entries and keep the cache in the size limit.
+
+        The least recently used entries are evicted first.
+        """
+        if not os.path.isdir(self._path):
+            return
+
+        entries = []
+
+        for name in os.listdir(self._path):
+            path = self._get_entry_path(name)
+
+            if not os.path.isdir(path) or name.startswith("."):
+                continue
+
+            entries.append((os.stat(path).st_mtime, _get_size(path), path))
+
+        now = time.time()
+        total_size = sum(size for _mtime, size, _path in entries)
+
+        for mtime, size, path in sorted(entries):
+            if now - mtime <= self._max_age and total_size <= self._max_size:
+                continue
+
+            log.info("Metadata cache: evicting %s", path)
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+
+
+def _get_size(path):
+    """Get a total size of files in the given directory."""
+    size = 0
+
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            size += os.lstat(os.path.join(root, name)).st_size
+
+    return size
@@ -20,6 +20,7 @@ import configparser
 import functools
 import multiprocessing
 import os
+import queue
 import shutil
 import sys
 import threading
@@ -71,9 +72,12 @@ from pyanaconda.modules.common.util import is_module_available
 from pyanaconda.payload import utils as payload_utils
 from pyanaconda.payload.base import Payload
 from pyanaconda.payload.dnf.utils import DNF_CACHE_DIR, DNF_PLUGINCONF_DIR, REPO_DIRS, \
-    DNF_LIBREPO_LOG, DNF_PACKAGE_CACHE_DIR_SUFFIX, BONUS_SIZE_ON_FILE, YUM_REPOS_DIR, \
-    go_to_failure_limbo, do_transaction, get_df_map, pick_mount_point
+    DNF_LIBREPO_LOG, DNF_PACKAGE_CACHE_DIR_SUFFIX, YUM_REPOS_DIR, SpaceEstimator, \
+    go_to_failure_limbo, do_transaction, do_batch_transaction, get_df_map, pick_mount_point, \
+    get_install_set_dependencies, split_install_set, load_repositories_metadata
+from pyanaconda.payload.dnf.comps_index import CompsIndex
 from pyanaconda.payload.dnf.download_progress import DownloadProgress
+from pyanaconda.payload.dnf.metadata_cache import MetadataCache
 from pyanaconda.payload.dnf.repomd import RepoMDMetaHash
 from pyanaconda.payload.errors import MetadataError, PayloadError, NoSuchGroup, DependencyError, \
     PayloadInstallError, PayloadSetupError
@@ -100,6 +104,7 @@ class DNFPayload(Payload):
         self._payload_proxy = get_payload(self.type)
 
         self.tx_id = None
+        self._space_estimator = SpaceEstimator()
         self._install_tree_metadata = None
         self._rpm_macros = []
 
@@ -110,6 +115,9 @@ class DNFPayload(Payload):
         # environment.
         self._environment_addons = {}
 
+        # The index of environments and groups from comps.
+        self._comps_index = None
+
         self._base = None
         self._download_location = None
         self._updates_enabled = True
@@ -559,7 +567,7 @@ class DNFPayload(Payload):
         # and group properties. Unset reposdir to ensure dnf has nothing it can
         # check automatically
         config.reposdir = []
-        self._base.read_comps(arch_filter=True)
+        self._read_comps()
 
         config.reposdir = REPO_DIRS
 
@@ -678,16 +686,28 @@ class DNFPayload(Payload):
             langpacks.append("langpacks-" + loc)
         return langpacks
 
-    def _sync_metadata(self, dnf_repo):
-        try:
-            dnf_repo.load()
-        except dnf.exceptions.RepoError as e:
-            id_ = dnf_repo.id
-            log.info('_sync_metadata: addon repo error: %s', e)
-            self.disable_repo(id_)
-            self.verbose_errors.append(str(e))
-        log.debug('repo %s: _sync_metadata success from %s', dnf_repo.id,
-                  dnf_repo.baseurl or dnf_repo.mirrorlist or dnf_repo.metalink)
+    def _sync_metadata(self, dnf_repos, metadata_cache=None):
+        """Load metadata of the given repositories.
+
+        The metadata are loaded concurrently. Repositories that fail
+        to load their metadata are disabled.
+
+        :param dnf_repos: a list of DNF repositories
+        :param metadata_cache: an instance of MetadataCache or None
+        """
+        prepare = metadata_cache.restore if metadata_cache else None
+
+        for result in load_repositories_metadata(dnf_repos, prepare=prepare):
+            dnf_repo = result.repo
+
+            if result.error:
+                log.info('_sync_metadata: addon repo error: %s', result.error)
+                self.disable_repo(dnf_repo.id)
+                self.verbose_errors.append(str(result.error))
+                continue
+
+            log.debug('repo %s: _sync_metadata success from %s', dnf_repo.id,
+                      dnf_repo.baseurl or dnf_repo.mirrorlist or dnf_repo.metalink)
 
     @property
     def base_repo(self):
@@ -722,7 +742,7 @@ class DNFPayload(Payload):
 
     @property
     def environments(self):
-        return [env.id for env in self._base.comps.environments]
+        return self._comps_index.environments
 
     def select_environment(self, environment_id):
         if environment_id not in self.environments:
@@ -740,8 +760,7 @@ class DNFPayload(Payload):
 
     @property
     def groups(self):
-        groups = self._base.comps.groups_iter()
-        return [g.id for g in groups]
+        return self._comps_index.groups
 
     def selected_groups(self):
         """Return list of selected group names from kickstart.
@@ -962,6 +981,11 @@ class DNFPayload(Payload):
         """
         repo = self._base.repos[repo_name]
         repo.enable()
+
+        metadata_cache = self._get_metadata_cache()
+        if metadata_cache:
+            metadata_cache.restore(repo)
+
         try:
             # Load the metadata to verify that the repo is valid
             repo.load()
@@ -1025,7 +1049,7 @@ class DNFPayload(Payload):
         device_tree = STORAGE.get_proxy(DEVICE_TREE)
         size = self._space_required()
         download_size = self._download_space
-        valid_points = get_df_map()
+        valid_points = self._space_estimator.get_df_map()
         root_mpoint = conf.target.system_root
 
         for key in payload_utils.get_mount_points():
@@ -1052,29 +1076,13 @@ class DNFPayload(Payload):
         if transaction is None:
             return Size("3000 MB")
 
-        size = 0
-        files_nm = 0
-        for tsi in transaction:
-            # space taken by all files installed by the packages
-            size += tsi.pkg.installsize
-            # number of files installed on the system
-            files_nm += len(tsi.pkg.files)
-
-        # append bonus size depending on number of files
-        bonus_size = files_nm * BONUS_SIZE_ON_FILE
-        size = Size(size)
-        # add another 10% as safeguard
-        total_space = (size + bonus_size) * 1.1
-        log.debug("Size from DNF: %s", size)
-        log.debug("Bonus size %s by number of files %s", bonus_size, files_nm)
-        log.debug("Total size required %s", total_space)
-        return total_space
+        return self._space_estimator.get_install_space(self.tx_id, transaction)
 
     def _is_group_visible(self, grpid):
-        grp = self._base.comps.group_by_pattern(grpid)
+        grp = self._comps_index.get_group(grpid)
         if grp is None:
             raise NoSuchGroup(grpid)
-        return grp.visible
+        return self._comps_index.is_group_visible(grp.id)
 
     def check_software_selection(self):
         log.info("checking software selection")
@@ -1138,7 +1146,7 @@ class DNFPayload(Payload):
             repo.enabled = True
 
     def environment_description(self, environment_id):
-        env = self._base.comps.environment_by_pattern(environment_id)
+        env = self._comps_index.get_environment(environment_id)
         if env is None:
             raise NoSuchGroup(environment_id)
         return (env.ui_name, env.ui_description)
@@ -1150,7 +1158,7 @@ class DNFPayload(Payload):
             log.warning("environment_id() called with non-string "
                         "argument: %s", environment)
 
-        env = self._base.comps.environment_by_pattern(environment)
+        env = self._comps_index.get_environment(environment)
 
         if env is None:
             raise NoSuchGroup(environment)
@@ -1158,23 +1166,23 @@ class DNFPayload(Payload):
         return env.id
 
     def environment_has_option(self, environment_id, grpid):
-        env = self._base.comps.environment_by_pattern(environment_id)
+        env = self._comps_index.get_environment(environment_id)
         if env is None:
             raise NoSuchGroup(environment_id)
-        return grpid in (id_.name for id_ in env.option_ids)
+        return grpid in self._comps_index.get_options(env.id)
 
     def environment_option_is_default(self, environment_id, grpid):
-        env = self._base.comps.environment_by_pattern(environment_id)
+        env = self._comps_index.get_environment(environment_id)
         if env is None:
             raise NoSuchGroup(environment_id)
 
         # Look for a group in the optionlist that matches the group_id and has
         # default set
-        return any(grp for grp in env.option_ids if grp.name == grpid and grp.default)
+        return self._comps_index.get_options(env.id).get(grpid, False)
 
     def group_description(self, grpid):
         """Return name/description tuple for the group specified by id."""
-        grp = self._base.comps.group_by_pattern(grpid)
+        grp = self._comps_index.get_group(grpid)
         if grp is None:
             raise NoSuchGroup(grpid)
         return (grp.ui_name, grp.ui_description or "")
@@ -1187,33 +1195,64 @@ class DNFPayload(Payload):
         :raise NoSuchGroup: If group_name doesn't exists.
         :raise PayloadError: When Yum's groups are not available.
         """
-        grp = self._base.comps.group_by_pattern(group_name)
+        grp = self._comps_index.get_group(group_name)
         if grp is None:
             raise NoSuchGroup(group_name)
         return grp.id
 
+    def _get_metadata_cache(self):
+        """Get the persistent cache of repository metadata.
+
+        :return: an instance of MetadataCache or None if disabled
+        """
+        if not conf.payload.metadata_cache_dir:
+            return None
+
+        return MetadataCache(
+            path=conf.payload.metadata_cache_dir,
+            dnf_cache_dir=self._base.conf.cachedir,
+            max_age=conf.payload.metadata_cache_max_age * 24 * 60 * 60,
+            max_size=Size("{} MiB".format(conf.payload.metadata_cache_max_size)),
+            proxy_url=self._get_proxy_url()
+        )
+
     def gather_repo_metadata(self):
+        metadata_cache = self._get_metadata_cache()
+
         with self._repos_lock:
-            for repo in self._base.repos.iter_enabled():
-                self._sync_metadata(repo)
+            repos = list(self._base.repos.iter_enabled())
+            self._sync_metadata(repos, metadata_cache)
+
         self._base.fill_sack(load_system_repo=False)
-        self._base.read_comps(arch_filter=True)
+
+        if metadata_cache:
+            with self._repos_lock:
+                metadata_cache.store(list(self._base.repos.iter_enabled()))
+
+        self._read_comps()
         self._refresh_environment_addons()
 
+    def _read_comps(self):
+        """Read comps and index the environments and groups."""
+        self._base.read_comps(arch_filter=True)
+        self._comps_index = CompsIndex(self._base.comps)
+
     def _refresh_environment_addons(self):
         log.info("Refreshing environment_addons")
         self._environment_addons = {}
 
-        for environment in self.environments:
-            self._environment_addons[environment] = ([], [])
+        groups = self._comps_index.groups
+        visible_groups = [grp for grp in groups if self._comps_index.is_group_visible(grp)]
+
+        for environment in self._comps_index.environments:
+            options = self._comps_index.get_options(environment)
 
             # Determine which groups are specific to this environment and which other groups
             # are available in this environment.
-            for grp in self.groups:
-                if self.environment_has_option(environment, grp):
-                    self._environment_addons[environment][0].append(grp)
-                elif self._is_group_visible(grp):
-                    self._environment_addons[environment][1].append(grp)
+            self._environment_addons[environment] = (
+                [grp for grp in groups if grp in options],
+                [grp for grp in visible_groups if grp not in options]
+            )
 
     @property
     def rpm_macros(self):
@@ -1345,6 +1384,27 @@ class DNFPayload(Payload):
             log.info("Removing existing package download "
                      "location: %s", self._download_location)
             shutil.rmtree(self._download_location)
+
+        if conf.payload.pipelined_installation:
+            self._install_pipelined()
+        else:
+            self._install_packages()
+
+        # Don't close the mother base here, because we still need it.
+        if os.path.exists(self._download_location):
+            log.info("Cleaning up downloaded packages: "
+                     "%s", self._download_location)
+            shutil.rmtree(self._download_location)
+        else:
+            # Some installation sources, such as NFS, don't need to download packages to
+            # local storage, so the download location might not always exist. So for now
+            # warn about this, at least until the RFE in bug 1193121 is implemented and
+            # we don't have to care about clearing the download location ourselves.
+            log.warning("Can't delete nonexistent download "
+                        "location: %s", self._download_location)
+
+    def _install_packages(self):
+        """Download all packages and install them in one transaction."""
         pkgs_to_download = self._base.transaction.install_set
         log.info('Downloading packages to %s.', self._download_location)
         progressQ.send_message(_('Downloading packages'))
@@ -1352,21 +1412,127 @@ class DNFPayload(Payload):
         try:
             self._base.download_packages(pkgs_to_download, progress)
         except dnf.exceptions.DownloadError as e:
-            msg = 'Failed to download the following packages: %s' % str(e)
-            exc = PayloadInstallError(msg)
-            if errors.errorHandler.cb(exc) == errors.ERROR_RAISE:
-                log.error("Installation failed: %r", exc)
-                go_to_failure_limbo()
+            self._handle_download_error(e)
 
         log.info('Downloading packages finished.')
 
         pre_msg = (N_("Preparing transaction from installation source"))
         progress_message(pre_msg)
 
+        self._run_transaction_process(do_transaction, base=self._base)
+
+    def _install_pipelined(self):
+        """Download and install the packages at the same time.
+
+        The install set is split into dependency-ordered batches. The batches
+        are downloaded in a separate thread and every downloaded batch is
+        installed by its own transaction while the next batches are still
+        downloading.
+        """
+        install_set = list(self._base.transaction.install_set)
+        batches = split_install_set(
+            install_set,
+            get_install_set_dependencies(self._base, install_set)
+        )
+
+        log.info('Downloading packages to %s in %d batches.',
+                 self._download_location, len(batches))
+        progressQ.send_message(_('Downloading packages'))
+
+        progress = DownloadProgress(
+            total_files=len(install_set),
+            total_size=sum(pkg.downloadsize for pkg in install_set)
+        )
+        install_queue = queue.Queue()
+
+        # The transactions run in forked processes. Don't fork while
+        # librepo is downloading in the other thread, so the child can't
+        # inherit locks or a half-updated base. The thread waits until
+        # the process of the downloaded batch is started.
+        process_started = threading.Semaphore(0)
+        installation_stopped = threading.Event()
+
+        def download_batches():
+            for batch in batches:
+                try:
+                    self._base.download_packages(batch, progress)
+                except Exception as e:  # pylint: disable=broad-except
+                    install_queue.put(e)
+                    return
+
+                install_queue.put(batch)
+                process_started.acquire()
+
+                if installation_stopped.is_set():
+                    return
+
+        download_thread = threading.Thread(
+            name="AnaDownloadPackagesThread",
+            target=download_batches,
+            daemon=True
+        )
+        download_thread.start()
+
+        ts_offset = 0
+
+        try:
+            for i in range(len(batches)):
+                batch = install_queue.get()
+
+                if isinstance(batch, dnf.exceptions.DownloadError):
+                    self._handle_download_error(batch)
+                    break
+
+                if isinstance(batch, Exception):
+                    raise PayloadInstallError("Failed to download packages: %s" % batch) \
+                        from batch
+
+                if i == 0:
+                    pre_msg = (N_("Preparing transaction from installation source"))
+                    progress_message(pre_msg)
+
+                log.info('Installing a batch of %d packages.', len(batch))
+                self._run_transaction_process(
+                    do_batch_transaction,
+                    started_callback=process_started.release,
+                    base=self._base,
+                    batch=batch,
+                    install_set=install_set,
+                    ts_offset=ts_offset,
+                    ts_total=len(install_set)
+                )
+                ts_offset += len(batch)
+        finally:
+            # Don't leave the download thread waiting.
+            installation_stopped.set()
+            process_started.release()
+
+        download_thread.join()
+        log.info('Downloading and installing packages finished.')
+
+    def _handle_download_error(self, exception):
+        """Handle a failed download of packages."""
+        msg = 'Failed to download the following packages: %s' % str(exception)
+        exc = PayloadInstallError(msg)
+        if errors.errorHandler.cb(exc) == errors.ERROR_RAISE:
+            log.error("Installation failed: %r", exc)
+            go_to_failure_limbo()
+
+    def _run_transaction_process(self, target, started_callback=None, **kwargs):
+        """Run the transaction in a new process and report its progress.
+
+        :param target: a function that executes the transaction
+        :param started_callback: a function called after the process is started
+        :param kwargs: keyword arguments of the function
+        """
         queue_instance = multiprocessing.Queue()
-        process = multiprocessing.Process(target=do_transaction,
-                                          args=(self._base, queue_instance))
+        process = multiprocessing.Process(target=target,
+                                          kwargs=dict(queue_instance=queue_instance, **kwargs))
         process.start()
+
+        if started_callback:
+            started_callback()
+
         (token, msg) = queue_instance.get()
         # When the installation works correctly it will get 'install' updates
         # followed by a 'post' message and then a 'quit' message.
@@ -1399,18 +1565,6 @@ class DNFPayload(Payload):
             (token, msg) = queue_instance.get()
 
         process.join()
-        # Don't close the mother base here, because we still need it.
-        if os.path.exists(self._download_location):
-            log.info("Cleaning up downloaded packages: "
-                     "%s", self._download_location)
-            shutil.rmtree(self._download_location)
-        else:
-            # Some installation sources, such as NFS, don't need to download packages to
-            # local storage, so the download location might not always exist. So for now
-            # warn about this, at least until the RFE in bug 1193121 is implemented and
-            # we don't have to care about clearing the download location ourselves.
-            log.warning("Can't delete nonexistent download "
-                        "location: %s", self._download_location)
 
     def get_repo(self, repo_id):
         """Return the yum repo object."""
@@ -1464,6 +1618,7 @@ class DNFPayload(Payload):
         shutil.rmtree(DNF_PLUGINCONF_DIR, ignore_errors=True)
 
         self.tx_id = None
+        self._space_estimator.reset()
         self._base.reset(sack=True, repos=True)
         self._configure_proxy()
         self._repoMD_list = []
@@ -26,7 +26,18 @@ from pyanaconda.payload.dnf.utils import USER_AGENT
 
 log = get_packaging_logger()
 
-__all__ = ["RepoMDMetaHash"]
+__all__ = ["RepoMDMetaHash", "calculate_repomd_hash"]
+
+
+def calculate_repomd_hash(data):
+    """Calculate SHA256 hash of the repomd.xml file content.
+
+    :param data: a content of the repomd.xml file
+    :return: a digest of the content
+    """
+    m = hashlib.sha256()
+    m.update(data.encode('ascii', 'backslashreplace'))
+    return m.digest()
 
 
 class RepoMDMetaHash(object):
@@ -50,6 +61,11 @@ class RepoMDMetaHash(object):
         """Name of the repository."""
         return self._repoId
 
+    @property
+    def is_available(self):
+        """Was the repomd.xml file downloaded?"""
+        return self._repomd_hash not in ("", self._calculate_hash(""))
+
     def store_repoMD_hash(self):
         """Download and store hash of the repomd.xml file content."""
         repomd = self._download_repoMD()
@@ -62,9 +78,7 @@ class RepoMDMetaHash(object):
         return new_repomd_hash == self._repomd_hash
 
     def _calculate_hash(self, data):
-        m = hashlib.sha256()
-        m.update(data.encode('ascii', 'backslashreplace'))
-        return m.digest()
+        return calculate_repomd_hash(data)
 
     def _download_repoMD(self):
         proxies = {}
@@ -22,13 +22,28 @@ __all__ = ["TransactionProgress"]
 
 
 class TransactionProgress(dnf.callback.TransactionProgress):
-    def __init__(self, queue_instance):
+    def __init__(self, queue_instance, ts_offset=0, ts_total=None):
+        """Create a new transaction progress.
+
+        The offset and the total number are used to report the progress
+        of a transaction that installs only a part of the install set.
+
+        :param queue_instance: a queue for reporting the progress
+        :param ts_offset: a number of packages installed by previous transactions
+        :param ts_total: a total number of packages or None
+        """
         super().__init__()
         self._queue = queue_instance
         self._last_ts = None
         self._postinst_phase = False
+        self._ts_offset = ts_offset
+        self._ts_total = ts_total
         self.cnt = 0
 
+    def _format_counter(self, ts_done, ts_total):
+        """Format the counter of the processed packages."""
+        return '(%d/%d)' % (self._ts_offset + ts_done, self._ts_total or ts_total)
+
     def progress(self, package, action, ti_done, ti_total, ts_done, ts_total):
         # Process DNF actions, communicating with anaconda via the queue
         # A normal installation consists of 'install' messages followed by
@@ -39,8 +54,8 @@ class TransactionProgress(dnf.callback.TransactionProgress):
                 return
             self._last_ts = ts_done
 
-            msg = '%s.%s (%d/%d)' % \
-                (package.name, package.arch, ts_done, ts_total)
+            msg = '%s.%s %s' % \
+                (package.name, package.arch, self._format_counter(ts_done, ts_total))
             self.cnt += 1
             self._queue.put(('install', msg))
 
@@ -68,7 +83,8 @@ class TransactionProgress(dnf.callback.TransactionProgress):
                 self._queue.put(('configure', msg))
 
         elif action == dnf.transaction.PKG_VERIFY:
-            msg = '%s.%s (%d/%d)' % (package.name, package.arch, ts_done, ts_total)
+            msg = '%s.%s %s' % \
+                (package.name, package.arch, self._format_counter(ts_done, ts_total))
             self._queue.put(('verify', msg))
 
             # Log the exact package nevra, build time and checksum
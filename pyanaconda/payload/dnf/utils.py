@@ -19,6 +19,11 @@ import os
 import operator
 import time
 
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import dnf.exceptions
+
 from blivet.size import Size
 
 from pyanaconda.anaconda_loggers import get_packaging_logger
@@ -49,6 +54,16 @@ USER_AGENT = "%s (anaconda)/%s" % (productName, productVersion)
 # 6KiB = 4K(max default fragment size) + 2K(rpm db could be taken for a header file)
 BONUS_SIZE_ON_FILE = Size("6 KiB")
 
+# The minimal number of packages installed by one transaction of the pipelined installation.
+# The dependency cycles are never split, so some transactions can be bigger.
+DNF_PIPELINE_BATCH_SIZE = 150
+
+# The maximal number of repositories that load their metadata at the same time.
+DNF_METADATA_WORKERS = 4
+
+# The result of loading metadata of a repository.
+RepoMetadataResult = namedtuple("RepoMetadataResult", ["repo", "elapsed", "error"])
+
 
 def go_to_failure_limbo():
     progressQ.send_quit(1)
@@ -56,6 +71,46 @@ def go_to_failure_limbo():
         time.sleep(10000)
 
 
+def load_repositories_metadata(repos, max_workers=DNF_METADATA_WORKERS, prepare=None):
+    """Load metadata of the given repositories concurrently.
+
+    A repository that fails to load its metadata is reported with an error.
+    A stalled download is aborted by librepo if the transfer rate stays below
+    the minrate option of the repository for the number of seconds given by
+    its timeout option. The results are returned in the same order as the
+    repositories.
+
+    :param repos: a list of DNF repositories
+    :param max_workers: a maximal number of concurrently loaded repositories
+    :param prepare: a function called with a repository before it is loaded or None
+    :return: a list of RepoMetadataResult tuples
+    """
+    results = {}
+
+    def load(repo):
+        started = time.monotonic()
+
+        try:
+            if prepare:
+                prepare(repo)
+
+            repo.load()
+        except dnf.exceptions.RepoError as e:
+            return RepoMetadataResult(repo, time.monotonic() - started, e)
+
+        return RepoMetadataResult(repo, time.monotonic() - started, None)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for result in executor.map(load, repos):
+            results[result.repo.id] = result
+
+    for result in sorted(results.values(), key=operator.attrgetter("elapsed"), reverse=True):
+        log.info("repo %s: metadata %s in %.2f s", result.repo.id,
+                 "failed to load" if result.error else "loaded", result.elapsed)
+
+    return [results[repo.id] for repo in repos]
+
+
 def get_df_map():
     """Return (mountpoint -> size available) mapping."""
     output = util.execWithCapture('df', ['--output=target,avail'])
@@ -75,6 +130,97 @@ def get_df_map():
     return structured
 
 
+def get_mount_layout():
+    """Return a description of the current mount layout.
+
+    :return: a string that changes when the mount layout changes
+    """
+    try:
+        with open("/proc/self/mountinfo", "r") as f:
+            return f.read()
+    except OSError as e:
+        log.debug("Failed to read the mount layout: %s", e)
+        return None
+
+
+class SpaceEstimator(object):
+    """Cached estimation of the space required by a transaction.
+
+    The estimation is cached for the given id of the transaction and the
+    number of files is remembered for every package, so file lists of the
+    packages are processed only once. The mount point map is cached until
+    the mount layout changes.
+    """
+
+    def __init__(self):
+        self._files_count = {}
+        self._tx_id = None
+        self._install_space = None
+        self._mount_layout = None
+        self._df_map = None
+
+    def reset(self):
+        """Drop all cached values."""
+        self._files_count = {}
+        self._tx_id = None
+        self._install_space = None
+        self._mount_layout = None
+        self._df_map = None
+
+    def get_files_count(self, package):
+        """Return a number of files installed by the given package."""
+        key = (package.repoid, str(package))
+
+        if key not in self._files_count:
+            self._files_count[key] = len(package.files)
+
+        return self._files_count[key]
+
+    def get_install_space(self, tx_id, transaction):
+        """Return the space required to install the given transaction.
+
+        :param tx_id: an id of the transaction
+        :param transaction: a DNF transaction
+        :return: an instance of Size
+        """
+        if tx_id is not None and tx_id == self._tx_id:
+            return self._install_space
+
+        size = 0
+        files_nm = 0
+        for tsi in transaction:
+            # space taken by all files installed by the packages
+            size += tsi.pkg.installsize
+            # number of files installed on the system
+            files_nm += self.get_files_count(tsi.pkg)
+
+        # append bonus size depending on number of files
+        bonus_size = files_nm * BONUS_SIZE_ON_FILE
+        size = Size(size)
+        # add another 10% as safeguard
+        total_space = (size + bonus_size) * 1.1
+        log.debug("Size from DNF: %s", size)
+        log.debug("Bonus size %s by number of files %s", bonus_size, files_nm)
+        log.debug("Total size required %s", total_space)
+
+        self._tx_id = tx_id
+        self._install_space = total_space
+        return total_space
+
+    def get_df_map(self):
+        """Return (mountpoint -> size available) mapping.
+
+        The mapping is cached until the mount layout changes.
+        """
+        layout = get_mount_layout()
+
+        if layout is None or layout != self._mount_layout or self._df_map is None:
+            self._df_map = get_df_map()
+            self._mount_layout = layout
+
+        return dict(self._df_map)
+
+
 def pick_mount_point(df, download_size, install_size, download_only):
     reasonable_mpoints = {
         '/var/tmp',
@@ -121,12 +267,12 @@ def pick_mount_point(df, download_size, install_size, download_only):
         return sorted_mpoints[0][0]
 
 
-def do_transaction(base, queue_instance):
+def do_transaction(base, queue_instance, ts_offset=0, ts_total=None):
     # Execute the DNF transaction and catch any errors. An error doesn't
     # always raise a BaseException, so presence of 'quit' without a preceeding
     # 'post' message also indicates a problem.
     try:
-        display = TransactionProgress(queue_instance)
+        display = TransactionProgress(queue_instance, ts_offset, ts_total)
         base.do_transaction(display=display)
         exit_reason = "DNF quit"
     except BaseException as e:  # pylint: disable=broad-except
@@ -137,3 +283,143 @@ def do_transaction(base, queue_instance):
     finally:
         base.close()  # Always close this base.
         queue_instance.put(('quit', str(exit_reason)))
+
+
+def get_install_set_dependencies(base, packages):
+    """Return a function for looking up dependencies in the install set.
+
+    The returned function returns packages from the given install set
+    that provide the requirements of the given package.
+
+    :param base: a DNF base
+    :param packages: a list of packages to install
+    :return: a function that takes a package and returns a set of packages
+    """
+    install_set = base.sack.query().filterm(pkg=packages)
+
+    def get_dependencies(package):
+        dependencies = set()
+
+        for requirement in package.requires + package.requires_pre:
+            providers = install_set.filter(provides=requirement)
+            dependencies.update(p for p in providers if p != package)
+
+        return dependencies
+
+    return get_dependencies
+
+
+def split_install_set(packages, get_dependencies, batch_size=DNF_PIPELINE_BATCH_SIZE):
+    """Split the install set into dependency-ordered batches.
+
+    Every batch requires only packages from itself or from the previous
+    batches, so the batches can be installed one after another. Packages
+    with cyclic dependencies always end up in the same batch.
+
+    :param packages: a list of packages to install
+    :param get_dependencies: a function that returns dependencies of a package
+    :param batch_size: a minimal number of packages in a batch
+    :return: a list of lists of packages
+    """
+    # Find strongly connected components of the dependency graph with
+    # the Tarjan's algorithm. The components are found in the reversed
+    # topological order, so dependencies are always found first.
+    components = []
+    indexes = {}
+    lowlinks = {}
+    stack = []
+    on_stack = set()
+
+    for root in packages:
+        if root in indexes:
+            continue
+
+        indexes[root] = lowlinks[root] = len(indexes)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(get_dependencies(root)))]
+
+        while work:
+            package, dependencies = work[-1]
+
+            for dependency in dependencies:
+                if dependency not in indexes:
+                    indexes[dependency] = lowlinks[dependency] = len(indexes)
+                    stack.append(dependency)
+                    on_stack.add(dependency)
+                    work.append((dependency, iter(get_dependencies(dependency))))
+                    break
+                elif dependency in on_stack:
+                    lowlinks[package] = min(lowlinks[package], indexes[dependency])
+            else:
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[package])
+
+                if lowlinks[package] == indexes[package]:
+                    component = []
+
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+
+                        if member == package:
+                            break
+
+                    components.append(component)
+
+    # Merge the components into batches.
+    batches = []
+    batch = []
+
+    for component in components:
+        batch.extend(component)
+
+        if len(batch) >= batch_size:
+            batches.append(batch)
+            batch = []
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def do_batch_transaction(base, batch, install_set, queue_instance, ts_offset, ts_total):
+    """Execute a DNF transaction for one batch of the install set.
+
+    The batch transaction runs on top of the packages installed by the
+    previous batches. Only packages from the install set can be used to
+    resolve the dependencies, so the result is the same as the result
+    of the transaction for the whole install set.
+
+    :param base: a DNF base with the resolved transaction
+    :param batch: a list of packages to install
+    :param install_set: a list of all packages to install
+    :param queue_instance: a queue for reporting the progress
+    :param ts_offset: a number of packages installed by the previous batches
+    :param ts_total: a total number of packages to install
+    """
+    try:
+        # Packages of the previous batches are already installed
+        # and weak dependencies are part of the install set.
+        base.reset(goal=True)
+        base.sack.load_system_repo(build_cache=False)
+        base.conf.install_weak_deps = False
+
+        available = base.sack.query().available()
+        base.sack.add_excludes(available.difference(available.filter(pkg=install_set)))
+
+        for package in batch:
+            base.package_install(package, strict=True)
+
+        base.resolve()
+    except dnf.exceptions.Error as e:
+        log.error('The batch transaction cannot be resolved: %s', e)
+        queue_instance.put(('quit', str(e)))
+        return
+
+    do_transaction(base, queue_instance, ts_offset=ts_offset, ts_total=ts_total)
@@ -21,6 +21,7 @@ import os
 import os.path
 import stat
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import blivet.util
 import blivet.arch
@@ -28,6 +29,7 @@ import blivet.arch
 from blivet.size import Size
 
 from pyanaconda import isys
+from pyanaconda.core.iso9660 import ISO9660Image, ISO9660Error
 from pyanaconda.errors import errorHandler, ERROR_RAISE, InvalidImageSizeError, MissingImageError
 from pyanaconda.modules.common.constants.objects import DEVICE_TREE
 from pyanaconda.modules.common.constants.services import STORAGE
@@ -43,10 +45,16 @@ log = get_module_logger(__name__)
 
 _arch = blivet.arch.get_arch()
 
+# Number of iso images checked at the same time.
+ISO_CHECK_WORKERS = 4
+
 
 def find_first_iso_image(path, mount_path="/mnt/install/cdimage"):
     """Find the first iso image in path.
 
+    The images are checked concurrently without mounting them. Only the
+    images that can't be read directly are mounted to mount_path.
+
     :param str path: path to the directory with iso image(s); this also supports pointing to
         a specific .iso image
     :param str mount_path: path for mounting the ISO when checking it is valid
@@ -63,30 +71,105 @@ def find_first_iso_image(path, mount_path="/mnt/install/cdimage"):
     except OSError:
         return None
 
-    arch = _arch
-    discinfo_path = os.path.join(mount_path, ".discinfo")
-
     if os.path.isfile(path) and path.endswith(".iso"):
         files = [os.path.basename(path)]
         path = os.path.dirname(path)
     else:
         files = os.listdir(path)
 
-    for fn in files:
-        what = os.path.join(path, fn)
-        log.debug("Checking %s", what)
-        if not isys.isIsoImage(what):
-            continue
+    with ThreadPoolExecutor(max_workers=ISO_CHECK_WORKERS) as executor:
+        futures = [executor.submit(_check_iso_image, os.path.join(path, fn)) for fn in files]
 
-        log.debug("Mounting %s on %s", what, mount_path)
         try:
-            blivet.util.mount(what, mount_path, fstype="iso9660", options="ro")
-        except OSError:
-            continue
+            for fn, future in zip(files, futures):
+                what = os.path.join(path, fn)
+                valid = future.result()
+
+                if valid is None:
+                    valid = _check_mounted_iso_image(what, mount_path)
+
+                if not valid:
+                    continue
+
+                # warn user if images appears to be wrong size
+                if os.stat(what)[stat.ST_SIZE] % 2048:
+                    log.warning("%s appears to be corrupted", what)
+                    exn = InvalidImageSizeError("size is not a multiple of 2048 bytes", what)
+                    if errorHandler.cb(exn) == ERROR_RAISE:
+                        raise exn
+
+                log.info("Found disc at %s", fn)
+                return fn
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return None
+
+
+def _check_iso_image(what):
+    """Check the iso image without mounting it.
+
+    The .discinfo and .treeinfo files are read straight from the image.
+
+    :param str what: a path to the image
+    :return: True or False, None if the image can't be checked without mounting
+    """
+    log.debug("Checking %s", what)
+    if not isys.isIsoImage(what):
+        return False
+
+    try:
+        with ISO9660Image(what) as image:
+            if not image.has_long_names:
+                return None
+
+            discinfo = image.read_file(".discinfo")
+            if discinfo is None:
+                return False
 
+            log.debug("Reading .discinfo of %s", what)
+            disc_info = DiscInfo()
+
+            try:
+                disc_info.loads(discinfo.decode("utf-8"))
+                disc_arch = disc_info.arch
+            except Exception as ex:  # pylint: disable=broad-except
+                log.warning(".discinfo file can't be loaded: %s", ex)
+                return False
+
+            if not _check_arch(what, disc_arch):
+                return False
+
+            if not _check_iso_repodata(image):
+                log.warning("%s doesn't have a valid repodata, skipping", what)
+                return False
+
+            return True
+
+    except (OSError, ISO9660Error) as e:
+        log.debug("Failed to read %s: %s", what, e)
+        return None
+
+
+def _check_mounted_iso_image(what, mount_path):
+    """Check the iso image by mounting it.
+
+    :param str what: a path to the image
+    :param str mount_path: path for mounting the image
+    :return: True or False
+    """
+    discinfo_path = os.path.join(mount_path, ".discinfo")
+
+    log.debug("Mounting %s on %s", what, mount_path)
+    try:
+        blivet.util.mount(what, mount_path, fstype="iso9660", options="ro")
+    except OSError:
+        return False
+
+    try:
         if not os.access(discinfo_path, os.R_OK):
-            blivet.util.umount(mount_path)
-            continue
+            return False
 
         log.debug("Reading .discinfo")
         disc_info = DiscInfo()
@@ -98,34 +181,32 @@ def find_first_iso_image(path, mount_path="/mnt/install/cdimage"):
             disc_arch = disc_info.arch
         except Exception as ex:  # pylint: disable=broad-except
             log.warning(".discinfo file can't be loaded: %s", ex)
-            continue
+            return False
 
-        log.debug("discArch = %s", disc_arch)
-        if disc_arch != arch:
-            log.warning("Architectures mismatch in find_first_iso_image: %s != %s",
-                        disc_arch, arch)
-            blivet.util.umount(mount_path)
-            continue
+        if not _check_arch(what, disc_arch):
+            return False
 
         # If there's no repodata, there's no point in trying to
         # install from it.
         if not _check_repodata(mount_path):
             log.warning("%s doesn't have a valid repodata, skipping", what)
-            blivet.util.umount(mount_path)
-            continue
+            return False
 
-        # warn user if images appears to be wrong size
-        if os.stat(what)[stat.ST_SIZE] % 2048:
-            log.warning("%s appears to be corrupted", what)
-            exn = InvalidImageSizeError("size is not a multiple of 2048 bytes", what)
-            if errorHandler.cb(exn) == ERROR_RAISE:
-                raise exn
-
-        log.info("Found disc at %s", fn)
+        return True
+    finally:
         blivet.util.umount(mount_path)
-        return fn
 
-    return None
+
+def _check_arch(what, disc_arch):
+    """Does the architecture of the disc match?"""
+    log.debug("discArch = %s", disc_arch)
+
+    if disc_arch != _arch:
+        log.warning("Architectures mismatch in find_first_iso_image: %s != %s",
+                    disc_arch, _arch)
+        return False
+
+    return True
 
 
 def _check_repodata(mount_path):
@@ -133,23 +214,57 @@ def _check_repodata(mount_path):
     if not install_tree_meta.load_file(mount_path):
         log.warning("Can't read install tree metadata!")
 
-    repo_md = install_tree_meta.get_base_repo_metadata()
+    repo_md = _get_install_root_repository(install_tree_meta)
 
     if not repo_md:
-        repo_mds = install_tree_meta.get_metadata_repos()
-        repo_md = _search_for_install_root_repository(repo_mds)
+        return False
+
+    if repo_md.is_valid():
+        return True
+
+    log.debug("There is no valid repository available.")
+    return False
+
+
+def _check_iso_repodata(image):
+    """Check the repodata of an iso image without mounting it.
+
+    :param image: an opened ISO9660Image
+    :return: True or False
+    """
+    install_tree_meta = InstallTreeMetadata()
+    treeinfo = image.read_file(".treeinfo") or image.read_file("treeinfo")
+
+    if treeinfo is None:
+        log.warning("Can't read install tree metadata!")
+    else:
+        install_tree_meta.load_data("", treeinfo.decode("utf-8"))
+
+    repo_md = _get_install_root_repository(install_tree_meta)
 
     if not repo_md:
-        log.debug("There is no usable repository available")
         return False
 
-    if repo_md.is_valid():
+    if image.exists(os.path.join(repo_md.path, "repodata/repomd.xml")):
         return True
 
     log.debug("There is no valid repository available.")
     return False
 
 
+def _get_install_root_repository(install_tree_meta):
+    repo_md = install_tree_meta.get_base_repo_metadata()
+
+    if not repo_md:
+        repo_mds = install_tree_meta.get_metadata_repos()
+        repo_md = _search_for_install_root_repository(repo_mds)
+
+    if not repo_md:
+        log.debug("There is no usable repository available")
+
+    return repo_md
+
+
 def _search_for_install_root_repository(repos):
     for repo in repos:
         if repo.relative_path == ".":
@@ -198,7 +313,21 @@ def find_optical_install_media():
     """
     device_tree = STORAGE.get_proxy(DEVICE_TREE)
 
+    from pyanaconda.modules.payloads.source.utils import is_valid_install_disk, \
+        is_valid_install_image
+
     for dev in device_tree.FindOpticalMedia():
+        device_data = DeviceData.from_structure(device_tree.GetDeviceData(dev))
+
+        # Check the disk without mounting it if possible.
+        valid = is_valid_install_image(device_data.path)
+
+        if valid:
+            return dev
+
+        if valid is False:
+            continue
+
         mountpoint = tempfile.mkdtemp()
 
         try:
@@ -207,7 +336,6 @@ def find_optical_install_media():
             except MountFilesystemError:
                 continue
             try:
-                from pyanaconda.modules.payloads.source.utils import is_valid_install_disk
                 if not is_valid_install_disk(mountpoint):
                     continue
             finally:
@@ -58,6 +58,20 @@ class InstallTreeMetadata(object):
 
         return True
 
+    def load_data(self, root_path, data):
+        """Loads installation tree metadata from a string.
+
+        :param root_path: Path to the installation root.
+        :type root_path: str
+        :param data: Content of the .treeinfo file.
+        :type data: str
+        :returns: True if the metadata were loaded, False otherwise.
+        """
+        self._clear()
+        self._path = root_path
+        self._tree_info.loads(data)
+        return True
+
     def load_url(self, url, proxies, sslverify, sslcert, headers):
         """Load URL link.
 
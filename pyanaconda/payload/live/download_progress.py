@@ -15,6 +15,10 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+import time
+
+from blivet.size import Size
+
 from pyanaconda.core.i18n import _
 from pyanaconda.progress import progressQ
 
@@ -28,18 +32,29 @@ class DownloadProgress(object):
         self.url = ""
         self.size = 0
         self._pct = -1
+        self._start_time = time.monotonic()
 
     def start(self, url, size):
         """ Start of download
 
             :param url:      url of the download
             :type url:       str
-            :param size:     length of the file
-            :type size:      int
+            :param size:     length of the file or None if it is not known
+            :type size:      int or None
         """
         self.url = url
         self.size = size
         self._pct = -1
+        self._start_time = time.monotonic()
+
+    def _get_throughput(self, bytes_read):
+        """ Get the average throughput of the download """
+        elapsed = time.monotonic() - self._start_time
+
+        if elapsed <= 0:
+            return Size(0)
+
+        return Size(int(bytes_read / elapsed))
 
     def update(self, bytes_read):
         """ Download update
@@ -49,13 +64,21 @@ class DownloadProgress(object):
         """
         if not bytes_read:
             return
+
+        if not self.size:
+            progressQ.send_message(_("Downloading %(url)s (%(size)s, %(speed)s/s)") %
+                                   {"url": self.url, "size": Size(bytes_read),
+                                    "speed": self._get_throughput(bytes_read)})
+            return
+
         pct = min(100, int(100 * bytes_read / self.size))
 
         if pct == self._pct:
             return
         self._pct = pct
-        progressQ.send_message(_("Downloading %(url)s (%(pct)d%%)") %
-                               {"url": self.url, "pct": pct})
+        progressQ.send_message(_("Downloading %(url)s (%(pct)d%%, %(speed)s/s)") %
+                               {"url": self.url, "pct": pct,
+                                "speed": self._get_throughput(bytes_read)})
 
     def end(self, bytes_read):
         """ Download complete
@@ -27,6 +27,7 @@ from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import INSTALL_TREE, THREAD_LIVE_PROGRESS
 from pyanaconda.core.i18n import _
 from pyanaconda.errors import errorHandler, ERROR_RAISE
+from pyanaconda.modules.payloads.base.tree_copy import TreeCopier, IMAGE_EXCLUDE_PATTERNS
 from pyanaconda.payload import utils as payload_utils
 from pyanaconda.payload.base import Payload
 from pyanaconda.payload.errors import PayloadInstallError
@@ -84,6 +85,10 @@ class BaseLivePayload(Payload):
         if self.source_size <= 0:
             raise PayloadInstallError("Nothing to install")
 
+        if conf.payload.native_image_copy:
+            self._copy_install_tree()
+            return
+
         self.pct_lock = Lock()
         self.pct = 0
         threadMgr.add(AnacondaThread(name=THREAD_LIVE_PROGRESS,
@@ -94,10 +99,10 @@ class BaseLivePayload(Payload):
         #           symlinks, hardlinks
         # go recursively, include devices and special files, don't cross
         # file system boundaries
-        args = ["-pogAXtlHrDx", "--exclude", "/dev/", "--exclude", "/proc/", "--exclude", "/tmp/*",
-                "--exclude", "/sys/", "--exclude", "/run/", "--exclude", "/boot/*rescue*",
-                "--exclude", "/boot/loader/", "--exclude", "/boot/efi/loader/",
-                "--exclude", "/etc/machine-id", INSTALL_TREE + "/", conf.target.system_root]
+        args = ["-pogAXtlHrDx"]
+        for pattern in IMAGE_EXCLUDE_PATTERNS:
+            args.extend(["--exclude", pattern])
+        args.extend([INSTALL_TREE + "/", conf.target.system_root])
         try:
             rc = util.execWithRedirect(cmd, args)
         except (OSError, RuntimeError) as e:
@@ -119,6 +124,31 @@ class BaseLivePayload(Payload):
             self.pct = 100
         threadMgr.wait(THREAD_LIVE_PROGRESS)
 
+    def _copy_install_tree(self):
+        """ Copy INSTALL_TREE with the native copy engine.
+
+            The progress is reported by the engine, so there is no need
+            to monitor the disk usage of the target.
+        """
+        copier = TreeCopier(INSTALL_TREE, conf.target.system_root, IMAGE_EXCLUDE_PATTERNS)
+        last_pct = -1
+
+        def report_progress(bytes_copied, total_size):
+            nonlocal last_pct
+            pct = int(100 * bytes_copied / total_size) if total_size else 100
+
+            if pct != last_pct:
+                last_pct = pct
+                progressQ.send_message(_("Installing software") + (" %d%%") % (min(100, pct),))
+
+        try:
+            copier.copy(report_progress)
+        except OSError as e:
+            log.error("Failed to copy the install tree: %s", e)
+            exn = PayloadInstallError(str(e))
+            if errorHandler.cb(exn) == ERROR_RAISE:
+                raise exn
+
     def post_install(self):
         """ Perform post-installation tasks. """
         progressQ.send_message(_("Performing post-installation setup tasks"))
@@ -32,6 +32,12 @@ from pyanaconda.core.constants import PAYLOAD_TYPE_LIVE_IMAGE, TAR_SUFFIX, \
 from pyanaconda.core.i18n import _
 from pyanaconda.core.payload import ProxyString, ProxyStringError
 from pyanaconda.errors import errorHandler, ERROR_RAISE
+from pyanaconda.modules.common.errors.payload import InstallError
+from pyanaconda.modules.payloads.payload.live_image.download import ImageDownloader
+from pyanaconda.modules.payloads.payload.live_image.installation import \
+    install_from_tar_stream, IMAGE_CHUNK_SIZE, TAR_EXTRACT_ARGS
+from pyanaconda.modules.payloads.payload.live_image.utils import url_target_is_streamed, \
+    get_tar_compression_option
 from pyanaconda.payload import utils as payload_utils
 from pyanaconda.payload.errors import PayloadInstallError
 from pyanaconda.payload.live.download_progress import DownloadProgress
@@ -73,6 +79,11 @@ class LiveImagePayload(BaseLivePayload):
         """ Return True if the url ends with a tar suffix """
         return any(self.data.liveimg.url.endswith(suffix) for suffix in TAR_SUFFIX)
 
+    @property
+    def is_streamed(self):
+        """ Return True if the image is extracted while it is downloaded """
+        return url_target_is_streamed(self.data.liveimg.url)
+
     def _setup_url_image(self):
         """ Check to make sure the url is available and estimate the space
             needed to download and install it.
@@ -99,8 +110,10 @@ class LiveImagePayload(BaseLivePayload):
             # At this point we know we can get the image and what its size is
             # Make a guess as to minimum size needed:
             # Enough space for image and image * 3
+            # A streamed image isn't stored, so image * 3 is enough
             if response.headers.get('content-length'):
-                self._min_size = int(response.headers.get('content-length')) * 4
+                factor = 3 if self.is_streamed else 4
+                self._min_size = int(response.headers.get('content-length')) * factor
         except IOError as e:
             log.error("Error opening liveimg: %s", e)
             error = e
@@ -142,38 +155,24 @@ class LiveImagePayload(BaseLivePayload):
 
         error = None
         progress = DownloadProgress()
+        downloader = ImageDownloader(
+            self._session,
+            self.data.liveimg.url,
+            self.image_path,
+            proxies=self._proxies,
+            verify=not self.data.liveimg.noverifyssl
+        )
         try:
             log.info("Starting image download")
-            with open(self.image_path, "wb") as f:
-                ssl_verify = not self.data.liveimg.noverifyssl
-                response = self._session.get(
-                    self.data.liveimg.url,
-                    proxies=self._proxies,
-                    verify=ssl_verify,
-                    stream=True,
-                    timeout=NETWORK_CONNECTION_TIMEOUT
-                )
-                total_length = response.headers.get('content-length')
-                if total_length is None:  # no content length header
-                    # just download the file in one go and fake the progress reporting once done
-                    log.warning("content-length header is missing for the installation image, "
-                                "download progress reporting will not be available")
-                    f.write(response.content)
-                    size = f.tell()
-                    progress.start(self.data.liveimg.url, size)
-                    progress.end(size)
-                else:
-                    # requests return headers as strings, so convert total_length to int
-                    progress.start(self.data.liveimg.url, int(total_length))
-                    bytes_read = 0
-                    for buf in response.iter_content(1024 * 1024):  # 1 MB chunks
-                        if buf:
-                            f.write(buf)
-                            f.flush()
-                            bytes_read += len(buf)
-                            progress.update(bytes_read)
-                    progress.end(bytes_read)
-                log.info("Image download finished")
+            size = downloader.probe()
+            if size is None:
+                log.warning("content-length header is missing for the installation image, "
+                            "download progress reporting will not show the percentage")
+
+            progress.start(self.data.liveimg.url, size)
+            bytes_read = downloader.download(progress.update)
+            progress.end(bytes_read)
+            log.info("Image download finished")
         except requests.exceptions.RequestException as e:
             log.error("Error downloading liveimg: %s", e)
             error = e
@@ -193,7 +192,12 @@ class LiveImagePayload(BaseLivePayload):
             callback).
 
             If it is a file:// source then use the file directly.
+
+            Remote tarballs are streamed during the installation.
         """
+        if self.is_streamed:
+            return
+
         error = None
         if self.data.liveimg.url.startswith("file://"):
             self.image_path = self.data.liveimg.url[7:]
@@ -291,6 +295,10 @@ class LiveImagePayload(BaseLivePayload):
             super().install()
             return
 
+        if self.is_streamed:
+            self._install_url_tarfile()
+            return
+
         # Use 2x the archive's size to estimate the size of the install
         # This is used to drive the progress display
         self.source_size = os.stat(self.image_path)[stat.ST_SIZE] * 2
@@ -301,12 +309,7 @@ class LiveImagePayload(BaseLivePayload):
                                      target=self.progress))
 
         cmd = "tar"
-        # preserve: ACL's, xattrs, and SELinux context
-        args = ["--numeric-owner", "--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
-                "--exclude", "dev/*", "--exclude", "proc/*", "--exclude", "tmp/*",
-                "--exclude", "sys/*", "--exclude", "run/*", "--exclude", "boot/*rescue*",
-                "--exclude", "boot/loader", "--exclude", "boot/efi/loader",
-                "--exclude", "etc/machine-id", "-xaf", self.image_path, "-C", conf.target.system_root]
+        args = TAR_EXTRACT_ARGS + ["-xaf", self.image_path, "-C", conf.target.system_root]
         try:
             rc = util.execWithRedirect(cmd, args)
         except (OSError, RuntimeError) as e:
@@ -328,6 +331,83 @@ class LiveImagePayload(BaseLivePayload):
             self.pct = 100
         threadMgr.wait(THREAD_LIVE_PROGRESS)
 
+    def _read_url_image(self, response, sha256):
+        """ Read the body of the response and update the checksum """
+        total_length = response.headers.get('content-length')
+        progress = None
+
+        if total_length is None:
+            log.warning("content-length header is missing for the installation image, "
+                        "download progress reporting will not be available")
+        else:
+            # requests return headers as strings, so convert total_length to int
+            progress = DownloadProgress()
+            progress.start(self.data.liveimg.url, int(total_length))
+
+        bytes_read = 0
+        for buf in response.iter_content(IMAGE_CHUNK_SIZE):
+            if not buf:
+                continue
+
+            sha256.update(buf)
+            bytes_read += len(buf)
+
+            if progress:
+                progress.update(bytes_read)
+
+            yield buf
+
+        if progress:
+            progress.end(bytes_read)
+
+        log.info("Image download finished")
+
+    def _install_url_tarfile(self):
+        """ Download, check and extract the tarball in one pass
+
+            The image is read exactly once and it is never stored
+            on the target disk. Names of the kernels are collected
+            during the extraction.
+        """
+        error = None
+        sha256 = hashlib.sha256()
+
+        try:
+            log.info("Starting image download")
+            response = self._session.get(
+                self.data.liveimg.url,
+                proxies=self._proxies,
+                verify=not self.data.liveimg.noverifyssl,
+                stream=True,
+                timeout=NETWORK_CONNECTION_TIMEOUT
+            )
+            response.raise_for_status()
+
+            self._kernel_version_list = install_from_tar_stream(
+                self._read_url_image(response, sha256),
+                conf.target.system_root,
+                get_tar_compression_option(self.data.liveimg.url)
+            )
+        except requests.exceptions.RequestException as e:
+            log.error("Error downloading liveimg: %s", e)
+            error = e
+        except (InstallError, OSError, RuntimeError) as e:
+            log.error("Error extracting liveimg: %s", e)
+            error = e
+        else:
+            if self.data.liveimg.checksum:
+                filesum = sha256.hexdigest()
+                log.debug("sha256 of %s is %s", self.data.liveimg.url, filesum)
+
+                if util.lowerASCII(self.data.liveimg.checksum) != filesum:
+                    log.error("%s does not match checksum.", self.data.liveimg.checksum)
+                    error = "Checksum of image does not match"
+
+        if error:
+            exn = PayloadInstallError(str(error))
+            if errorHandler.cb(exn) == ERROR_RAISE:
+                raise exn
+
     def post_install(self):
         """ Unmount and remove image
 
@@ -363,6 +443,10 @@ class LiveImagePayload(BaseLivePayload):
         if self._kernel_version_list:
             return self._kernel_version_list
 
+        # The list of a streamed tarball is collected during the installation
+        if self.is_streamed:
+            return self._kernel_version_list
+
         # Cache a list of the kernels (the tar payload may be cleaned up on subsequent calls)
         if not os.path.exists(self.image_path):
             raise PayloadInstallError("kernel_version_list: missing tar payload")
@@ -16,7 +16,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import queue
+import threading
 from pyanaconda.core.util import lowerASCII, upperASCII
 
 
@@ -40,6 +42,11 @@ class QueueFactory(object):
        that takes one argument.
 
        Reusing names within the same class is not allowed.
+
+       A consumer that runs in an event loop can watch the file descriptor
+       returned by get_wakeup_fd.  It becomes readable every time a message
+       is put into the queue.  The consumer should call clear_wakeup before
+       it takes the messages out of the queue.
     """
     def __init__(self, name):
         self.name = name
@@ -49,6 +56,46 @@ class QueueFactory(object):
 
         self.q = queue.Queue()
 
+        self._wakeup_lock = threading.Lock()
+        self._wakeup_fds = None
+
+    def get_wakeup_fd(self):
+        """Get a file descriptor that is readable if there are new messages.
+
+        :return: a file descriptor
+        """
+        with self._wakeup_lock:
+            if self._wakeup_fds is None:
+                self._wakeup_fds = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+
+                # Wake up for messages that are already in the queue.
+                if not self.q.empty():
+                    self._wakeup()
+
+            return self._wakeup_fds[0]
+
+    def clear_wakeup(self):
+        """Clear the wakeup file descriptor."""
+        if self._wakeup_fds is None:
+            return
+
+        try:
+            while os.read(self._wakeup_fds[0], 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _wakeup(self):
+        """Make the wakeup file descriptor readable."""
+        if self._wakeup_fds is None:
+            return
+
+        try:
+            os.write(self._wakeup_fds[1], b"\0")
+        except BlockingIOError:
+            # The pipe is full, so the consumer will wake up anyway.
+            pass
+
     def _makeMethod(self, constant, methodName, argc):
         def __method(*args):
             if len(args) != argc:
@@ -56,6 +103,7 @@ class QueueFactory(object):
                                 (methodName, argc, len(args)))
 
             self.q.put((constant, args))
+            self._wakeup()
 
         __method.__name__ = methodName
         return __method
@@ -294,6 +294,7 @@ class Hub(GUIObject, common.Hub):
         import queue
 
         q = hubQ.q
+        hubQ.clear_wakeup()
 
         if not self._spokes and self.window.get_may_continue() and self.continue_if_empty:
             # no spokes, move on
@@ -384,9 +385,14 @@ class Hub(GUIObject, common.Hub):
                 hub.timeout.cancel()
                 hub.timeout = None
 
+        from pyanaconda.ui.communication import hubQ
+
         log.debug("Starting event loop for hub %s", self.__class__.__name__)
         self.timeout = Timer()
-        self.timeout.timeout_msec(100, self._update_spokes)
+        self.timeout.watch_fd(hubQ.get_wakeup_fd(), self._update_spokes)
+
+        # Process the current state of the hub.
+        gtk_call_once(self._update_spokes)
 
     ### SIGNAL HANDLERS
 
@@ -423,13 +423,18 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         page = Page(root.os_name)
         self._accordion.add_page(page, cb=self.on_page_clicked)
 
+        devices_data = self._get_selectors_data(
+            list(root.mount_points.values()) + root.swap_devices
+        )
+
         for mount_point, device_name in root.mount_points.items():
             selector = MountPointSelector()
             self._update_selector(
                 selector,
                 device_name=device_name,
                 root_name=root.os_name,
-                mount_point=mount_point
+                mount_point=mount_point,
+                data=devices_data[device_name]
             )
             page.add_selector(selector, self.on_selector_clicked)
 
@@ -438,7 +443,8 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
             self._update_selector(
                 selector,
                 device_name=device_name,
-                root_name=root.os_name
+                root_name=root.os_name,
+                data=devices_data[device_name]
             )
             page.add_selector(selector, self.on_selector_clicked)
 
@@ -448,14 +454,34 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         page = UnknownPage(_("Unknown"))
         self._accordion.add_page(page, cb=self.on_page_clicked)
 
-        for device_name in sorted(devices):
+        device_names = sorted(devices)
+        devices_data = self._get_selectors_data(device_names)
+
+        for device_name in device_names:
             selector = MountPointSelector()
-            self._update_selector(selector, device_name)
+            self._update_selector(selector, device_name, data=devices_data[device_name])
             page.add_selector(selector, self.on_selector_clicked)
 
         page.show_all()
 
-    def _update_selector(self, selector, device_name="", root_name="", mount_point=""):
+    def _get_selectors_data(self, device_names):
+        """Get the device and format data of the given devices in one go.
+
+        :param device_names: a list of device names
+        :return: a dictionary of device names and pairs of device and format data
+        """
+        devices_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(device_names)
+        )
+
+        formats_data = DeviceFormatData.from_structure_list(
+            self._device_tree.GetFormatsData(device_names)
+        )
+
+        return dict(zip(device_names, zip(devices_data, formats_data)))
+
+    def _update_selector(self, selector, device_name="", root_name="", mount_point="",
+                         data=None):
         if not selector:
             return
 
@@ -465,13 +491,10 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         if not root_name:
             root_name = selector.root_name
 
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
+        if not data:
+            data = self._get_selectors_data([device_name])[device_name]
 
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_name)
-        )
+        device_data, format_data = data
 
         mount_point = self._get_mount_point_description(
             mount_point, format_data
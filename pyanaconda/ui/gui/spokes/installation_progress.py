@@ -73,6 +73,10 @@ class ProgressSpoke(StandaloneSpoke):
         import queue
 
         q = progressQ.q
+        progressQ.clear_wakeup()
+
+        # Show only the last message of a burst of messages.
+        message = None
 
         # Grab all messages may have appeared since last time this method ran.
         while True:
@@ -83,12 +87,19 @@ class ProgressSpoke(StandaloneSpoke):
             except queue.Empty:
                 break
 
+            if code == progressQ.PROGRESS_CODE_MESSAGE:
+                message = args[0]
+                q.task_done()
+                continue
+
+            if message is not None:
+                self._update_progress_message(message)
+                message = None
+
             if code == progressQ.PROGRESS_CODE_INIT:
                 self._init_progress_bar(args[0])
             elif code == progressQ.PROGRESS_CODE_STEP:
                 self._step_progress_bar()
-            elif code == progressQ.PROGRESS_CODE_MESSAGE:
-                self._update_progress_message(args[0])
             elif code == progressQ.PROGRESS_CODE_COMPLETE:
                 q.task_done()
 
@@ -102,13 +113,16 @@ class ProgressSpoke(StandaloneSpoke):
                     callback()
 
                 # There shouldn't be any more progress bar updates, so return False
-                # to indicate this method should be removed from the idle loop.
+                # to indicate this method should be removed from the main loop.
                 return False
             elif code == progressQ.PROGRESS_CODE_QUIT:
                 sys.exit(args[0])
 
             q.task_done()
 
+        if message is not None:
+            self._update_progress_message(message)
+
         return True
 
     def _installation_done(self):
@@ -171,8 +185,10 @@ class ProgressSpoke(StandaloneSpoke):
         from pyanaconda.threading import threadMgr, AnacondaThread
         super().refresh()
 
-        self._update_progress_timer.timeout_msec(
-            250,
+        from pyanaconda.progress import progressQ
+
+        self._update_progress_timer.watch_fd(
+            progressQ.get_wakeup_fd(),
             self._update_progress,
             self._installation_done
         )
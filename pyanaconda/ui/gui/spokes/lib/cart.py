@@ -89,11 +89,11 @@ class SelectedDisksDialog(GUIObject):
         return rc
 
     def _update_disks(self):
-        for device_name in self._disks:
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+        devices_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(self._disks)
+        )
 
+        for device_name, device_data in zip(self._disks, devices_data):
             device_free_space = self._device_tree.GetDiskFreeSpace(
                 [device_name]
             )
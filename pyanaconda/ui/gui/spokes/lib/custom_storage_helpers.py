@@ -408,10 +408,11 @@ class DisksDialog(GUIObject):
         return self._selected_disks
 
     def _populate_disks(self):
-        for device_name in self._disks:
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+        devices_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(self._disks)
+        )
+
+        for device_name, device_data in zip(self._disks, devices_data):
             device_free_space = self._device_tree.GetDiskFreeSpace(
                 [device_name]
             )
@@ -526,10 +527,11 @@ class ContainerDialog(GUIObject, GUIDialogInputCheckHandler):
         self._dialog_label.set_text(dialog_text)
 
     def _populate_disks(self):
-        for device_name in self._disks:
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+        devices_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(self._disks)
+        )
+
+        for device_name, device_data in zip(self._disks, devices_data):
             device_free_space = self._device_tree.GetDiskFreeSpace(
                 [device_name]
             )
@@ -83,6 +83,7 @@ class ResizeDialog(GUIObject):
         required_size = self._device_tree.GetRequiredDeviceSize(required_space)
 
         self._required_size = Size(required_size)
+        self._devices_data = {}
         self._initial_free_space = Size(0)
         self._selected_reclaimable_space = Size(0)
         self._can_shrink_something = False
@@ -132,7 +133,31 @@ class ResizeDialog(GUIObject):
         else:
             return None
 
+    def _get_devices_data(self):
+        """Get the device and format data of all devices in one call.
+
+        :return: a dictionary of device names and pairs of device and format data
+        """
+        devices_data, formats_data = self._device_tree.GetTreeSnapshot()
+
+        return {
+            device_data.name: (device_data, format_data)
+            for device_data, format_data in zip(
+                DeviceData.from_structure_list(devices_data),
+                DeviceFormatData.from_structure_list(formats_data)
+            )
+        }
+
+    def _get_device_data(self, device_name):
+        """Get the device data of the given device."""
+        return self._devices_data[device_name][0]
+
+    def _get_format_data(self, device_name):
+        """Get the format data of the given device."""
+        return self._devices_data[device_name][1]
+
     def populate(self, disks):
+        self._devices_data = self._get_devices_data()
         self._initial_free_space = Size(0)
         self._selected_reclaimable_space = Size(0)
         self._can_shrink_something = False
@@ -165,12 +190,8 @@ class ResizeDialog(GUIObject):
 
     def _add_disk(self, device_name):
         # Get the device data.
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_name)
-        )
+        device_data = self._get_device_data(device_name)
+        format_data = self._get_format_data(device_name)
 
         # First add the disk itself.
         is_partitioned = self._device_tree.IsDevicePartitioned(device_name)
@@ -219,12 +240,8 @@ class ResizeDialog(GUIObject):
 
     def _add_partition(self, itr, device_name):
         # Get the device data.
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_name)
-        )
+        device_data = self._get_device_data(device_name)
+        format_data = self._get_format_data(device_name)
 
         # Calculate the free size.
         # Devices that are not resizable are still deletable.
@@ -388,9 +405,7 @@ class ResizeDialog(GUIObject):
             return
 
         device_name = obj.name
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
+        device_data = self._get_device_data(device_name)
 
         # If the selected filesystem does not support shrinking, make that
         # button insensitive.
@@ -451,9 +466,7 @@ class ResizeDialog(GUIObject):
         if is_partitioned:
             return False
 
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
+        device_data = self._get_device_data(device_name)
 
         if obj.action == _(PRESERVE):
             return False
@@ -509,9 +522,7 @@ class ResizeDialog(GUIObject):
                     self._disk_store[part_itr][EDITABLE_COL] = False
                 elif new_action == PRESERVE:
                     part_name = self._disk_store[part_itr][DEVICE_NAME_COL]
-                    part_data = DeviceData.from_structure(
-                        self._device_tree.GetDeviceData(part_name)
-                    )
+                    part_data = self._get_device_data(part_name)
                     self._disk_store[part_itr][EDITABLE_COL] = not part_data.protected
 
                 part_itr = self._disk_store.iter_next(part_itr)
@@ -577,9 +588,7 @@ class ResizeDialog(GUIObject):
                 continue
 
             device_name = obj.name
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+            device_data = self._get_device_data(device_name)
 
             if device_data.is_disk:
                 self._on_action_changed(itr, action)
@@ -374,13 +374,11 @@ class StorageSpoke(NormalSpoke, StorageCheckHandler):
         # of them, we do not display them in the box by default.  Instead, only
         # those selected in the filter UI are displayed.  This means refresh
         # needs to know to create and destroy overviews as appropriate.
-        for device_name in self._available_disks:
-
-            # Get the device data.
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+        disks_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(self._available_disks)
+        )
 
+        for device_name, device_data in zip(self._available_disks, disks_data):
             if is_local_disk(device_data.type):
                 # Add all available local disks.
                 self._add_disk_overview(device_data, self._local_disks_box)
@@ -66,13 +66,14 @@ class DasdFormatting(object):
     @property
     def dasds_summary(self):
         """Returns a string summary of DASDs to format."""
-        return "\n".join(map(self.get_dasd_info, self.dasds))
+        dasds_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(self.dasds)
+        )
+        return "\n".join(map(self._get_dasd_info, dasds_data))
 
-    def get_dasd_info(self, disk_name):
+    @staticmethod
+    def _get_dasd_info(data):
         """Returns a string with description of a DASD."""
-        data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(disk_name)
-        )
         return "{} ({})".format(data.path, data.attrs.get("bus-id"))
 
     def search_disks(self, disk_names):
@@ -190,8 +190,12 @@ class StorageSpoke(NormalTUISpoke):
         self._container = ListColumnContainer(1, spacing=1)
 
         # loop through the disks and present them.
-        for disk_name in self._available_disks:
-            disk_info = self._format_disk_info(disk_name)
+        disks_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(self._available_disks)
+        )
+
+        for disk_name, disk_data in zip(self._available_disks, disks_data):
+            disk_info = self._format_disk_info(disk_data)
             c = CheckboxWidget(title=disk_info, completed=(disk_name in self._selected_disks))
             self._container.add(c, self._update_disk_list_callback, disk_name)
 
@@ -216,17 +220,15 @@ class StorageSpoke(NormalTUISpoke):
         self._select_all = False
         self._update_disk_list(disk)
 
-    def _format_disk_info(self, disk):
+    def _format_disk_info(self, data):
         """ Some specialized disks are difficult to identify in the storage
             spoke, so add and return extra identifying information about them.
 
             Since this is going to be ugly to do within the confines of the
             CheckboxWidget, pre-format the display string right here.
-        """
-        data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(disk)
-        )
 
+            :param data: an instance of DeviceData
+        """
         # show this info for all disks
         format_str = "{}: {} ({})".format(
             data.attrs.get("model", "DISK"),
@@ -631,8 +633,15 @@ class MountPointAssignSpoke(NormalTUISpoke):
         super().refresh(args)
         self._container = ListColumnContainer(2)
 
-        for request in self._requests:
-            widget = TextWidget(self._get_request_description(request))
+        devices_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData([
+                self._device_tree.ResolveDevice(request.device_spec)
+                for request in self._requests
+            ])
+        )
+
+        for request, device_data in zip(self._requests, devices_data):
+            widget = TextWidget(self._get_request_description(request, device_data))
             self._container.add(widget, self._configure_request, request)
 
         message = _(
@@ -689,14 +698,8 @@ class MountPointAssignSpoke(NormalTUISpoke):
             self._partitioning.GatherRequests()
         )
 
-    def _get_request_description(self, request):
+    def _get_request_description(self, request, device_data):
         """Get description of the given mount info."""
-        # Get the device data.
-        device_name = self._device_tree.ResolveDevice(request.device_spec)
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
-
         # Generate the description.
         description = "{} ({})".format(request.device_spec, Size(device_data.size))
 
@@ -104,6 +104,19 @@ class ArgparseTest(unittest.TestCase):
         self.assertEqual(conf.storage.dmraid, False)
         self.assertEqual(conf.storage.ibft, True)
 
+    def payload_test(self):
+        conf = AnacondaConfiguration.from_defaults()
+
+        opts, _deprecated = self._parseCmdline([])
+        conf.set_from_opts(opts)
+
+        self.assertEqual(conf.payload.metadata_cache_dir, "")
+
+        opts, _deprecated = self._parseCmdline(['--metadatacache=/what/ever'])
+        conf.set_from_opts(opts)
+
+        self.assertEqual(conf.payload.metadata_cache_dir, "/what/ever")
+
     def target_test(self):
         conf = AnacondaConfiguration.from_defaults()
 
@@ -0,0 +1,159 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from pyanaconda.core.async_utils import MainLoopDispatcher, async_action_wait, \
+    async_action_nowait
+
+
+class AsyncUtilsTestCase(unittest.TestCase):
+    """Test the asynchronous utilities."""
+
+    def setUp(self):
+        self.dispatcher = MainLoopDispatcher()
+        self.callbacks = []
+
+        patcher = patch("pyanaconda.core.async_utils.dispatcher", self.dispatcher)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch("pyanaconda.core.async_utils.run_in_loop", self.callbacks.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch("pyanaconda.core.async_utils.threadMgr")
+        thread_manager = patcher.start()
+        thread_manager.in_main_thread.return_value = False
+        self.addCleanup(patcher.stop)
+
+    def _run_main_loop(self):
+        """Run the scheduled callbacks."""
+        while self.callbacks:
+            callback = self.callbacks.pop(0)
+            self.assertFalse(callback())
+
+    def _wait_for_calls(self, count):
+        """Wait for the given number of queued calls."""
+        for _i in range(100):
+            if len(self.dispatcher._calls) == count:
+                return
+
+            time.sleep(0.01)
+
+        self.fail("The calls were not queued.")
+
+    def async_action_wait_test(self):
+        @async_action_wait
+        def double(value):
+            return value * 2
+
+        results = {}
+
+        def run(value):
+            results[value] = double(value)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(5)]
+
+        for thread in threads:
+            thread.start()
+
+        self._wait_for_calls(5)
+
+        # All calls are processed in one iteration.
+        self.assertEqual(len(self.callbacks), 1)
+        self._run_main_loop()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {i: i * 2 for i in range(5)})
+        self.assertEqual(self.dispatcher.statistics[0], 5)
+
+    def async_action_wait_exception_test(self):
+        @async_action_wait
+        def fail():
+            raise ValueError("Fake error.")
+
+        errors = []
+
+        def run():
+            try:
+                fail()
+            except ValueError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+
+        self._wait_for_calls(1)
+        self._run_main_loop()
+        thread.join()
+
+        self.assertEqual(len(errors), 1)
+
+    def async_action_nowait_test(self):
+        calls = []
+
+        @async_action_nowait
+        def call(value):
+            if value == 1:
+                raise ValueError("Fake error.")
+
+            calls.append(value)
+
+        call(0)
+        call(1)
+        call(2)
+
+        self.assertEqual(len(self.callbacks), 1)
+        callback = self.callbacks.pop(0)
+
+        # The exception is raised in the main loop.
+        with self.assertRaises(ValueError):
+            callback()
+
+        # The remaining calls are processed later.
+        self._run_main_loop()
+        self.assertEqual(calls, [0, 2])
+
+    def async_action_nowait_batch_test(self):
+        calls = []
+
+        @async_action_nowait
+        def call(value):
+            calls.append(value)
+
+            # Queue another call during the processing.
+            if value < 5:
+                call(value + 1)
+
+        call(0)
+        self.assertEqual(len(self.callbacks), 1)
+
+        # Only the calls queued before the iteration are processed.
+        callback = self.callbacks.pop(0)
+        self.assertFalse(callback())
+        self.assertEqual(calls, [0])
+        self.assertEqual(len(self.callbacks), 1)
+
+        self._run_main_loop()
+        self.assertEqual(calls, [0, 1, 2, 3, 4, 5])
+        self.assertFalse(self.dispatcher._scheduled)
@@ -27,7 +27,7 @@ from blivet.size import Size
 from pyanaconda.core.configuration.anaconda import AnacondaConfiguration
 from pyanaconda.core.configuration.base import create_parser, read_config, write_config, \
     get_option, set_option, ConfigurationError, ConfigurationDataError, ConfigurationFileError, \
-    Configuration
+    Configuration, Section
 from pyanaconda.core.configuration.storage import StorageSection
 from pyanaconda.modules.common.constants import services
 from pyanaconda.core.constants import SOURCE_TYPE_CLOSEST_MIRROR
@@ -185,6 +185,23 @@ class ConfigurationTestCase(unittest.TestCase):
                 ["a.conf", "b.conf", "d.conf"]
             )
 
+    def section_test(self):
+        parser = create_parser()
+        self._read_content(parser)
+        section = Section("Main", parser)
+
+        self.assertEqual(section._get_option("integer", int), 1)
+        self.assertEqual(section._get_option("boolean", bool), False)
+
+        # The converted values are cached.
+        parser["Main"]["integer"] = "2"
+        self.assertEqual(section._get_option("integer", int), 1)
+
+        # The cache is invalidated if an option is set.
+        section._set_option("boolean", True)
+        self.assertEqual(section._get_option("integer", int), 2)
+        self.assertEqual(section._get_option("boolean", bool), True)
+
 
 class AnacondaConfigurationTestCase(unittest.TestCase):
     """Test the Anaconda configuration."""
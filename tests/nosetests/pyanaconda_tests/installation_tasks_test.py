@@ -19,9 +19,11 @@
 #
 
 import unittest
+from threading import Barrier, Lock
 
 from pyanaconda.installation_tasks import Task
 from pyanaconda.installation_tasks import TaskQueue
+from pyanaconda.installation_tasks import ParallelTaskQueue
 
 class InstallTasksTestCase(unittest.TestCase):
 
@@ -369,3 +371,89 @@ class InstallTasksTestCase(unittest.TestCase):
         self.assertEqual(self._test_variable1, 3)
         self.assertEqual(self._test_variable2, 2)
         self.assertEqual(self._test_variable3, 1)
+
+
+class ParallelTaskQueueTestCase(unittest.TestCase):
+    """Test the parallel task queue."""
+
+    def setUp(self):
+        self._lock = Lock()
+        self._events = []
+
+    def _record(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def independent_tasks_test(self):
+        """Check that independent tasks run at the same time."""
+        barrier = Barrier(3, timeout=10)
+
+        queue = ParallelTaskQueue("queue", max_workers=3)
+        queue.append(Task("task 1", barrier.wait))
+        queue.append(Task("task 2", barrier.wait))
+        queue.append(Task("task 3", barrier.wait))
+
+        # the tasks would time out if they were started one by one
+        queue.start()
+        self.assertTrue(queue.done)
+        self.assertFalse(barrier.broken)
+
+    def dependent_tasks_test(self):
+        """Check that dependent tasks run in order."""
+        queue = ParallelTaskQueue("queue")
+        queue.append(Task("c", self._record, ("c",), requires=["b"]))
+        queue.append(Task("a", self._record, ("a",), provides=["a"]))
+        queue.append(Task("b", self._record, ("b",), requires=["a"], provides=["b"]))
+        queue.append(Task("d", self._record, ("d",), requires=["a", "b"]))
+
+        self.assertEqual(queue._get_dependencies(list(queue)), [set(), set(), {1}, {1, 2}])
+
+        queue.start()
+        self.assertTrue(queue.done)
+        self.assertEqual(set(self._events), {"a", "b", "c", "d"})
+        self.assertLess(self._events.index("a"), self._events.index("b"))
+        self.assertLess(self._events.index("b"), self._events.index("d"))
+
+    def signals_test(self):
+        """Check the signals of the parallel task queue."""
+        started = []
+        completed = []
+
+        group = TaskQueue("group", provides=["group"])
+        group.append(Task("task 1", self._record, ("1",)))
+        group.append(Task("task 2", self._record, ("2",)))
+
+        queue = ParallelTaskQueue("queue", max_workers=2)
+        queue.append(group)
+        queue.append(Task("task 3", self._record, ("3",), requires=["group"]))
+        queue.append(Task("task 4", self._record, ("4",)))
+
+        top_queue = TaskQueue("top")
+        top_queue.append(queue)
+        top_queue.task_started.connect(lambda x: started.append(x.name))
+        top_queue.task_completed.connect(lambda x: completed.append(x.name))
+
+        self.assertEqual(top_queue.task_count, 4)
+        self.assertEqual(top_queue.queue_count, 2)
+        self.assertIn("Parallel task queue: queue", top_queue.summary)
+
+        top_queue.start()
+        self.assertEqual(sorted(started), ["task 1", "task 2", "task 3", "task 4"])
+        self.assertEqual(sorted(completed), ["task 1", "task 2", "task 3", "task 4"])
+        self.assertLess(self._events.index("2"), self._events.index("3"))
+
+    def failed_task_test(self):
+        """Check that a failed task stops the queue."""
+        def fail():
+            raise ValueError("Fake error!")
+
+        queue = ParallelTaskQueue("queue", max_workers=1)
+        queue.append(Task("a", fail, provides=["a"]))
+        queue.append(Task("b", self._record, ("b",), requires=["a"]))
+        queue.append(Task("c", self._record, ("c",)))
+
+        with self.assertRaises(ValueError) as cm:
+            queue.start()
+
+        self.assertEqual(str(cm.exception), "Fake error!")
+        self.assertEqual(self._events, [])
@@ -0,0 +1,286 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import re
+import struct
+import tempfile
+import unittest
+
+from pyanaconda.core.iso9660 import ISO9660Image, ISO9660Error, ISO_SECTOR_SIZE
+
+
+def _pack_both(fmt, value):
+    """Pack a number in both byte orders."""
+    return struct.pack("<" + fmt, value) + struct.pack(">" + fmt, value)
+
+
+def _directory_record(identifier, extent, size, is_dir, system_use=b""):
+    """Create a directory record."""
+    padding = b"\x00" if len(identifier) % 2 == 0 else b""
+    record = b"".join([
+        b"\x00",  # length
+        b"\x00",  # extended attribute length
+        _pack_both("I", extent),
+        _pack_both("I", size),
+        b"\x00" * 7,  # date
+        b"\x02" if is_dir else b"\x00",
+        b"\x00\x00",
+        _pack_both("H", 1),
+        bytes([len(identifier)]),
+        identifier,
+        padding,
+        system_use,
+    ])
+
+    if len(record) % 2:
+        record += b"\x00"
+
+    return bytes([len(record)]) + record[1:]
+
+
+class ISOImageBuilder(object):
+    """Build a small ISO9660 image for testing."""
+
+    def __init__(self, files, rock_ridge=True, joliet=False, continuation=False):
+        self._files = files
+        self._rock_ridge = rock_ridge
+        self._joliet = joliet
+        self._continuation = continuation
+        self._sectors = {}
+        self._next_sector = 20
+
+        # Create the directory tree.
+        self._dirs = {"": []}
+
+        for path in sorted(files):
+            parts = path.split("/")
+
+            for i in range(1, len(parts)):
+                directory = "/".join(parts[:i])
+
+                if directory not in self._dirs:
+                    self._dirs[directory] = []
+                    self._dirs["/".join(parts[:i - 1])].append(directory)
+
+            self._dirs["/".join(parts[:-1])].append(path)
+
+    def _allocate(self, data):
+        """Store data in new sectors."""
+        sector = self._next_sector
+        count = max(1, -(-len(data) // ISO_SECTOR_SIZE))
+        self._sectors[sector] = data
+        self._next_sector += count
+        return sector
+
+    def _identifier(self, path, joliet):
+        name = path.split("/")[-1]
+        is_dir = path in self._dirs
+
+        if joliet:
+            return (name if is_dir else name + ";1").encode("utf-16-be")
+
+        plain = re.sub("[^A-Z0-9_]", "_", name.upper())[:8]
+        return (plain if is_dir else plain + ".;1").encode("ascii")
+
+    def _system_use(self, path, joliet):
+        if joliet or not self._rock_ridge:
+            return b""
+
+        name = path.split("/")[-1].encode("utf-8")
+        entry = b"NM" + bytes([5 + len(name), 1, 0]) + name
+
+        if not self._continuation:
+            return entry
+
+        sector = self._allocate(entry)
+        return b"CE" + bytes([28, 1]) + _pack_both("I", sector) + _pack_both("I", 0) + \
+            _pack_both("I", len(entry))
+
+    def _build_directory(self, path, extents, joliet):
+        """Serialize a directory."""
+        self_use = b""
+
+        if path == "" and self._rock_ridge and not joliet:
+            self_use = b"SP" + bytes([7, 1, 0xbe, 0xef, 0])
+
+        extent, size = extents[path]
+        records = [
+            _directory_record(b"\x00", extent, size, True, self_use),
+            _directory_record(b"\x01", extent, size, True),
+        ]
+
+        for child in self._dirs[path]:
+            if child in self._dirs:
+                child_extent, child_size = extents[child]
+                is_dir = True
+            else:
+                child_extent, child_size = self._file_extents[child], len(self._files[child])
+                is_dir = False
+
+            records.append(_directory_record(
+                self._identifier(child, joliet), child_extent, child_size, is_dir,
+                self._system_use(child, joliet)
+            ))
+
+        # Records don't cross sector boundaries.
+        data = b""
+        for record in records:
+            used = len(data) % ISO_SECTOR_SIZE
+            if used + len(record) > ISO_SECTOR_SIZE:
+                data += b"\x00" * (ISO_SECTOR_SIZE - used)
+            data += record
+
+        return data
+
+    def _build_tree(self, joliet):
+        """Serialize all directories of a tree and return the root record."""
+        # The size of a directory doesn't depend on extents.
+        dummy = {path: (0, 0) for path in self._dirs}
+        sizes = {}
+        for path in self._dirs:
+            sizes[path] = len(self._build_directory(path, dummy, joliet))
+
+        extents = {}
+        for path in self._dirs:
+            size = -(-sizes[path] // ISO_SECTOR_SIZE) * ISO_SECTOR_SIZE
+            extents[path] = (self._allocate(b""), size)
+            self._next_sector += size // ISO_SECTOR_SIZE - 1
+
+        for path in self._dirs:
+            self._sectors[extents[path][0]] = self._build_directory(path, extents, joliet)
+
+        extent, size = extents[""]
+        return _directory_record(b"\x00", extent, size, True)
+
+    def _descriptor(self, descriptor_type, root, escapes=b""):
+        data = bytearray(ISO_SECTOR_SIZE)
+        data[0] = descriptor_type
+        data[1:6] = b"CD001"
+        data[6] = 1
+        data[88:88 + len(escapes)] = escapes
+        data[128:132] = _pack_both("H", ISO_SECTOR_SIZE)
+        data[156:156 + len(root)] = root
+        return bytes(data)
+
+    def build(self):
+        """Build the image."""
+        self._file_extents = {path: self._allocate(data) for path, data in self._files.items()}
+
+        descriptors = [self._descriptor(1, self._build_tree(False))]
+
+        if self._joliet:
+            descriptors.append(self._descriptor(2, self._build_tree(True), b"%/E"))
+
+        descriptors.append(self._descriptor(255, b""))
+
+        image = bytearray(self._next_sector * ISO_SECTOR_SIZE)
+
+        for i, descriptor in enumerate(descriptors):
+            start = (16 + i) * ISO_SECTOR_SIZE
+            image[start:start + ISO_SECTOR_SIZE] = descriptor
+
+        for sector, data in self._sectors.items():
+            start = sector * ISO_SECTOR_SIZE
+            image[start:start + len(data)] = data
+
+        return bytes(image)
+
+
+class ISO9660ImageTestCase(unittest.TestCase):
+    """Test the reader of ISO9660 images."""
+
+    def setUp(self):
+        self.files = {
+            ".discinfo": b"1587584254.021611\nFedora 32\nx86_64\n",
+            ".treeinfo": b"[general]\nname = Fedora\n",
+            "repodata/repomd.xml": b"<repomd/>",
+            "Packages/k/kernel-5.6.6-300.fc32.x86_64.rpm": b"x" * 5000,
+        }
+
+        # Make the directory big enough to span more sectors.
+        for i in range(60):
+            self.files["Packages/a/a-package-with-a-long-name-{}.rpm".format(i)] = b""
+
+    def _open(self, data):
+        self.image_file = tempfile.NamedTemporaryFile()
+        self.addCleanup(self.image_file.close)
+        self.image_file.write(data)
+        self.image_file.flush()
+        return ISO9660Image(self.image_file.name)
+
+    def _check_image(self, image):
+        self.assertTrue(image.has_long_names)
+        self.assertEqual(image.read_file(".discinfo"), self.files[".discinfo"])
+        self.assertEqual(image.read_file(".treeinfo"), self.files[".treeinfo"])
+        self.assertTrue(image.exists("repodata/repomd.xml"))
+        self.assertTrue(image.exists("./repodata/"))
+        self.assertTrue(image.isdir("repodata"))
+        self.assertFalse(image.isdir("repodata/repomd.xml"))
+        self.assertFalse(image.exists("repodata/missing.xml"))
+        self.assertFalse(image.exists(".discinfo/file"))
+        self.assertEqual(image.read_file("repodata"), None)
+        self.assertEqual(image.read_file("missing"), None)
+        self.assertTrue(image.exists("Packages/a/a-package-with-a-long-name-59.rpm"))
+        self.assertEqual(
+            image.read_file("Packages/k/kernel-5.6.6-300.fc32.x86_64.rpm"), b"x" * 5000
+        )
+
+        with self.assertRaises(ISO9660Error):
+            image.read_file("Packages/k/kernel-5.6.6-300.fc32.x86_64.rpm", max_size=1000)
+
+    def rock_ridge_test(self):
+        """Test an image with Rock Ridge names."""
+        data = ISOImageBuilder(self.files, rock_ridge=True, joliet=True).build()
+
+        with self._open(data) as image:
+            self._check_image(image)
+
+    def rock_ridge_continuation_test(self):
+        """Test an image with Rock Ridge names in continuation areas."""
+        data = ISOImageBuilder(self.files, rock_ridge=True, continuation=True).build()
+
+        with self._open(data) as image:
+            self._check_image(image)
+
+    def joliet_test(self):
+        """Test an image with Joliet names."""
+        data = ISOImageBuilder(self.files, rock_ridge=False, joliet=True).build()
+
+        with self._open(data) as image:
+            self._check_image(image)
+
+    def plain_names_test(self):
+        """Test an image with plain ISO9660 names."""
+        files = {"DISCINFO": b"data", "REPODATA/REPOMD": b"<repomd/>"}
+        data = ISOImageBuilder(files, rock_ridge=False, joliet=False).build()
+
+        with self._open(data) as image:
+            self.assertFalse(image.has_long_names)
+            self.assertEqual(image.read_file("DISCINFO"), b"data")
+            self.assertEqual(image.read_file("discinfo"), b"data")
+            self.assertTrue(image.exists("repodata/repomd"))
+
+    def invalid_image_test(self):
+        """Test invalid images."""
+        with self.assertRaises(ISO9660Error):
+            self._open(b"x" * ISO_SECTOR_SIZE * 20).open()
+
+        with self.assertRaises(ISO9660Error):
+            self._open(b"x" * 100).open()
+
+        with self.assertRaises(OSError):
+            ISO9660Image("/nonexistent/image.iso").open()
@@ -51,6 +51,8 @@ from pyanaconda.modules.storage.bootloader.bootloader_interface import Bootloade
 from pyanaconda.modules.storage.bootloader.installation import ConfigureBootloaderTask, \
     InstallBootloaderTask, FixZIPLBootloaderTask, FixBTRFSBootloaderTask, RecreateInitrdsTask, \
     CreateRescueImagesTask, CreateBLSEntriesTask
+from pyanaconda.modules.storage.bootloader.utils import recreate_initrds, _get_initrd_commands, \
+    _run_kernel_commands, _run_for_kernels
 
 
 class BootloaderInterfaceTestCase(unittest.TestCase):
@@ -490,7 +492,9 @@ class BootloaderTasksTestCase(unittest.TestCase):
             exec_mock.assert_not_called()
 
         exec_mock.reset_mock()
+        exec_mock.return_value = 0
         conf_mock.target.is_image = False
+        conf_mock.bootloader.initramfs_jobs = 2
         args_mock.get.return_value = None
 
         with tempfile.TemporaryDirectory() as root:
@@ -505,13 +509,13 @@ class BootloaderTasksTestCase(unittest.TestCase):
                 mock.call(
                     "depmod", [
                         "-a", "4.17.7-200.fc28.x86_64"
-                    ], root=root
+                    ], stdout=mock.ANY, log_output=False, root=root
                 ),
                 mock.call(
                     "dracut", [
                         "-f", "/boot/initramfs-4.17.7-200.fc28.x86_64.img",
                         "4.17.7-200.fc28.x86_64"
-                    ], root=root)
+                    ], stdout=mock.ANY, log_output=False, root=root)
             ])
 
         exec_mock.reset_mock()
@@ -534,7 +538,7 @@ class BootloaderTasksTestCase(unittest.TestCase):
                     "new-kernel-pkg", [
                         "--mkinitrd", "--dracut", "--depmod",
                         "--update", "4.17.7-200.fc28.x86_64"
-                    ], root=root
+                    ], stdout=mock.ANY, log_output=False, root=root
                 ),
                 mock.call(
                     "fips-mode-setup", [
@@ -560,9 +564,51 @@ class BootloaderTasksTestCase(unittest.TestCase):
                     "-f", "/boot/initramfs-4.17.7-200.fc28.x86_64.img",
                     "4.17.7-200.fc28.x86_64"
                 ],
+                stdout=mock.ANY,
+                log_output=False,
                 root=root
             )
 
+    @patch('pyanaconda.modules.storage.bootloader.utils.kernel_arguments')
+    @patch('pyanaconda.modules.storage.bootloader.utils.execWithRedirect')
+    @patch('pyanaconda.modules.storage.bootloader.utils.conf')
+    def recreate_initrds_concurrently_test(self, conf_mock, exec_mock, args_mock):
+        """Test the concurrent recreation of initrds."""
+        versions = ["5.6.6-300.fc32.x86_64", "5.6.8-300.fc32.x86_64"]
+
+        def execute(command, args, stdout, log_output, root):
+            stdout.write("{} {}\n".format(command, args[-1]))
+            return 1 if args[-1] == versions[1] and command == "dracut" else 0
+
+        exec_mock.side_effect = execute
+        conf_mock.target.is_image = False
+        conf_mock.bootloader.initramfs_jobs = 2
+        args_mock.get.return_value = None
+
+        with tempfile.TemporaryDirectory() as root:
+            with self.assertLogs("anaconda.modules.storage.bootloader.utils", "WARNING") as cm:
+                results = _run_for_kernels(
+                    lambda kernel: _run_kernel_commands(
+                        root, _get_initrd_commands(kernel, use_dracut=True)
+                    ),
+                    versions,
+                    jobs=2
+                )
+
+            self.assertEqual(results, {versions[0]: 0, versions[1]: 1})
+            self.assertIn(versions[1], "\n".join(cm.output))
+
+            exec_mock.reset_mock()
+            recreate_initrds(root, versions)
+
+            self.assertEqual(exec_mock.call_count, 4)
+
+            for version in versions:
+                exec_mock.assert_any_call(
+                    "dracut", ["-f", "/boot/initramfs-{}.img".format(version), version],
+                    stdout=mock.ANY, log_output=False, root=root
+                )
+
     @patch('pyanaconda.modules.storage.bootloader.installation.conf')
     @patch('pyanaconda.modules.storage.bootloader.installation.InstallBootloaderTask')
     @patch('pyanaconda.modules.storage.bootloader.installation.ConfigureBootloaderTask')
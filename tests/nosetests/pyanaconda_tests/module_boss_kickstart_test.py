@@ -18,7 +18,9 @@
 
 import unittest
 import os
+import time
 from contextlib import contextmanager
+from threading import Barrier
 from unittest.mock import Mock
 
 from pyanaconda.modules.boss.kickstart_manager import KickstartManager
@@ -264,6 +266,67 @@ class KickstartManagerTestCase(unittest.TestCase):
 
         self.assertEqual(manager.generate_kickstart(), self._m123_kickstart)
 
+    def distribute_concurrently_test(self):
+        """Check that the modules read the kickstart at the same time."""
+        manager = KickstartManager()
+        barrier = Barrier(3, timeout=10)
+
+        # The first module finishes last.
+        module1 = BlockingTestModule(barrier, delay=0.1, commands=["network", "firewall"])
+        module2 = BlockingTestModule(barrier, addons=["pony"])
+        module3 = BlockingTestModule(barrier, sections=["packages"])
+
+        manager.on_module_observers_changed([
+            self._get_module_observer("1", module1),
+            self._get_module_observer("2", module2),
+            self._get_module_observer("3", module3),
+        ])
+
+        with self._create_ks_files(self._kickstart_include) as filename:
+            report = manager.read_kickstart_file(filename)
+
+        self.assertEqual(module1.kickstart, self._m1_kickstart)
+        self.assertEqual(module2.kickstart, self._m2_kickstart)
+        self.assertEqual(module3.kickstart, self._m3_kickstart)
+
+        # The messages are in the order of modules.
+        messages = report.get_messages()
+        self.assertEqual([m.module_name for m in messages], ["1", "3"])
+        self.assertEqual([m.line_number for m in messages], [5, 41])
+
+    def get_split_kickstart_test(self):
+        """Check the split kickstart with line references."""
+        manager = KickstartManager()
+        self.assertEqual(manager.get_split_kickstart(), ("", [(0, "")]))
+
+        with self._create_ks_files(self._kickstart_include) as filename:
+            manager.read_kickstart_file(filename)
+
+        kickstart, line_references = manager.get_split_kickstart()
+        lines = kickstart.splitlines()
+
+        self.assertNotIn("%include", kickstart)
+        self.assertEqual(len(line_references), len(lines) + 1)
+        self.assertEqual(line_references[0], (0, ""))
+        self.assertEqual(lines[0], "text")
+        self.assertEqual(line_references[1], (1, "ks.manager.test.include.cfg"))
+
+        number = lines.index("network --device=ens541 --activate") + 1
+        self.assertEqual(line_references[number], (2, INCLUDE_LEVEL_2_FILENAME))
+
+        number = lines.index("network --hostname=PARSE_ERROR") + 1
+        self.assertEqual(line_references[number], (5, INCLUDE_LEVEL_1_FILENAME))
+
+        number = lines.index("@PARSE_ERROR") + 1
+        self.assertEqual(line_references[number], (41, "ks.manager.test.include.cfg"))
+
+        # The split kickstart is dropped if the kickstart cannot be read.
+        ks_content = "%packages\nblah\n"
+        with self._create_ks_files([("ks.mgr.test.missing_end.cfg", ks_content)]) as filename:
+            manager.read_kickstart_file(filename)
+
+        self.assertEqual(manager.get_split_kickstart(), ("", [(0, "")]))
+
     def nothing_to_parse_test(self):
         ks_content = ""
         manager = KickstartManager()
@@ -383,3 +446,17 @@ class TestModule(object):
     def GenerateKickstart(self):
         """Mock generating a kickstart."""
         return self.kickstart
+
+
+class BlockingTestModule(TestModule):
+    """Test module that waits for other modules to read the kickstart."""
+
+    def __init__(self, barrier, delay=0, **kwargs):
+        super().__init__(**kwargs)
+        self._barrier = barrier
+        self._delay = delay
+
+    def ReadKickstart(self, kickstart):
+        self._barrier.wait()
+        time.sleep(self._delay)
+        return super().ReadKickstart(kickstart)
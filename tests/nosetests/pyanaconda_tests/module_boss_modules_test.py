@@ -15,6 +15,7 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+import os
 import unittest
 from unittest.mock import Mock, patch
 
@@ -22,7 +23,8 @@ from dasbus.constants import DBUS_START_REPLY_SUCCESS, DBUS_FLAG_NONE
 from dasbus.error import DBusError
 
 from pyanaconda.modules.boss.module_manager import ModuleManager
-from pyanaconda.modules.boss.module_manager.start_modules import StartModulesTask
+from pyanaconda.modules.boss.module_manager.start_modules import StartModulesTask, \
+    get_memory_usage
 from pyanaconda.modules.common.errors.module import UnavailableModuleError
 
 
@@ -51,6 +53,37 @@ class ModuleManagerTestCase(unittest.TestCase):
         self.assertEqual([o.service_name for o in observers], service_names)
         return observers
 
+    @patch("dasbus.client.observer.Gio")
+    def start_with_zygote_test(self, gio):
+        """Start modules with a zygote."""
+        service_names = [
+            "org.fedoraproject.Anaconda.Modules.A",
+            "org.fedoraproject.Anaconda.Modules.B",
+        ]
+
+        zygote = Mock(socket_path="/run/zygote.socket")
+        zygote.start.return_value = True
+        task = StartModulesTask(self._message_bus, service_names, False, zygote=zygote)
+
+        bus_proxy = self._message_bus.proxy
+        bus_proxy.GetConnectionUnixProcessID.return_value = os.getpid()
+
+        self._check_started_modules(task, service_names)
+        zygote.start.assert_called_once_with()
+        bus_proxy.UpdateActivationEnvironment.assert_called_once_with({
+            "ANACONDA_ZYGOTE_SOCKET": "/run/zygote.socket"
+        })
+
+        self.assertEqual(bus_proxy.GetConnectionUnixProcessID.call_count, 2)
+        self.assertEqual(len(task._startup_times), 2)
+
+    def get_memory_usage_test(self):
+        """Get the memory usage of a process."""
+        rss, _pss = get_memory_usage(os.getpid())
+        self.assertGreater(rss, 0)
+
+        self.assertEqual(get_memory_usage(-1), (None, None))
+
     def start_no_modules_test(self):
         """Start no modules."""
         task = StartModulesTask(self._message_bus, [], addons_enabled=False)
@@ -17,6 +17,8 @@
 #
 # Red Hat Author(s): Vendula Poncova <vponcova@redhat.com>
 #
+import os
+import shutil
 import tempfile
 import unittest
 from unittest.mock import patch, Mock, PropertyMock
@@ -25,7 +27,7 @@ from tests.nosetests.pyanaconda_tests import patch_dbus_publish_object, check_ta
 
 from blivet.devices import StorageDevice, DiskDevice, DASDDevice, ZFCPDiskDevice, PartitionDevice, \
     LUKSDevice, iScsiDiskDevice, NVDIMMNamespaceDevice, FcoeDiskDevice, OpticalDevice
-from blivet.errors import StorageError, FSError
+from blivet.errors import StorageError, FSError, DuplicateUUIDError
 from blivet.formats import get_format
 from blivet.formats.fs import FS, Iso9660FS
 from blivet.formats.luks import LUKS
@@ -38,7 +40,9 @@ from pyanaconda.modules.storage.devicetree.devicetree_interface import DeviceTre
 from pyanaconda.modules.storage.devicetree.populate import FindDevicesTask
 from pyanaconda.modules.storage.devicetree.rescue import FindExistingSystemsTask, \
     MountExistingSystemTask
-from pyanaconda.modules.storage.devicetree.root import Root
+from pyanaconda.modules.storage.devicetree import root as root_module
+from pyanaconda.modules.storage.devicetree.root import Root, get_release_string, \
+    find_existing_installations, reset_installations_cache, InstallationData
 
 
 class DeviceTreeInterfaceTestCase(unittest.TestCase):
@@ -305,6 +309,61 @@ class DeviceTreeInterfaceTestCase(unittest.TestCase):
             'description': get_variant(Str, 'LUKS'),
         })
 
+    def get_devices_data_test(self):
+        """Test GetDevicesData and GetFormatsData."""
+        dev1 = StorageDevice(
+            "dev1",
+            fmt=get_format("ext4", mountpoint="/"),
+            size=Size("10 GiB")
+        )
+        self._add_device(dev1)
+
+        dev2 = StorageDevice(
+            "dev2",
+            fmt=get_format("swap"),
+            size=Size("1 GiB")
+        )
+        self._add_device(dev2)
+
+        self.assertEqual(self.interface.GetDevicesData([]), [])
+        self.assertEqual(self.interface.GetFormatsData([]), [])
+
+        self.assertEqual(
+            self.interface.GetDevicesData(["dev2", "dev1"]),
+            [self.interface.GetDeviceData("dev2"), self.interface.GetDeviceData("dev1")]
+        )
+        self.assertEqual(
+            self.interface.GetFormatsData(["dev2", "dev1"]),
+            [self.interface.GetFormatData("dev2"), self.interface.GetFormatData("dev1")]
+        )
+
+        with self.assertRaises(UnknownDeviceError):
+            self.interface.GetDevicesData(["dev1", "dev3"])
+
+        with self.assertRaises(UnknownDeviceError):
+            self.interface.GetFormatsData(["dev1", "dev3"])
+
+    def get_tree_snapshot_test(self):
+        """Test GetTreeSnapshot."""
+        self.assertEqual(self.interface.GetTreeSnapshot(), ([], []))
+
+        self._add_device(StorageDevice(
+            "dev1",
+            fmt=get_format("ext4", mountpoint="/"),
+            size=Size("10 GiB")
+        ))
+        self._add_device(StorageDevice(
+            "dev2",
+            fmt=get_format("swap"),
+            size=Size("1 GiB")
+        ))
+
+        devices_data, formats_data = self.interface.GetTreeSnapshot()
+        names = self.interface.GetDevices()
+
+        self.assertEqual(devices_data, self.interface.GetDevicesData(names))
+        self.assertEqual(formats_data, self.interface.GetFormatsData(names))
+
     def get_format_type_data_test(self):
         """Test GetFormatTypeData."""
         self.assertEqual(self.interface.GetFormatTypeData("swap"), {
@@ -812,6 +871,135 @@ class DeviceTreeInterfaceTestCase(unittest.TestCase):
         self.assertEqual(dev1.format.options, "defaults")
 
 
+class DeviceTreeIndexTestCase(unittest.TestCase):
+    """Test the index of the device tree."""
+
+    def setUp(self):
+        self.storage = create_storage()
+        self.devicetree = self.storage.devicetree
+        self.index = self.storage.device_index
+
+    def _add_device(self, device):
+        """Add a device to the device tree."""
+        self.devicetree._add_device(device)
+
+    def index_test(self):
+        """Test the index of the device tree."""
+        self.assertIs(self.index, self.storage.device_index)
+        self.assertIs(self.index.devicetree, self.devicetree)
+
+        self.assertIsNone(self.index.get_device_by_name(""))
+        self.assertIsNone(self.index.get_device_by_name("dev1"))
+        self.assertIsNone(self.index.get_device_by_path("/dev/dev1"))
+        self.assertIsNone(self.index.get_device_by_uuid("1234"))
+
+        dev1 = StorageDevice(
+            "dev1",
+            fmt=get_format("ext4", uuid="1234"),
+            size=Size("10 GiB"),
+            exists=True
+        )
+        self._add_device(dev1)
+
+        dev2 = LUKSDevice(
+            "dev2",
+            parents=[dev1],
+            fmt=get_format("ext4", uuid="5678"),
+            size=Size("10 GiB")
+        )
+        self._add_device(dev2)
+
+        self.assertIs(self.index.get_device_by_name("dev1"), dev1)
+        self.assertIs(self.index.get_device_by_name("dev2"), dev2)
+        self.assertIs(self.index.get_device_by_path("/dev/dev1"), dev1)
+        self.assertIs(self.index.get_device_by_path("/dev/mapper/dev2"), dev2)
+        self.assertIs(self.index.get_device_by_uuid("1234"), dev1)
+        self.assertIs(self.index.get_device_by_uuid("5678"), dev2)
+        self.assertTrue(self.index.contains(dev1))
+        self.assertTrue(self.index.contains(dev2))
+
+        # Remove the device.
+        self.devicetree._remove_device(dev2)
+
+        self.assertIsNone(self.index.get_device_by_name("dev2"))
+        self.assertIsNone(self.index.get_device_by_uuid("5678"))
+        self.assertFalse(self.index.contains(dev2))
+
+        # Hide the device.
+        self.devicetree.hide(dev1)
+
+        self.assertIsNone(self.index.get_device_by_name("dev1"))
+        self.assertIs(self.index.get_device_by_name("dev1", hidden=True), dev1)
+        self.assertIsNone(self.index.get_device_by_path("/dev/dev1"))
+        self.assertIs(self.index.get_device_by_path("/dev/dev1", hidden=True), dev1)
+        self.assertFalse(self.index.contains(dev1))
+        self.assertTrue(self.index.contains(dev1, hidden=True))
+
+    def rename_test(self):
+        """Test the index with a renamed device."""
+        dev1 = StorageDevice("dev1", fmt=get_format("ext4"), size=Size("10 GiB"))
+        self._add_device(dev1)
+
+        self.assertIs(self.index.get_device_by_name("dev1"), dev1)
+
+        # Blivet doesn't report the change.
+        dev1.name = "dev2"
+
+        self.assertIsNone(self.index.get_device_by_name("dev1"))
+        self.assertIs(self.index.get_device_by_name("dev2"), dev1)
+        self.assertIs(self.index.get_device_by_path("/dev/dev2"), dev1)
+
+    def change_uuid_test(self):
+        """Test the index with a changed UUID."""
+        dev1 = StorageDevice("dev1", fmt=get_format("ext4", uuid="1234"), size=Size("1 GiB"))
+        self._add_device(dev1)
+
+        self.assertIs(self.index.get_device_by_uuid("1234"), dev1)
+
+        # Blivet doesn't report the change.
+        dev1.format.uuid = "5678"
+
+        self.assertIsNone(self.index.get_device_by_uuid("1234"))
+        self.assertIs(self.index.get_device_by_uuid("5678"), dev1)
+
+    def replace_device_test(self):
+        """Test the index with a replaced device."""
+        dev1 = StorageDevice("dev1", fmt=get_format("ext4"), size=Size("1 GiB"))
+        self._add_device(dev1)
+        self.assertIs(self.index.get_device_by_name("dev1"), dev1)
+
+        # The number of devices doesn't change.
+        self.devicetree._remove_device(dev1)
+        dev2 = StorageDevice("dev1", fmt=get_format("ext4"), size=Size("1 GiB"))
+        self._add_device(dev2)
+
+        self.assertIs(self.index.get_device_by_name("dev1"), dev2)
+
+    def duplicate_uuid_test(self):
+        """Test the index with duplicate UUIDs."""
+        dev1 = StorageDevice("dev1", fmt=get_format("ext4", uuid="1234"), size=Size("1 GiB"))
+        self._add_device(dev1)
+
+        dev2 = StorageDevice("dev2", fmt=get_format("ext4", uuid="1234"), size=Size("1 GiB"))
+        self._add_device(dev2)
+
+        with self.assertRaises(DuplicateUUIDError):
+            self.index.get_device_by_uuid("1234")
+
+    def copy_test(self):
+        """Test the index of a copied storage."""
+        self._add_device(StorageDevice("dev1", fmt=get_format("ext4"), size=Size("1 GiB")))
+        self.assertIsNotNone(self.index.get_device_by_name("dev1"))
+
+        storage = self.storage.copy()
+        self.assertIsNot(storage.device_index, self.index)
+        device = storage.device_index.get_device_by_name("dev1")
+
+        self.assertIsNotNone(device)
+        self.assertIs(device, storage.devicetree.get_device_by_name("dev1"))
+        self.assertIsNot(device, self.index.get_device_by_name("dev1"))
+
+
 class DeviceTreeTasksTestCase(unittest.TestCase):
     """Test the storage tasks."""
 
@@ -820,6 +1008,34 @@ class DeviceTreeTasksTestCase(unittest.TestCase):
         task = FindExistingSystemsTask(storage.devicetree)
         self.assertEqual(task.run(), [])
 
+    def get_release_string_test(self):
+        with tempfile.TemporaryDirectory() as sysroot:
+            self.assertEqual(get_release_string(sysroot), (None, None, None))
+
+            os.makedirs(sysroot + "/usr/bin")
+            os.makedirs(sysroot + "/etc")
+
+            # A 64-bit little-endian ELF header for x86_64.
+            with open(sysroot + "/usr/bin/bash", "wb") as f:
+                f.write(b"\x7fELF\x02\x01\x01" + b"\x00" * 11 + b"\x3e\x00")
+
+            with open(sysroot + "/etc/os-release", "w") as f:
+                f.write('NAME="Fedora"\nVERSION_ID=32\n')
+
+            self.assertEqual(get_release_string(sysroot), ("x86_64", "Fedora", "32"))
+
+            # A 64-bit little-endian ELF header for ppc64le.
+            with open(sysroot + "/usr/bin/bash", "wb") as f:
+                f.write(b"\x7fELF\x02\x01\x01" + b"\x00" * 11 + b"\x15\x00")
+
+            with open(sysroot + "/etc/redhat-release", "w") as f:
+                f.write("Red Hat Enterprise Linux release 8.2 (Ootpa)\n")
+
+            self.assertEqual(
+                get_release_string(sysroot),
+                ("ppc64le", "Red Hat Enterprise Linux", "8.2")
+            )
+
     @patch('pyanaconda.modules.storage.devicetree.rescue.mount_existing_system')
     def mount_existing_system_test(self, mount):
         storage = create_storage()
@@ -842,3 +1058,145 @@ class DeviceTreeTasksTestCase(unittest.TestCase):
         task.run()
 
         storage.devicetree.populate.assert_called_once_with()
+
+
+class FindExistingInstallationsTestCase(unittest.TestCase):
+    """Test the search for existing installations."""
+
+    def setUp(self):
+        reset_installations_cache()
+        self.addCleanup(reset_installations_cache)
+
+        patcher = patch("pyanaconda.modules.storage.devicetree.root.blivet_util")
+        blivet_util = patcher.start()
+        blivet_util.umount.side_effect = self._umount
+        self.addCleanup(patcher.stop)
+
+        self.mountpoints = []
+
+    def _umount(self, mountpoint):
+        """Unmount the mount point."""
+        shutil.rmtree(mountpoint)
+        os.mkdir(mountpoint)
+
+    def _create_device(self, name, fstab=True, fmt_type="xfs", uuid=None):
+        """Create a device with a mountable format."""
+        device = Mock(direct=True, controllable=True, path="/dev/" + name)
+        device.name = name
+        device.format = Mock(type=fmt_type, uuid=uuid, linux_native=True, mountable=True,
+                             exists=True, options="defaults")
+
+        def mount(options, mountpoint):
+            self.mountpoints.append(mountpoint)
+
+            if fstab:
+                os.makedirs(mountpoint + "/etc")
+
+                with open(mountpoint + "/etc/fstab", "w") as f:
+                    f.write("/dev/{} / xfs defaults 0 0\n".format(name))
+
+        device.format.mount.side_effect = mount
+        return device
+
+    @patch("pyanaconda.modules.storage.devicetree.root._parse_fstab")
+    def find_installations_test(self, parse_fstab):
+        """Find installations with the pool of threads."""
+        parse_fstab.return_value = (["mount"], [])
+        devices = [self._create_device("dev{}".format(i)) for i in range(6)]
+        devicetree = Mock(devices=devices)
+
+        roots = find_existing_installations(devicetree)
+
+        self.assertEqual(len(roots), 6)
+        self.assertEqual(parse_fstab.call_count, 6)
+
+        # Every device is mounted at its own mount point.
+        self.assertEqual(len(self.mountpoints), 6)
+        self.assertEqual(len(set(self.mountpoints)), 6)
+        self.assertFalse(any(os.path.exists(p) for p in self.mountpoints))
+
+        for device in devices:
+            device.setup.assert_called_once_with()
+            device.teardown.assert_not_called()
+
+        devicetree.teardown_all.assert_called_once_with()
+
+    def find_installations_no_fstab_test(self):
+        """Find installations on a device without fstab."""
+        device = self._create_device("dev1", fstab=False)
+        devicetree = Mock(devices=[device])
+
+        self.assertEqual(find_existing_installations(devicetree, teardown_all=False), [])
+
+        device.format.mount.assert_called_once()
+        device.teardown.assert_called_once_with()
+        root_module.blivet_util.umount.assert_called_once_with(mountpoint=self.mountpoints[0])
+        self.assertFalse(os.path.exists(self.mountpoints[0]))
+
+    def get_cache_key_test(self):
+        """Get a key of a device in the cache."""
+        with tempfile.NamedTemporaryFile() as f:
+            # The superblock with the last mount time and the magic number.
+            superblock = bytearray(64)
+            superblock[44:48] = (42).to_bytes(4, "little")
+            superblock[56:58] = (0xEF53).to_bytes(2, "little")
+
+            f.write(bytes(1024) + superblock)
+            f.flush()
+
+            device = Mock(path=f.name)
+            device.format = Mock(type="ext4", uuid="1234")
+            self.assertEqual(root_module._get_cache_key(device), ("1234", 42))
+
+            device.format = Mock(type="ext4", uuid=None)
+            self.assertIsNone(root_module._get_cache_key(device))
+
+            device.format = Mock(type="xfs", uuid="1234")
+            self.assertIsNone(root_module._get_cache_key(device))
+
+            # A wrong magic number.
+            f.seek(1024 + 56)
+            f.write(bytes(2))
+            f.flush()
+
+            device.format = Mock(type="ext4", uuid="1234")
+            self.assertIsNone(root_module._get_cache_key(device))
+
+        device = Mock(path="/nonexistent/device")
+        device.format = Mock(type="ext4", uuid="1234")
+        self.assertIsNone(root_module._get_cache_key(device))
+
+    @patch("pyanaconda.modules.storage.devicetree.root._get_cache_key")
+    def probe_cached_device_test(self, get_cache_key):
+        """Probe a device with cached data."""
+        get_cache_key.return_value = ("1234", 42)
+        device = self._create_device("dev1", fmt_type="ext4", uuid="1234")
+
+        data = root_module._probe_device(device)
+        self.assertIsInstance(data, InstallationData)
+        device.format.mount.assert_called_once()
+
+        # The unchanged device is not mounted again.
+        device.reset_mock()
+        self.assertIs(root_module._probe_device(device), data)
+        device.setup.assert_not_called()
+        device.format.mount.assert_not_called()
+
+        # The device was mounted in the meantime.
+        get_cache_key.return_value = ("1234", 43)
+        self.assertIsNot(root_module._probe_device(device), data)
+        device.format.mount.assert_called_once()
+
+    def reset_installations_cache_test(self):
+        """Reset the cache of probed devices."""
+        cache = root_module._installations_cache
+        cache[("1234", 1)] = None
+        cache[("5678", 1)] = None
+
+        device = Mock()
+        device.format.uuid = "1234"
+        reset_installations_cache(Mock(devices=[device]))
+        self.assertEqual(list(cache), [("1234", 1)])
+
+        reset_installations_cache()
+        self.assertEqual(cache, {})
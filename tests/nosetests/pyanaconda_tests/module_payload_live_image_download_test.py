@@ -0,0 +1,195 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import re
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest.mock import patch
+
+import requests
+from requests.exceptions import RequestException
+
+from pyanaconda.modules.payloads.payload.live_image.download import ImageDownloader
+
+
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    """Serve an image from the memory of the server."""
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def _send_headers(self, code, length, content_range=None):
+        self.send_response(code)
+
+        if self.server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+
+        if self.server.content_length:
+            self.send_header("Content-Length", str(length))
+
+        if content_range:
+            self.send_header("Content-Range", content_range)
+
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._send_headers(200, len(self.server.data))
+
+    def do_GET(self):
+        data = self.server.data
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+
+        with self.server.lock:
+            self.server.requests.append(self.headers.get("Range"))
+
+        if match and self.server.accept_ranges:
+            start = int(match.group(1))
+            end = int(match.group(2) or len(data) - 1)
+            body = data[start:end + 1]
+            content_range = "bytes {}-{}/{}".format(start, end, len(data))
+            self._send_headers(206, len(body), content_range)
+        else:
+            body = data
+            self._send_headers(200, len(body))
+
+        with self.server.lock:
+            fail = self.server.failures > 0
+            self.server.failures -= int(fail)
+
+        if fail:
+            # Drop the connection in the middle of the body.
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+
+class ImageServer(ThreadingMixIn, HTTPServer):
+    """A local HTTP server with an image."""
+
+    daemon_threads = True
+
+    def __init__(self, data, accept_ranges=True, content_length=True, failures=0):
+        super().__init__(("127.0.0.1", 0), ImageRequestHandler)
+        self.data = data
+        self.accept_ranges = accept_ranges
+        self.content_length = content_length
+        self.failures = failures
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}/image.img".format(self.server_address[1])
+
+
+class ImageDownloaderTestCase(unittest.TestCase):
+    """Test the downloader of live images."""
+
+    def setUp(self):
+        for patcher in [
+            patch("pyanaconda.modules.payloads.payload.live_image.download.MIN_SEGMENT_SIZE",
+                  64 * 1024),
+            patch("pyanaconda.modules.payloads.payload.live_image.download.DOWNLOAD_CHUNK_SIZE",
+                  1024),
+            patch.object(ImageDownloader, "retry_delay", 0)
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.data = os.urandom(300 * 1024)
+        self.image = tempfile.NamedTemporaryFile()
+        self.session = requests.Session()
+
+    def tearDown(self):
+        self.image.close()
+        self.session.close()
+
+    def _download(self, server, **kwargs):
+        """Download the image from the server."""
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        try:
+            downloader = ImageDownloader(self.session, server.url, self.image.name, **kwargs)
+            progress = []
+            bytes_read = downloader.download(progress.append)
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.assertEqual(bytes_read, len(self.data))
+        self.assertEqual(progress[-1], len(self.data))
+
+        with open(self.image.name, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+        return downloader
+
+    def segmented_download_test(self):
+        """Test the download of segments."""
+        server = ImageServer(self.data)
+        downloader = self._download(server, segments=4)
+
+        self.assertEqual(downloader.size, len(self.data))
+        self.assertTrue(downloader.accept_ranges)
+        self.assertEqual(sorted(server.requests), [
+            "bytes=0-76799",
+            "bytes=153600-230399",
+            "bytes=230400-307199",
+            "bytes=76800-153599",
+        ])
+
+    def resumed_download_test(self):
+        """Test the download resumed after errors."""
+        server = ImageServer(self.data, failures=2)
+        self._download(server, segments=1)
+
+        # Every request continues from the last written byte.
+        offsets = [int(re.match(r"bytes=(\d+)-", r).group(1)) for r in server.requests]
+        self.assertEqual(len(offsets), 3)
+        self.assertTrue(0 == offsets[0] < offsets[1] < offsets[2])
+
+    def streamed_download_test(self):
+        """Test the download of an image without ranges and length."""
+        server = ImageServer(self.data, accept_ranges=False, content_length=False)
+        downloader = self._download(server, segments=4)
+
+        self.assertEqual(downloader.size, None)
+        self.assertFalse(downloader.accept_ranges)
+        self.assertEqual(server.requests, [None])
+
+    def restarted_download_test(self):
+        """Test the download restarted after an error."""
+        server = ImageServer(self.data, accept_ranges=False, failures=1)
+        self._download(server, segments=4)
+
+        self.assertEqual(server.requests, [None, None])
+
+    def failed_download_test(self):
+        """Test the download that fails too many times."""
+        server = ImageServer(self.data, failures=3)
+
+        with self.assertRaises(RequestException):
+            self._download(server, segments=1, retries=2)
@@ -17,6 +17,11 @@
 #
 # Red Hat Author(s): Jiri Konecny <jkonecny@redhat.com>
 #
+import hashlib
+import io
+import os
+import tarfile
+import tempfile
 import unittest
 
 from unittest.mock import Mock, patch
@@ -41,7 +46,10 @@ from pyanaconda.modules.payloads.payload.live_image.live_image_interface import
 from pyanaconda.modules.payloads.payload.live_image.initialization import \
     CheckInstallationSourceImageTask, SetupInstallationSourceImageTask, \
     TeardownInstallationSourceImageTask
-from pyanaconda.modules.payloads.payload.live_image.installation import InstallFromTarTask
+from pyanaconda.modules.common.errors.payload import InstallError
+from pyanaconda.modules.payloads.payload.live_image.installation import InstallFromTarTask, \
+    DownloadAndInstallFromTarTask, install_from_tar_stream
+from pyanaconda.modules.payloads.payload.live_image.utils import get_tar_compression_option
 
 
 class LiveImageKSTestCase(unittest.TestCase):
@@ -238,6 +246,16 @@ class LiveImageInterfaceTestCase(unittest.TestCase):
 
         check_task_creation_list(self, task_path, publisher, [InstallFromTarTask])
 
+    @patch("pyanaconda.modules.payloads.payload.live_image.live_image.url_target_is_streamed",
+           lambda x: True)
+    @patch_dbus_publish_object
+    def install_with_task_from_stream_test(self, publisher):
+        """Test Live Image install with tasks from a streamed tarfile."""
+        self.assertEqual(self.live_image_interface.PreInstallWithTasks(), [])
+        task_path = self.live_image_interface.InstallWithTasks()
+
+        check_task_creation_list(self, task_path, publisher, [DownloadAndInstallFromTarTask])
+
     @patch("pyanaconda.modules.payloads.payload.live_image.live_image.url_target_is_tarfile",
            lambda x: False)
     @patch_dbus_publish_object
@@ -275,3 +293,117 @@ class LiveImageInterfaceTestCase(unittest.TestCase):
         task_path = self.live_image_interface.TeardownWithTask()
 
         check_task_creation(self, task_path, publisher, TeardownInstallationSourceImageTask)
+
+
+class TarStreamTestCase(unittest.TestCase):
+    """Test the installation from a streamed tarball."""
+
+    def _create_tarball(self):
+        """Create a compressed tarball with a fake system."""
+        data = io.BytesIO()
+
+        with tarfile.open(fileobj=data, mode="w:gz") as archive:
+            for name in ["boot/vmlinuz-5.6.10", "boot/vmlinuz-5.6.9", "etc/hostname"]:
+                info = tarfile.TarInfo(name)
+                info.size = len(name)
+                archive.addfile(info, io.BytesIO(name.encode()))
+
+        return data.getvalue()
+
+    def _get_chunks(self, data, size=1000):
+        """Split the data into chunks."""
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    def compression_option_test(self):
+        """Test the tar option for decompression of streams."""
+        self.assertEqual(get_tar_compression_option("http://a/b.tar"), None)
+        self.assertEqual(get_tar_compression_option("http://a/b.tar.gz"), "--gzip")
+        self.assertEqual(get_tar_compression_option("http://a/b.tgz"), "--gzip")
+        self.assertEqual(get_tar_compression_option("http://a/b.tar.bz2"), "--bzip2")
+        self.assertEqual(get_tar_compression_option("http://a/b.txz"), "--xz")
+
+    def install_from_tar_stream_test(self):
+        """Test the extraction of a streamed tarball."""
+        data = self._create_tarball()
+
+        with tempfile.TemporaryDirectory() as dest_path:
+            kernels = install_from_tar_stream(self._get_chunks(data), dest_path, "--gzip")
+
+            self.assertEqual(kernels, ["5.6.9", "5.6.10"])
+
+            with open(os.path.join(dest_path, "etc/hostname")) as f:
+                self.assertEqual(f.read(), "etc/hostname")
+
+    def install_from_broken_tar_stream_test(self):
+        """Test the extraction of a broken stream."""
+        data = b"x" * 1024 * 1024 * 8
+
+        with tempfile.TemporaryDirectory() as dest_path:
+            with self.assertRaises(InstallError):
+                install_from_tar_stream(self._get_chunks(data, 65536), dest_path, "--gzip")
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.installation.startProgram")
+    def install_from_tar_stream_failed_test(self, start_program):
+        """Test the extraction of a stream if tar can't be started."""
+        start_program.side_effect = OSError("No such file or directory: 'tar'")
+
+        with tempfile.TemporaryDirectory() as dest_path:
+            with self.assertRaises(InstallError) as cm:
+                install_from_tar_stream(self._get_chunks(b"x" * 10), dest_path)
+
+        self.assertEqual(str(cm.exception), "No such file or directory: 'tar'")
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.installation.create_rescue_image")
+    def download_and_install_task_test(self, create_rescue_image):
+        """Test the task that downloads and installs a tarball in one pass."""
+        data = self._create_tarball()
+        checksum = hashlib.sha256(data).hexdigest()
+
+        response = Mock()
+        response.headers = {"content-length": str(len(data))}
+        response.iter_content.return_value = self._get_chunks(data)
+
+        session = Mock()
+        session.get.return_value = response
+
+        with tempfile.TemporaryDirectory() as dest_path:
+            task = DownloadAndInstallFromTarTask(
+                "http://my/image.tar.gz", "", checksum.upper(), False, dest_path, session
+            )
+            self.assertEqual(task.run(), ["5.6.9", "5.6.10"])
+            create_rescue_image.assert_called_once_with(dest_path, ["5.6.9", "5.6.10"])
+            self.assertTrue(os.path.exists(os.path.join(dest_path, "etc/hostname")))
+
+        create_rescue_image.reset_mock()
+        response.iter_content.return_value = self._get_chunks(data)
+
+        with tempfile.TemporaryDirectory() as dest_path:
+            task = DownloadAndInstallFromTarTask(
+                "http://my/image.tar.gz", "", "invalid", False, dest_path, session
+            )
+            with self.assertRaises(InstallError):
+                task.run()
+
+            create_rescue_image.assert_not_called()
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.installation.startProgram")
+    @patch("pyanaconda.modules.payloads.payload.live_image.installation.create_rescue_image")
+    def download_and_install_task_failed_test(self, create_rescue_image, start_program):
+        """Test the task that downloads and installs a tarball with a missing tar."""
+        start_program.side_effect = OSError("No such file or directory: 'tar'")
+
+        response = Mock()
+        response.headers = {}
+        response.iter_content.return_value = [b"x"]
+
+        session = Mock()
+        session.get.return_value = response
+
+        with tempfile.TemporaryDirectory() as dest_path:
+            task = DownloadAndInstallFromTarTask(
+                "http://my/image.tar", "", None, False, dest_path, session
+            )
+            with self.assertRaises(InstallError):
+                task.run()
+
+        create_rescue_image.assert_not_called()
@@ -29,6 +29,7 @@ from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.modules.common.errors.payload import InstallError
 from pyanaconda.modules.payloads.base.initialization import UpdateBLSConfigurationTask
 from pyanaconda.modules.payloads.base.installation import InstallFromImageTask
+from pyanaconda.modules.payloads.base.tree_copy import IMAGE_EXCLUDE_PATTERNS
 from pyanaconda.modules.payloads.base.utils import create_rescue_image, get_kernel_version_list
 
 
@@ -200,6 +201,32 @@ class LiveTasksTestCase(unittest.TestCase):
         exec_with_redirect.assert_called_once_with("rsync", expected_rsync_args)
         create_rescue_image_mock.assert_called_once_with(dest_path, kernel_version_list)
 
+    @patch("pyanaconda.modules.payloads.base.installation.create_rescue_image")
+    @patch("pyanaconda.modules.payloads.base.installation.execWithRedirect")
+    @patch("pyanaconda.modules.payloads.base.installation.TreeCopier")
+    @patch("pyanaconda.modules.payloads.base.installation.conf")
+    def install_image_task_native_copy_test(self, conf_mock, copier_cls, exec_with_redirect,
+                                            create_rescue_image_mock):
+        """Test installation from an image task with the native copy engine."""
+        dest_path = "/destination/path"
+        kernel_version_list = ["kernel-v1.fc2000.x86_64", "kernel-sad-kernel"]
+        conf_mock.payload.native_image_copy = True
+
+        InstallFromImageTask(dest_path, kernel_version_list, Mock()).run()
+
+        copier_cls.assert_called_once_with(INSTALL_TREE, dest_path, IMAGE_EXCLUDE_PATTERNS)
+        copier_cls.return_value.copy.assert_called_once()
+        exec_with_redirect.assert_not_called()
+        create_rescue_image_mock.assert_called_once_with(dest_path, kernel_version_list)
+
+        copier_cls.return_value.copy.side_effect = OSError("mock exception")
+        create_rescue_image_mock.reset_mock()
+
+        with self.assertRaises(InstallError):
+            InstallFromImageTask(dest_path, kernel_version_list, Mock()).run()
+
+        create_rescue_image_mock.assert_not_called()
+
     @patch("pyanaconda.modules.payloads.base.installation.create_rescue_image")
     @patch("pyanaconda.modules.payloads.base.installation.execWithRedirect")
     def install_image_task_source_unready_test(self, exec_with_redirect, create_rescue_image_mock):
@@ -0,0 +1,132 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import stat
+import unittest
+from tempfile import TemporaryDirectory
+
+from pyanaconda.modules.payloads.base.tree_copy import TreeCopier, IMAGE_EXCLUDE_PATTERNS
+
+
+class TreeCopierTestCase(unittest.TestCase):
+    """Test the native copy engine."""
+
+    def _write(self, path, content, mode=0o644):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "w") as f:
+            f.write(content)
+
+        os.chmod(path, mode)
+
+    def _create_tree(self, root):
+        """Create a fake system tree."""
+        self._write(root + "/etc/hostname", "localhost")
+        self._write(root + "/etc/machine-id", "12345")
+        self._write(root + "/usr/bin/tool", "x" * 100000, 0o4755)
+        self._write(root + "/boot/vmlinuz-5.6.9", "kernel")
+        self._write(root + "/boot/vmlinuz-0-rescue-12345", "rescue")
+        self._write(root + "/boot/loader/entries/kernel.conf", "entry")
+        self._write(root + "/tmp/trash", "trash")
+        self._write(root + "/dev/null", "null")
+        self._write(root + "/var/devices/file", "file")
+
+        os.link(root + "/usr/bin/tool", root + "/usr/bin/tool-link")
+        os.symlink("../bin/tool", root + "/usr/bin/tool-symlink")
+        os.mkfifo(root + "/var/fifo")
+        os.makedirs(root + "/proc")
+        os.chmod(root + "/usr/bin", 0o700)
+        os.utime(root + "/etc/hostname", ns=(1000000000, 2000000000))
+        os.utime(root + "/usr", ns=(3000000000, 4000000000))
+
+    def copy_tree_test(self):
+        """Test the copying of a tree."""
+        with TemporaryDirectory() as source, TemporaryDirectory() as dest:
+            self._create_tree(source)
+            progress = []
+
+            copier = TreeCopier(source, dest, IMAGE_EXCLUDE_PATTERNS, workers=2)
+            copier.copy(lambda *args: progress.append(args))
+
+            # Check the copied and the excluded files.
+            files = []
+            for root, dirs, names in os.walk(dest):
+                files.extend(os.path.relpath(os.path.join(root, n), dest) for n in dirs + names)
+
+            self.assertEqual(sorted(files), [
+                "boot",
+                "boot/vmlinuz-5.6.9",
+                "etc",
+                "etc/hostname",
+                "tmp",
+                "usr",
+                "usr/bin",
+                "usr/bin/tool",
+                "usr/bin/tool-link",
+                "usr/bin/tool-symlink",
+                "var",
+                "var/devices",
+                "var/devices/file",
+                "var/fifo",
+            ])
+
+            # Check the progress.
+            size = 100000 + len("localhost") + len("kernel") + len("file")
+            self.assertEqual(copier.total_size, size)
+            self.assertEqual(progress[-1], (size, size))
+
+            # Check the content and the metadata.
+            with open(dest + "/usr/bin/tool") as f:
+                self.assertEqual(f.read(), "x" * 100000)
+
+            tool = os.lstat(dest + "/usr/bin/tool")
+            self.assertEqual(stat.S_IMODE(tool.st_mode), 0o4755)
+            self.assertEqual(tool.st_ino, os.lstat(dest + "/usr/bin/tool-link").st_ino)
+            self.assertEqual(os.readlink(dest + "/usr/bin/tool-symlink"), "../bin/tool")
+            self.assertTrue(stat.S_ISFIFO(os.lstat(dest + "/var/fifo").st_mode))
+            self.assertEqual(stat.S_IMODE(os.lstat(dest + "/usr/bin").st_mode), 0o700)
+            self.assertEqual(os.lstat(dest + "/etc/hostname").st_mtime_ns, 2000000000)
+            self.assertEqual(os.lstat(dest + "/usr").st_mtime_ns, 4000000000)
+
+    def copy_xattrs_test(self):
+        """Test the copying of extended attributes."""
+        with TemporaryDirectory() as source, TemporaryDirectory() as dest:
+            self._write(source + "/file", "content")
+
+            try:
+                os.setxattr(source + "/file", "user.test", b"value")
+            except OSError:
+                self.skipTest("Extended attributes are not supported.")
+
+            TreeCopier(source, dest).copy()
+            self.assertEqual(os.getxattr(dest + "/file", "user.test"), b"value")
+
+    def replace_files_test(self):
+        """Test the copying to a non-empty destination."""
+        with TemporaryDirectory() as source, TemporaryDirectory() as dest:
+            self._write(source + "/etc/file", "new")
+            self._write(dest + "/etc/file", "old content")
+            os.symlink("file", dest + "/etc/link")
+            self._write(source + "/etc/link", "link")
+
+            TreeCopier(source, dest).copy()
+
+            with open(dest + "/etc/file") as f:
+                self.assertEqual(f.read(), "new")
+
+            self.assertFalse(os.path.islink(dest + "/etc/link"))
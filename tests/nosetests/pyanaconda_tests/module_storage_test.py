@@ -1476,7 +1476,7 @@ class StorageTasksTestCase(unittest.TestCase):
         core_run_program.assert_any_call(
                 ['mount', '--rbind', '/mnt/sysimage', '/mnt/sysroot'],
                 stdin=None, stdout=None, root='/', env_prune=None,
-                log_output=True, binary_output=False)
+                log_output=True, binary_output=False, capture_output=False)
 
     @patch_dbus_get_proxy
     @patch("pyanaconda.modules.storage.installation.conf")
@@ -0,0 +1,157 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import pyanaconda
+from pyanaconda.modules.zygote import client
+from pyanaconda.modules.zygote.zygote import ModuleZygote, ZygoteError, spawn_module
+
+TEST_MODULE = """
+import os
+import sys
+
+with open(os.environ["ZYGOTE_TEST_OUTPUT"], "w") as f:
+    f.write("{} {}".format(os.getpid(), sys.argv[0]))
+"""
+
+
+class ModuleZygoteTestCase(unittest.TestCase):
+    """Test the zygote of DBus modules."""
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._socket_path = os.path.join(self._tmp_dir.name, "zygote.socket")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _send_request(self, zygote, request):
+        """Send a request to the zygote and return the reply."""
+        client, server = socket.socketpair()
+
+        with client, server:
+            client.sendall(json.dumps(request).encode() + b"\n")
+            zygote._handle_request(server)
+
+            with client.makefile("r") as f:
+                return json.loads(f.readline())
+
+    def spawn_unavailable_test(self):
+        """Spawn a module without the zygote."""
+        with self.assertRaises(ZygoteError):
+            spawn_module("pyanaconda.modules.timezone", socket_path=self._socket_path)
+
+    def client_imports_test(self):
+        """Check the modules imported by the client."""
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys; import pyanaconda.modules.zygote.client; "
+             "print(' '.join(sys.modules))"],
+            stdout=subprocess.PIPE,
+            env={"PYTHONPATH": os.path.dirname(os.path.dirname(pyanaconda.__file__))},
+            check=True
+        )
+        modules = result.stdout.decode().split()
+
+        self.assertNotIn("pyanaconda.core.constants", modules)
+        self.assertNotIn("pyanaconda.anaconda_loggers", modules)
+        self.assertNotIn("argparse", modules)
+
+    def client_main_test(self):
+        """Run the client without the zygote."""
+        self.assertEqual(client.main([]), 2)
+        self.assertEqual(client.main([self._socket_path, "pyanaconda.modules.timezone"]), 1)
+
+    def create_socket_test(self):
+        """Create the socket of the zygote."""
+        zygote = ModuleZygote(socket_path=self._socket_path)
+        server = zygote._create_socket()
+
+        with server:
+            self.assertTrue(os.path.exists(self._socket_path))
+            self.assertEqual(os.listdir(self._tmp_dir.name), ["zygote.socket"])
+
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(self._socket_path)
+
+    @patch.object(ModuleZygote, "_spawn_module", return_value=42)
+    def handle_request_test(self, spawn_module_mock):
+        """Handle a request of a client."""
+        zygote = ModuleZygote(socket_path=self._socket_path)
+
+        request = {"module": "pyanaconda.modules.timezone", "environment": {"A": "B"}}
+        reply = self._send_request(zygote, request)
+        self.assertEqual(reply, {"pid": 42})
+
+        spawn_module_mock.assert_called_once()
+        _connection, module_name, environment = spawn_module_mock.call_args[0]
+        self.assertEqual(module_name, "pyanaconda.modules.timezone")
+        self.assertEqual(environment, {"A": "B"})
+
+    @patch.object(ModuleZygote, "_spawn_module", return_value=42)
+    def handle_invalid_request_test(self, spawn_module_mock):
+        """Handle an invalid request of a client."""
+        zygote = ModuleZygote(socket_path=self._socket_path)
+
+        reply = self._send_request(zygote, {"module": "a; rm -rf", "environment": {}})
+        self.assertIn("error", reply)
+
+        reply = self._send_request(zygote, {"environment": {}})
+        self.assertIn("error", reply)
+
+        spawn_module_mock.assert_not_called()
+
+    def spawn_module_test(self):
+        """Fork a module from the zygote."""
+        module_path = os.path.join(self._tmp_dir.name, "zygote_test_module.py")
+        output_path = os.path.join(self._tmp_dir.name, "output")
+
+        with open(module_path, "w") as f:
+            f.write(TEST_MODULE)
+
+        zygote = ModuleZygote(socket_path=self._socket_path)
+        zygote._socket = Mock()
+
+        sys.path.insert(0, self._tmp_dir.name)
+
+        try:
+            environment = {"ZYGOTE_TEST_OUTPUT": output_path}
+            pid = zygote._spawn_module(Mock(), "zygote_test_module", environment)
+        finally:
+            sys.path.remove(self._tmp_dir.name)
+
+        for _i in range(100):
+            if os.path.exists(output_path) and os.path.getsize(output_path):
+                break
+
+            time.sleep(0.05)
+
+        with open(output_path) as f:
+            self.assertEqual(f.read(), "{} {}".format(pid, module_path))
+
+        # The zygote is not the parent of the module.
+        with self.assertRaises(ChildProcessError):
+            os.waitpid(pid, os.WNOHANG)
@@ -23,12 +23,14 @@ import tempfile
 import os
 import hashlib
 import shutil
+import threading
+import dnf.exceptions
 import gi
 
 import pyanaconda.core.payload as util
 
 from tempfile import TemporaryDirectory
-from unittest.mock import patch, Mock, call
+from unittest.mock import patch, Mock, PropertyMock, call
 
 from blivet.size import Size
 
@@ -36,7 +38,9 @@ from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.modules.common.structures.requirement import Requirement
 from pyanaconda.payload.dnf import utils
 from pyanaconda.payload.flatpak import FlatpakPayload
-from pyanaconda.payload.dnf.repomd import RepoMDMetaHash
+from pyanaconda.payload.dnf.comps_index import CompsIndex
+from pyanaconda.payload.dnf.metadata_cache import MetadataCache
+from pyanaconda.payload.dnf.repomd import RepoMDMetaHash, calculate_repomd_hash
 from pyanaconda.payload.requirement import PayloadRequirements
 from pyanaconda.payload.errors import PayloadRequirementsMissingApply
 
@@ -98,6 +102,258 @@ class PickLocation(unittest.TestCase):
         self.assertEqual(mpoint, None)
 
 
+class SpaceEstimatorTestCase(unittest.TestCase):
+
+    def _create_transaction(self, *packages):
+        transaction = []
+
+        for name, installsize, files in packages:
+            pkg = Mock(repoid="fedora", installsize=installsize)
+            pkg.__str__ = Mock(return_value=name)
+            type(pkg).files = files
+            transaction.append(Mock(pkg=pkg))
+
+        return transaction
+
+    def install_space_test(self):
+        """Test the estimation of the install space."""
+        files = PropertyMock(return_value=["/a", "/b"])
+        transaction = self._create_transaction(
+            ("a", 1000, files),
+            ("b", 2000, files),
+        )
+
+        estimator = utils.SpaceEstimator()
+        size = estimator.get_install_space(1, transaction)
+
+        expected = (Size(3000) + 4 * utils.BONUS_SIZE_ON_FILE) * 1.1
+        self.assertEqual(size, expected)
+        self.assertEqual(files.call_count, 2)
+
+        # The estimation is cached for the transaction.
+        self.assertEqual(estimator.get_install_space(1, transaction), expected)
+        self.assertEqual(files.call_count, 2)
+
+        # The file counts are cached for the packages.
+        self.assertEqual(estimator.get_install_space(2, transaction), expected)
+        self.assertEqual(files.call_count, 2)
+
+        # The cache can be dropped.
+        estimator.reset()
+        self.assertEqual(estimator.get_install_space(2, transaction), expected)
+        self.assertEqual(files.call_count, 4)
+
+    @patch("pyanaconda.payload.dnf.utils.get_mount_layout")
+    @patch("pyanaconda.payload.dnf.utils.get_df_map")
+    def df_map_test(self, get_df_map, get_mount_layout):
+        """Test the cache of the df map."""
+        get_df_map.return_value = {"/": Size("1 GiB")}
+        get_mount_layout.return_value = "layout 1"
+
+        estimator = utils.SpaceEstimator()
+        self.assertEqual(estimator.get_df_map(), {"/": Size("1 GiB")})
+        self.assertEqual(estimator.get_df_map(), {"/": Size("1 GiB")})
+        self.assertEqual(get_df_map.call_count, 1)
+
+        get_mount_layout.return_value = "layout 2"
+        self.assertEqual(estimator.get_df_map(), {"/": Size("1 GiB")})
+        self.assertEqual(get_df_map.call_count, 2)
+
+
+class SplitInstallSetTestCase(unittest.TestCase):
+
+    def _get_index(self, batches, package):
+        for index, batch in enumerate(batches):
+            if package in batch:
+                return index
+
+        return None
+
+    def _check_batches(self, packages, dependencies, batches):
+        # Every package is installed exactly once.
+        self.assertEqual(sorted(sum(batches, [])), sorted(packages))
+
+        # Dependencies are never installed later.
+        for package, required in dependencies.items():
+            for dependency in required:
+                self.assertLessEqual(
+                    self._get_index(batches, dependency),
+                    self._get_index(batches, package)
+                )
+
+    def split_empty_test(self):
+        """Test the split of an empty install set."""
+        self.assertEqual(utils.split_install_set([], lambda p: set()), [])
+
+    def split_chain_test(self):
+        """Test the split of a chain of dependencies."""
+        packages = ["a", "b", "c", "d"]
+        dependencies = {"a": {"b"}, "b": {"c"}, "c": {"d"}, "d": set()}
+
+        batches = utils.split_install_set(packages, dependencies.get, batch_size=1)
+        self.assertEqual(batches, [["d"], ["c"], ["b"], ["a"]])
+
+        batches = utils.split_install_set(packages, dependencies.get, batch_size=3)
+        self.assertEqual(batches, [["d", "c", "b"], ["a"]])
+
+    def split_cycle_test(self):
+        """Test the split of cyclic dependencies."""
+        packages = ["bash", "glibc", "filesystem", "setup", "vim", "coreutils"]
+        dependencies = {
+            "bash": {"glibc", "filesystem"},
+            "glibc": {"bash", "filesystem"},
+            "filesystem": {"setup"},
+            "setup": {"filesystem"},
+            "vim": {"glibc", "coreutils"},
+            "coreutils": {"glibc"},
+        }
+
+        batches = utils.split_install_set(packages, dependencies.get, batch_size=1)
+        self._check_batches(packages, dependencies, batches)
+        self.assertEqual(len(batches), 4)
+        self.assertEqual(sorted(batches[0]), ["filesystem", "setup"])
+        self.assertEqual(sorted(batches[1]), ["bash", "glibc"])
+
+    def split_independent_test(self):
+        """Test the split of independent packages."""
+        packages = ["p{}".format(i) for i in range(10)]
+        dependencies = {p: set() for p in packages}
+
+        batches = utils.split_install_set(packages, dependencies.get, batch_size=4)
+        self._check_batches(packages, dependencies, batches)
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+
+
+class LoadRepositoriesMetadataTestCase(unittest.TestCase):
+
+    def _create_repo(self, repo_id, load=None):
+        repo = Mock(id=repo_id)
+        repo.load.side_effect = load
+        return repo
+
+    def load_metadata_test(self):
+        """Test the concurrent loading of metadata."""
+        repos = [self._create_repo("repo-{}".format(i)) for i in range(10)]
+        results = utils.load_repositories_metadata(repos, max_workers=3)
+
+        self.assertEqual([r.repo for r in results], repos)
+        self.assertTrue(all(r.error is None for r in results))
+
+        for repo in repos:
+            repo.load.assert_called_once_with()
+
+    def load_metadata_prepare_test(self):
+        """Test the preparation of repositories in the workers."""
+        repos = [self._create_repo("repo-{}".format(i)) for i in range(4)]
+        prepared = []
+
+        def prepare(repo):
+            repo.load.assert_not_called()
+            prepared.append(repo)
+
+        utils.load_repositories_metadata(repos, max_workers=2, prepare=prepare)
+        self.assertEqual(sorted(r.id for r in prepared), [r.id for r in repos])
+
+    def load_metadata_failed_test(self):
+        """Test the loading of metadata with a failure."""
+        error = dnf.exceptions.RepoError("Fake error!")
+        repos = [
+            self._create_repo("a"),
+            self._create_repo("b", load=error),
+            self._create_repo("c"),
+        ]
+        results = utils.load_repositories_metadata(repos)
+
+        self.assertEqual([r.error for r in results], [None, error, None])
+
+    def load_metadata_slow_test(self):
+        """Test the loading of metadata with a slow repository."""
+        event = threading.Event()
+
+        def load_slow():
+            event.wait(10)
+
+        repos = [
+            self._create_repo("slow", load=load_slow),
+            self._create_repo("fast", load=event.set),
+        ]
+
+        results = utils.load_repositories_metadata(repos, max_workers=2)
+
+        # The slow repository is waited for.
+        self.assertTrue(event.is_set())
+        self.assertEqual([r.error for r in results], [None, None])
+        self.assertEqual([r.repo for r in results], repos)
+
+
+class CompsIndexTestCase(unittest.TestCase):
+
+    def _create_comps(self):
+        comps = Mock()
+
+        minimal = Mock(id="minimal-environment", ui_name="Minimal Install")
+        minimal.name = "Minimal Install"
+        minimal.option_ids = [
+            Mock(default=True),
+            Mock(default=False),
+        ]
+        minimal.option_ids[0].name = "standard"
+        minimal.option_ids[1].name = "guest-agents"
+
+        server = Mock(id="server-product-environment", ui_name="Fedora Server Edition")
+        server.name = "Fedora Server Edition"
+        server.option_ids = []
+
+        comps.environments = [minimal, server]
+
+        groups = []
+        for group_id, visible in (("standard", True), ("guest-agents", True), ("core", False)):
+            grp = Mock(id=group_id, ui_name=group_id.title(), visible=visible)
+            grp.name = group_id.title()
+            groups.append(grp)
+
+        comps.groups_iter.return_value = iter(groups)
+        comps.environment_by_pattern.return_value = None
+        comps.group_by_pattern.return_value = None
+        return comps
+
+    def environments_test(self):
+        """Test the environments in the comps index."""
+        comps = self._create_comps()
+        index = CompsIndex(comps)
+
+        self.assertEqual(index.environments, ["minimal-environment", "server-product-environment"])
+        self.assertEqual(index.get_environment("minimal-environment").id, "minimal-environment")
+        self.assertEqual(index.get_environment("Minimal Install").id, "minimal-environment")
+        self.assertEqual(index.get_environment("MINIMAL-environment").id, "minimal-environment")
+        comps.environment_by_pattern.assert_not_called()
+
+        self.assertEqual(index.get_environment("unknown"), None)
+        comps.environment_by_pattern.assert_called_once_with("unknown")
+
+        self.assertEqual(index.get_options("minimal-environment"),
+                         {"standard": True, "guest-agents": False})
+        self.assertEqual(index.get_options("server-product-environment"), {})
+        self.assertEqual(index.get_options("unknown"), {})
+
+    def groups_test(self):
+        """Test the groups in the comps index."""
+        comps = self._create_comps()
+        index = CompsIndex(comps)
+
+        self.assertEqual(index.groups, ["standard", "guest-agents", "core"])
+        self.assertEqual(index.get_group("core").id, "core")
+        self.assertEqual(index.get_group("Guest-Agents").id, "guest-agents")
+        comps.group_by_pattern.assert_not_called()
+
+        self.assertEqual(index.get_group("unknown"), None)
+        comps.group_by_pattern.assert_called_once_with("unknown")
+
+        self.assertTrue(index.is_group_visible("standard"))
+        self.assertFalse(index.is_group_visible("core"))
+        self.assertFalse(index.is_group_visible("unknown"))
+
+
 class DummyRepo(object):
     def __init__(self):
         self.id = "anaconda"
@@ -153,6 +409,109 @@ or it should be. Nah it's just a test!
         self.assertFalse(r.verify_repoMD())
 
 
+class MetadataCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._cache_dir = tempfile.mkdtemp(suffix="pyanaconda_tests")
+        self._dnf_cache_dir = tempfile.mkdtemp(suffix="pyanaconda_tests")
+
+    def tearDown(self):
+        shutil.rmtree(self._cache_dir)
+        shutil.rmtree(self._dnf_cache_dir)
+
+    def _get_repo_cache_dir(self, repo_id):
+        # The first 16 digits of the SHA-256 checksum of the base url.
+        return os.path.join(self._dnf_cache_dir, repo_id + "-feb76ba5dfa55edb")
+
+    def _create_repo(self, repo_id, repomd):
+        repo = Mock(id=repo_id, baseurl=["http://my/repo"], mirrorlist=None, metalink=None)
+        repo_cache_dir = self._get_repo_cache_dir(repo_id)
+
+        os.makedirs(os.path.join(repo_cache_dir, "repodata"))
+
+        with open(os.path.join(repo_cache_dir, "repodata", "repomd.xml"), "w") as f:
+            f.write(repomd)
+
+        with open(os.path.join(repo_cache_dir, "repodata", "primary.xml.gz"), "w") as f:
+            f.write("primary")
+
+        with open(os.path.join(self._dnf_cache_dir, repo_id + ".solv"), "w") as f:
+            f.write("solv")
+
+        return repo
+
+    def _create_cache(self, max_age=1000, max_size=10000):
+        return MetadataCache(self._cache_dir, self._dnf_cache_dir, max_age, max_size)
+
+    def store_and_restore_test(self):
+        """Test the store and the restore of the metadata cache."""
+        repo = self._create_repo("fedora", "repomd")
+        key = calculate_repomd_hash("repomd").hex()
+
+        cache = self._create_cache()
+        cache.store([repo])
+
+        entry = os.path.join(self._cache_dir, key)
+        self.assertEqual(os.listdir(self._cache_dir), [key])
+        self.assertTrue(os.path.exists(os.path.join(entry, "solv", ".solv")))
+
+        # Remove the DNF cache and restore it from the metadata cache.
+        shutil.rmtree(self._dnf_cache_dir)
+        os.mkdir(self._dnf_cache_dir)
+
+        with patch.object(MetadataCache, "_get_remote_key", return_value=key):
+            cache.restore(repo)
+
+        repo_cache_dir = self._get_repo_cache_dir("fedora")
+        self.assertTrue(os.path.exists(os.path.join(repo_cache_dir, "repodata", "repomd.xml")))
+        self.assertTrue(os.path.exists(os.path.join(self._dnf_cache_dir, "fedora.solv")))
+
+    def restore_miss_test(self):
+        """Test the restore of an unknown repository."""
+        repo = self._create_repo("fedora", "repomd")
+        cache = self._create_cache()
+
+        with patch.object(MetadataCache, "_get_remote_key", return_value="unknown"):
+            cache.restore(repo)
+
+        with patch.object(MetadataCache, "_get_remote_key", return_value=None):
+            cache.restore(repo)
+
+        self.assertEqual(os.listdir(self._cache_dir), [])
+
+    def repo_cache_dir_test(self):
+        """Test the path to the DNF cache directory of a repository."""
+        cache = self._create_cache()
+
+        repo = Mock(id="fedora", baseurl=["http://my/repo"], mirrorlist=None, metalink=None)
+        self.assertEqual(cache._get_repo_cache_dir(repo), self._get_repo_cache_dir("fedora"))
+
+        repo = Mock(id="fedora", baseurl=[], mirrorlist="http://my/repo", metalink=None)
+        self.assertEqual(cache._get_repo_cache_dir(repo), self._get_repo_cache_dir("fedora"))
+
+        repo = Mock(id="fedora", baseurl=[], mirrorlist=None, metalink=None)
+        self.assertNotEqual(cache._get_repo_cache_dir(repo), self._get_repo_cache_dir("fedora"))
+
+    def evict_test(self):
+        """Test the eviction of the metadata cache."""
+        cache = self._create_cache(max_size=10)
+        cache.store([self._create_repo("a", "repomd-a")])
+
+        # The cache is too big.
+        self.assertEqual(os.listdir(self._cache_dir), [])
+
+        cache = self._create_cache(max_age=-1)
+        cache.store([self._create_repo("b", "repomd-b")])
+
+        # The entry is too old.
+        self.assertEqual(os.listdir(self._cache_dir), [])
+
+        cache = self._create_cache()
+        cache.store([self._create_repo("c", "repomd-c")])
+
+        self.assertEqual(len(os.listdir(self._cache_dir)), 1)
+
+
 class PayloadRequirementsTestCase(unittest.TestCase):
 
     def requirements_test(self):
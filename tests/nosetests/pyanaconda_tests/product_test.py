@@ -443,6 +443,52 @@ class ProductConfigurationTestCase(unittest.TestCase):
             self.assertFalse(self._loader.check_product("My Product 2"))
             self.assertFalse(self._loader.check_product("My Product 3"))
 
+    def product_index_test(self):
+        with tempfile.TemporaryDirectory() as config_dir, \
+                tempfile.TemporaryDirectory() as index_dir:
+
+            index_path = os.path.join(index_dir, "product.index")
+
+            with open(os.path.join(config_dir, "1.conf"), "w") as f:
+                f.write(dedent("""
+                [Product]
+                product_name = My Product 1
+                """))
+
+            with open(os.path.join(config_dir, "2.conf"), "w") as f:
+                f.write(dedent("""
+                [Product]
+                product_name = My Product 2
+
+                [Base Product]
+                product_name = My Product 1
+                """))
+
+            # Create the index.
+            loader = ProductLoader()
+            loader.load_products(config_dir, index_path=index_path)
+            self.assertTrue(os.path.exists(index_path))
+
+            # Use the index.
+            loader = ProductLoader()
+
+            with patch.object(loader, "load_product") as load_product:
+                loader.load_products(config_dir, index_path=index_path)
+                load_product.assert_not_called()
+
+            self.assertEqual(
+                loader.collect_configurations("My Product 2"),
+                [os.path.join(config_dir, "1.conf"), os.path.join(config_dir, "2.conf")]
+            )
+
+            # Update the index.
+            os.unlink(os.path.join(config_dir, "2.conf"))
+
+            loader = ProductLoader()
+            loader.load_products(config_dir, index_path=index_path)
+            self.assertTrue(loader.check_product("My Product 1"))
+            self.assertFalse(loader.check_product("My Product 2"))
+
 
 class ProductFromBuildstampTests(unittest.TestCase):
 
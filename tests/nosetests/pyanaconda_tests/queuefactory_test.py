@@ -0,0 +1,70 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import select
+import unittest
+
+from pyanaconda.queuefactory import QueueFactory
+
+
+class QueueFactoryTestCase(unittest.TestCase):
+    """Test the queue factory."""
+
+    def _is_readable(self, fd):
+        return bool(select.select([fd], [], [], 0)[0])
+
+    def messages_test(self):
+        q = QueueFactory("test")
+        q.addMessage("init", 1)
+        q.addMessage("step", 0)
+
+        self.assertEqual(q.TEST_CODE_INIT, 0)
+        self.assertEqual(q.TEST_CODE_STEP, 1)
+
+        q.send_init(10)
+        q.send_step()
+
+        self.assertEqual(q.q.get(False), (q.TEST_CODE_INIT, (10,)))
+        self.assertEqual(q.q.get(False), (q.TEST_CODE_STEP, ()))
+
+        with self.assertRaises(TypeError):
+            q.send_step(1)
+
+        with self.assertRaises(AttributeError):
+            q.addMessage("init", 1)
+
+    def wakeup_test(self):
+        q = QueueFactory("test")
+        q.addMessage("step", 0)
+
+        # Wake up for messages sent before the fd was created.
+        q.send_step()
+        fd = q.get_wakeup_fd()
+        self.assertEqual(q.get_wakeup_fd(), fd)
+        self.assertTrue(self._is_readable(fd))
+
+        q.clear_wakeup()
+        self.assertFalse(self._is_readable(fd))
+
+        # Wake up for new messages.
+        for _i in range(3):
+            q.send_step()
+
+        self.assertTrue(self._is_readable(fd))
+        q.clear_wakeup()
+        self.assertFalse(self._is_readable(fd))
+        self.assertEqual(q.q.qsize(), 4)
@@ -210,6 +210,30 @@ class UserCreateTest(unittest.TestCase):
         self.assertIsNotNone(shadow_fields)
         self.assertEqual("", shadow_fields[1])
 
+    def set_user_passwords_test(self):
+        """Set passwords of several users at once."""
+        users.create_user("test_user1", root=self.tmpdir, set_password=False)
+        users.create_user("test_user2", root=self.tmpdir, set_password=False)
+        users.create_user("test_user3", root=self.tmpdir, set_password=False)
+
+        users.set_user_passwords([
+            ("test_user1", "password", False, False),
+            ("test_user2", "password", False, True),
+            ("test_user3", None, False, False),
+        ], root=self.tmpdir)
+
+        shadow_fields = self._readFields("/etc/shadow", "test_user1")
+        self.assertEqual(crypt.crypt("password", shadow_fields[1]), shadow_fields[1])
+        self.assertEqual("", shadow_fields[2])
+
+        shadow_fields = self._readFields("/etc/shadow", "test_user2")
+        self.assertTrue(shadow_fields[1].startswith("!"))
+        self.assertEqual(crypt.crypt("password", shadow_fields[1][1:]), shadow_fields[1][1:])
+
+        shadow_fields = self._readFields("/etc/shadow", "test_user3")
+        self.assertTrue(shadow_fields[1].startswith("!"))
+        self.assertEqual("", shadow_fields[2])
+
     def create_user_lock_test(self):
         """Create a locked user account."""
 
@@ -342,3 +366,52 @@ class UserCreateTest(unittest.TestCase):
         grp_fields = self._readFields("/etc/group", "test_group")
         self.assertIsNotNone(grp_fields)
         self.assertEqual(grp_fields[2], "1047")
+
+
+class ShadowDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.mkdir(self.tmpdir + "/etc")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def clear_password_change_dates_test(self):
+        """Clear the dates of the last password change."""
+        path = self.tmpdir + "/etc/shadow"
+
+        with open(path, "w") as f:
+            f.write("root:!:0:0:99999:7:::\n")
+            f.write("user1:!:0:0:99999:7:::\n")
+            f.write("user2:!:18000:0:99999:7:::\n")
+            f.write("user3::::::::\n")
+
+        os.chmod(path, 0o400)
+
+        # The database doesn't have to be rewritten.
+        users._clear_password_change_dates(["user3", "unknown"], self.tmpdir)
+        users._clear_password_change_dates(["root", "user1", "user3"], self.tmpdir)
+
+        with open(path) as f:
+            self.assertEqual(f.read(), "root:!::0:99999:7:::\n"
+                                       "user1:!::0:99999:7:::\n"
+                                       "user2:!:18000:0:99999:7:::\n"
+                                       "user3::::::::\n")
+
+        # The mode is kept and the original database is backed up.
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o400)
+
+        with open(path + "-") as f:
+            self.assertEqual(f.read(), "root:!:0:0:99999:7:::\n"
+                                       "user1:!:0:0:99999:7:::\n"
+                                       "user2:!:18000:0:99999:7:::\n"
+                                       "user3::::::::\n")
+
+        self.assertEqual(os.stat(path + "-").st_mode & 0o777, 0o400)
+        self.assertEqual(sorted(os.listdir(self.tmpdir + "/etc")),
+                         [".pwd.lock", "shadow", "shadow-"])
+
+    def clear_password_change_dates_missing_test(self):
+        """Clear the dates of the last password change without a database."""
+        users._clear_password_change_dates(["root"], self.tmpdir)
+        self.assertFalse(os.path.exists(self.tmpdir + "/etc/shadow"))
@@ -83,6 +83,45 @@ class RunSystemctlTests(unittest.TestCase):
                 "list-unit-files", "fake.service", "--no-legend"
             ])
 
+    @patch('pyanaconda.core.util.execWithRedirect')
+    def enable_services_test(self, execute):
+        """Test the enable_services function."""
+        execute.return_value = 0
+        util.enable_services(["a.service", "b.service"], root="/mnt/sysroot")
+        execute.assert_called_once_with("systemctl", [
+            "enable", "a.service", "b.service", "--root", "/mnt/sysroot"
+        ])
+
+        execute.reset_mock()
+        execute.side_effect = [1, 0, 1]
+
+        with self.assertRaises(ValueError) as cm:
+            util.enable_services(["a.service", "b.service"], root="/mnt/sysroot")
+
+        self.assertIn("b.service", str(cm.exception))
+        self.assertEqual(execute.call_count, 3)
+
+        execute.reset_mock()
+        util.enable_services([], root="/mnt/sysroot")
+        execute.assert_not_called()
+
+    @patch('pyanaconda.core.util.execWithRedirect')
+    def disable_services_test(self, execute):
+        """Test the disable_services function."""
+        execute.return_value = 0
+        util.disable_services(["a.service", "b.service"], root="/mnt/sysroot")
+        execute.assert_called_once_with("systemctl", [
+            "disable", "a.service", "b.service", "--root", "/mnt/sysroot"
+        ])
+
+        execute.reset_mock()
+        execute.side_effect = [1, 1, 0]
+        util.disable_services(["a.service", "b.service"], root="/mnt/sysroot")
+        execute.assert_called_with("systemctl", [
+            "disable", "b.service", "--root", "/mnt/sysroot"
+        ])
+        self.assertEqual(execute.call_count, 3)
+
 
 class RunProgramTests(unittest.TestCase):
     def run_program_test(self):
@@ -111,6 +150,41 @@ class RunProgramTests(unittest.TestCase):
         self.assertEqual(retcode, 0)
         self.assertEqual(output, b'\xa0\xa1\xa2')
 
+    def run_program_max_output_size_test(self):
+        """Test _run_program with limited output."""
+        retcode, output = util._run_program(['seq', '1', '10000'], max_output_size=20)
+
+        self.assertEqual(retcode, 0)
+        self.assertEqual(output, "9998\n9999\n10000\n")
+
+        retcode, output = util._run_program(['seq', '1', '3'], max_output_size=20)
+
+        self.assertEqual(retcode, 0)
+        self.assertEqual(output, "1\n2\n3\n")
+
+    def run_program_no_capture_test(self):
+        """Test _run_program without captured output."""
+        retcode, output = util._run_program(['echo', 'hello'], capture_output=False)
+
+        self.assertEqual(retcode, 0)
+        self.assertEqual(output, "")
+
+    @patch("pyanaconda.core.util.program_log")
+    def run_program_logging_test(self, program_log):
+        """Test logging of the program output."""
+        util._run_program(['sh', '-c', 'echo one; echo two >&2; printf three'],
+                          filter_stderr=True)
+
+        program_log.info.assert_any_call("one")
+        program_log.info.assert_any_call("two")
+        program_log.info.assert_any_call("three")
+
+        program_log.reset_mock()
+        util._run_program(['echo', '-en', r'\xa0\n\xa1'], binary_output=True)
+
+        program_log.info.assert_any_call("\ufffd")
+        self.assertEqual(program_log.info.call_count, 3)
+
     def exec_with_redirect_test(self):
         """Test execWithRedirect."""
         # correct calling should return rc==0
@@ -432,6 +506,89 @@ while true ; do sleep 1 ; done
                 proc.communicate()
                 self.assertEqual(proc.returncode, -(signal.SIGTERM))
 
+    def start_program_spawn_test(self):
+        """Test starting programs without a preexec_fn."""
+        env = {"PATH": "/usr/bin:/bin"}
+
+        self.assertTrue(util._can_spawn(["/bin/true"], "/", env, True, None))
+        self.assertFalse(util._can_spawn(["/bin/true"], "/", env, True, lambda: None))
+
+        with tempfile.TemporaryDirectory() as root:
+            # The program doesn't exist in the root.
+            self.assertFalse(util._can_spawn(["true"], root, env, True, None))
+
+            os.makedirs(os.path.join(root, "usr/bin"))
+            with open(os.path.join(root, "usr/bin/true"), "w"):
+                pass
+
+            os.chmod(os.path.join(root, "usr/bin/true"), 0o755)
+
+            with patch("pyanaconda.core.util.CHROOT_HELPER", "/bin/true"):
+                self.assertTrue(util._can_spawn(["true"], root, env, True, None))
+                self.assertTrue(util._can_spawn(["/usr/bin/true"], root, env, True, None))
+
+        # Signals ignored by the installer have to be reset by the signal
+        # helper or by a preexec_fn.
+        old_handler = signal.signal(signal.SIGUSR2, signal.SIG_IGN)
+
+        try:
+            self.assertIn(signal.SIGUSR2, util._get_ignored_signals())
+            self.assertTrue(util._can_spawn(["/bin/true"], "/", env, False, None))
+
+            with patch("pyanaconda.core.util._can_reset_signals", return_value=True):
+                self.assertTrue(util._can_spawn(["/bin/true"], "/", env, True, None))
+                self.assertFalse(util._can_spawn(["/nonexistent"], "/", env, True, None))
+
+            with patch("pyanaconda.core.util._can_reset_signals", return_value=False):
+                self.assertFalse(util._can_spawn(["/bin/true"], "/", env, True, None))
+        finally:
+            signal.signal(signal.SIGUSR2, old_handler)
+
+    @patch("pyanaconda.core.util._can_reset_signals", return_value=True)
+    @patch("pyanaconda.core.util.subprocess.Popen")
+    def start_program_ignored_signals_test(self, popen, can_reset):
+        """Test starting programs without a preexec_fn with ignored signals."""
+        old_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        try:
+            util.startProgram(["/bin/true"])
+        finally:
+            signal.signal(signal.SIGINT, old_handler)
+
+        args, kwargs = popen.call_args
+        self.assertEqual(args[0][0], util.SIGNAL_HELPER)
+        self.assertIn(str(int(signal.SIGINT)), args[0][1].split("=")[1].split(","))
+        self.assertEqual(args[0][2:], ["--", "/bin/true"])
+        self.assertNotIn("preexec_fn", kwargs)
+        self.assertEqual(kwargs["restore_signals"], True)
+
+    def start_program_reset_signals_test(self):
+        """Test that the signal helper resets the ignored signals."""
+        if not util._can_reset_signals():
+            self.skipTest("The signal helper is not supported.")
+
+        old_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        try:
+            proc = util.startProgram(["grep", "SigIgn", "/proc/self/status"])
+            output = proc.communicate()[0].decode()
+        finally:
+            signal.signal(signal.SIGINT, old_handler)
+
+        ignored = int(output.split()[1], 16)
+        self.assertFalse(ignored & (1 << (signal.SIGINT - 1)))
+
+    @patch("pyanaconda.core.util._can_spawn", return_value=True)
+    @patch("pyanaconda.core.util.subprocess.Popen")
+    def start_program_chroot_helper_test(self, popen, can_spawn):
+        """Test starting programs in a chroot without a preexec_fn."""
+        util.startProgram(["ls", "-l"], root="/mnt/root")
+
+        args, kwargs = popen.call_args
+        self.assertEqual(args[0], [util.CHROOT_HELPER, "/mnt/root", "ls", "-l"])
+        self.assertNotIn("preexec_fn", kwargs)
+        self.assertEqual(kwargs["restore_signals"], True)
+
     def exec_readlines_auto_kill_test(self):
         """Test execReadlines with reading only part of the output"""
 